@@ -71,6 +71,31 @@ def _display_skip_summary(
                 console.print(f"        [dim]... and {len(items) - 3} more[/dim]")
 
 
+def _write_index_status(sia_dir: Path, status: str, mode: str, **details) -> None:
+    """Record the outcome of the last index run in index_status.json.
+
+    Lets scripts and tests check the result without parsing console output.
+
+    Args:
+        sia_dir: Index directory
+        status: "complete" or "failed"
+        mode: "full" or "incremental"
+        **details: Extra fields (counts, error message)
+    """
+    import json
+
+    payload = {
+        "status": status,
+        "mode": mode,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        **details,
+    }
+    try:
+        (sia_dir / "index_status.json").write_text(json.dumps(payload, indent=2))
+    except OSError:
+        pass
+
+
 def setup_logging(verbose: bool = False):
     """Configure logging based on verbosity."""
     level = logging.DEBUG if verbose else logging.WARNING
@@ -127,6 +152,9 @@ def create_backend(index_path: Path, config: Config, valid_chunks=None):
         embedding_enabled=config.embedding.enabled,
         embedding_model=config.embedding.model,
         ndim=config.embedding.dimensions,
+        embedding_backend=config.embedding.backend,
+        embedding_model_file=config.embedding.model_file,
+        embedding_truncate=config.embedding.truncate_dimensions,
         valid_chunks=valid_chunks,
     )
 
@@ -382,11 +410,14 @@ def index(
             index_path.unlink()
             console.print(f"  [dim]✓ Deleted: {index_path}[/dim]")
 
-        # Remove cache file
-        cache_path = sia_dir / "cache" / "file_hashes.json"
-        if cache_path.exists():
-            cache_path.unlink()
-            console.print(f"  [dim]✓ Deleted: {cache_path}[/dim]")
+        # Remove cache file (and the JSON one written by older versions)
+        for cache_path in (
+            sia_dir / "cache" / "file_hashes.db",
+            sia_dir / "cache" / "file_hashes.json",
+        ):
+            if cache_path.exists():
+                cache_path.unlink()
+                console.print(f"  [dim]✓ Deleted: {cache_path}[/dim]")
 
         # Remove legacy usearch vector file to allow backend migration on clean rebuild
         usearch_path = sia_dir / "vectors.usearch"
@@ -451,8 +482,8 @@ def index(
                 from .indexer.hash_cache import HashCache
                 from .indexer.chunk_index import ChunkIndex
 
-                cache = HashCache(sia_dir / "cache" / "file_hashes.json")
-                chunk_index = ChunkIndex(sia_dir / "chunk_index.json")
+                cache = HashCache(sia_dir / "cache" / "file_hashes.db")
+                chunk_index = ChunkIndex(sia_dir / "chunk_index.db")
 
                 stats = coordinator.index_directory_incremental_v2(
                     directory, cache, chunk_index, progress_callback=update_progress
@@ -519,6 +550,15 @@ def index(
             # Close backend to persist vectors to disk
             backend.close()
 
+            _write_index_status(
+                sia_dir,
+                "complete",
+                "incremental" if update else "full",
+                indexed_files=stats["indexed_files"],
+                total_chunks=stats["total_chunks"],
+                errors=len(stats["errors"]),
+            )
+
             # Auto-sync git history (unless disabled or in watch mode)
             if not no_git_sync and not watch:
                 try:
@@ -541,6 +581,9 @@ def index(
 
         except Exception as e:
             console.print(f"[red]Error during indexing: {e}[/red]")
+            _write_index_status(
+                sia_dir, "failed", "incremental" if update else "full", error=str(e)
+            )
             sys.exit(1)
 
     # Watch mode
@@ -605,10 +648,10 @@ def index(
                     from .indexer.hash_cache import HashCache
                     from .indexer.chunk_index import ChunkIndex
 
-                    cache_path = sia_dir / "cache" / "file_hashes.json"
+                    cache_path = sia_dir / "cache" / "file_hashes.db"
                     cache = HashCache(cache_path)
 
-                    chunk_index_path = sia_dir / "chunk_index.json"
+                    chunk_index_path = sia_dir / "chunk_index.db"
                     chunk_index = ChunkIndex(chunk_index_path)
                     chunk_index.load()
 
@@ -650,8 +693,173 @@ def index(
             sys.exit(0)
 
 
+def _execute_search(
+    backend,
+    query: str,
+    mode: str,
+    limit: int,
+    include_deps: bool,
+    tier_boost,
+    vector_weight: float,
+    deps_only: bool,
+):
+    """Run a single search against an open backend.
+
+    Args:
+        backend: Opened storage backend
+        query: Search query
+        mode: Search mode ("lexical", "semantic" or "hybrid")
+        limit: Maximum number of results
+        include_deps: Whether dependency chunks may be returned
+        tier_boost: Optional tier boost mapping from config
+        vector_weight: Semantic weight for hybrid search
+        deps_only: Keep only dependency chunks
+
+    Returns:
+        List of SearchResult objects
+    """
+    if mode == "lexical":
+        results = backend.search_lexical(
+            query, k=limit, include_deps=include_deps, tier_boost=tier_boost
+        )
+    elif mode == "semantic":
+        results = backend.search_semantic(
+            query, k=limit, include_deps=include_deps, tier_boost=tier_boost
+        )
+    else:
+        # Hybrid search (BM25 + semantic) for best performance
+        results = backend.search_hybrid(
+            query,
+            k=limit,
+            vector_weight=vector_weight,
+            include_deps=include_deps,
+            tier_boost=tier_boost,
+        )
+
+    # Filter for --deps-only after search
+    if deps_only and results:
+        results = [r for r in results if r.chunk.metadata.get("tier") == "dependency"]
+
+    return results
+
+
+def _run_search_batch(backend, mode: str, default_limit: int, search_kwargs: dict) -> None:
+    """Answer search requests read from stdin, one JSON line per request.
+
+    Each input line is a JSON object ``{"query": "...", "limit": 10}`` (``limit`` is
+    optional). Each answer is written as one compact JSON line with the same shape as
+    ``--format json`` and flushed immediately, so callers can keep a single process
+    (and the opened index) alive across many queries.
+    """
+    import json
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        query = None
+        try:
+            request = json.loads(line)
+            query = request["query"]
+            limit = int(request.get("limit", default_limit))
+            results = _execute_search(backend, query, mode, limit, **search_kwargs)
+            response = {"query": query, "mode": mode, "results": [r.to_dict() for r in results]}
+        except Exception as e:
+            response = {"query": query, "mode": mode, "error": str(e)}
+
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+def _run_search_queries_file(
+    backend, queries_path: str, mode: str, default_limit: int, search_kwargs: dict
+) -> None:
+    """Answer every request in a JSON file and print all answers as one JSON array.
+
+    The file holds a list of ``{"query": "...", "limit": 10}`` objects. Query
+    embeddings for the well-formed entries are computed in a single batch before
+    searching; malformed entries get an error answer, like in ``--batch`` mode.
+
+    Raises:
+        click.BadParameter: If the file is not valid JSON or not a JSON list
+    """
+    import json
+
+    try:
+        requests = json.loads(Path(queries_path).read_text())
+    except (OSError, ValueError) as e:
+        raise click.BadParameter(str(e), param_hint="'--queries-file'") from e
+    if not isinstance(requests, list):
+        raise click.BadParameter(
+            f"expected a JSON list of requests, got {type(requests).__name__}",
+            param_hint="'--queries-file'",
+        )
+
+    if mode != "lexical":
+        backend.prefetch_query_embeddings(
+            [
+                request["query"]
+                for request in requests
+                if isinstance(request, dict) and isinstance(request.get("query"), str)
+            ]
+        )
+
+    responses = []
+    for request in requests:
+        query = None
+        try:
+            query = request["query"]
+            if not isinstance(query, str):
+                raise ValueError("'query' must be a string")
+            limit = int(request.get("limit", default_limit))
+            results = _execute_search(backend, query, mode, limit, **search_kwargs)
+            responses.append(
+                {"query": query, "mode": mode, "results": [r.to_dict() for r in results]}
+            )
+        except Exception as e:
+            responses.append({"query": query, "mode": mode, "error": str(e)})
+
+    print(json.dumps(responses, indent=2))
+
+
+def _stream_search_ndjson(
+    backend, query: str, mode: str, limit: int, output: str | None, search_kwargs: dict
+) -> None:
+    """Write one compact JSON result per line, flushing after each line.
+
+    Results are ranked before the first line is written (lexical searches go
+    through the backend's iter_search_lexical()), so every mode returns the
+    same results, in the same order, as the json format.
+    """
+    import json
+
+    if mode == "lexical":
+        results = backend.iter_search_lexical(
+            query,
+            k=limit,
+            include_deps=search_kwargs["include_deps"],
+            tier_boost=search_kwargs["tier_boost"],
+        )
+        # Same post-search --deps-only filter as _execute_search()
+        if search_kwargs["deps_only"]:
+            results = (r for r in results if r.chunk.metadata.get("tier") == "dependency")
+    else:
+        results = _execute_search(backend, query, mode, limit, **search_kwargs)
+
+    from contextlib import nullcontext
+
+    with open(output, "w") if output else nullcontext(sys.stdout) as stream:
+        for result in results:
+            stream.write(json.dumps(result.to_dict(), separators=(",", ":")) + "\n")
+            stream.flush()
+
+    if output:
+        console.print(f"[green]✓[/green] Results saved to {output}")
+
+
 @main.command()
-@click.argument("query")
+@click.argument("query", required=False)
 @click.option("--regex", is_flag=True, help="Use regex/lexical search instead of hybrid")
 @click.option("--semantic-only", is_flag=True, help="Use semantic-only search (no BM25)")
 @click.option("-k", "--limit", type=int, default=10, help="Number of results")
@@ -661,13 +869,23 @@ def index(
 @click.option(
     "--format",
     "output_format",
-    type=click.Choice(["text", "json", "table", "csv"]),
+    type=click.Choice(["text", "json", "ndjson", "table", "csv"]),
     default="text",
-    help="Output format (default: text)",
+    help="Output format (default: text; ndjson writes one JSON result per line)",
 )
 @click.option("-o", "--output", type=click.Path(), help="Save results to file instead of stdout")
+@click.option(
+    "--batch",
+    is_flag=True,
+    help='Read {"query": ..., "limit": ...} JSON lines from stdin, write one JSON result per line',
+)
+@click.option(
+    "--queries-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Search every request in a JSON list file and print a JSON list of results",
+)
 def search(
-    query: str,
+    query: str | None,
     regex: bool,
     semantic_only: bool,
     limit: int,
@@ -676,17 +894,24 @@ def search(
     deps_only: bool,
     output_format: str,
     output: str | None,
+    batch: bool,
+    queries_file: str | None,
 ):
     """Search the codebase (default: hybrid BM25 + semantic)."""
     from .indexer.chunk_index import ChunkIndex
 
+    if query is None and not batch and not queries_file:
+        raise click.UsageError(
+            "Missing argument 'QUERY' (or pass --batch / --queries-file for multiple queries)."
+        )
+
     sia_dir, config = require_initialized()
 
     # Load chunk index for filtering (if available and not disabled)
     valid_chunks = None
     if not no_filter:
-        chunk_index_path = sia_dir / "chunk_index.json"
-        if chunk_index_path.exists():
+        chunk_index_path = sia_dir / "chunk_index.db"
+        if ChunkIndex.exists(chunk_index_path):
             try:
                 chunk_index = ChunkIndex(chunk_index_path)
                 valid_chunks = chunk_index.get_valid_chunks()
@@ -716,35 +941,33 @@ def search(
     else:
         mode = "hybrid"  # NEW DEFAULT: BM25 + semantic
 
+    search_kwargs = {
+        "include_deps": include_deps,
+        "tier_boost": tier_boost,
+        "vector_weight": config.search.vector_weight,
+        "deps_only": deps_only,
+    }
+
+    if batch:
+        _run_search_batch(backend, mode, limit, search_kwargs)
+        return
+
+    if queries_file:
+        _run_search_queries_file(backend, queries_file, mode, limit, search_kwargs)
+        return
+
     filter_status = "" if no_filter or not valid_chunks else " [filtered]"
     deps_status = " [no-deps]" if no_deps else " [deps-only]" if deps_only else ""
 
     # Suppress progress messages for structured output formats
-    if output_format not in ("json", "csv"):
+    if output_format not in ("json", "ndjson", "csv"):
         console.print(f"[dim]Searching ({mode}{filter_status}{deps_status})...[/dim]")
 
-    # Execute search based on mode
-    if regex:
-        results = backend.search_lexical(
-            query, k=limit, include_deps=include_deps, tier_boost=tier_boost
-        )
-    elif semantic_only:
-        results = backend.search_semantic(
-            query, k=limit, include_deps=include_deps, tier_boost=tier_boost
-        )
-    else:
-        # NEW: Hybrid search (BM25 + semantic) for best performance
-        results = backend.search_hybrid(
-            query,
-            k=limit,
-            vector_weight=config.search.vector_weight,
-            include_deps=include_deps,
-            tier_boost=tier_boost,
-        )
+    if output_format == "ndjson":
+        _stream_search_ndjson(backend, query, mode, limit, output, search_kwargs)
+        return
 
-    # Filter for --deps-only after search
-    if deps_only and results:
-        results = [r for r in results if r.chunk.metadata.get("tier") == "dependency"]
+    results = _execute_search(backend, query, mode, limit, **search_kwargs)
 
     if not results:
         # Handle empty results based on output format
@@ -880,8 +1103,8 @@ def interactive(regex: bool, limit: int):
 
     # Load chunk index for filtering
     valid_chunks = None
-    chunk_index_path = sia_dir / "chunk_index.json"
-    if chunk_index_path.exists():
+    chunk_index_path = sia_dir / "chunk_index.db"
+    if ChunkIndex.exists(chunk_index_path):
         try:
             chunk_index = ChunkIndex(chunk_index_path)
             valid_chunks = chunk_index.get_valid_chunks()
@@ -1016,8 +1239,8 @@ def research(question: str, hops: int, graph: bool, limit: int, no_filter: bool)
     # Load chunk index for filtering (if available and not disabled)
     valid_chunks = None
     if not no_filter:
-        chunk_index_path = sia_dir / "chunk_index.json"
-        if chunk_index_path.exists():
+        chunk_index_path = sia_dir / "chunk_index.db"
+        if ChunkIndex.exists(chunk_index_path):
             try:
                 chunk_index = ChunkIndex(chunk_index_path)
                 valid_chunks = chunk_index.get_valid_chunks()
@@ -1088,8 +1311,8 @@ def research(question: str, hops: int, graph: bool, limit: int, no_filter: bool)
 def status():
     """Show index statistics and health."""
     import datetime
-    import json
     from .indexer.chunk_index import ChunkIndex
+    from .indexer.hash_cache import HashCache
 
     sia_dir, config = require_initialized()
 
@@ -1106,15 +1329,14 @@ def status():
     table.add_row("Total Chunks", f"{stats.total_chunks:,}")
 
     # Cache statistics
-    cache_path = sia_dir / "cache" / "file_hashes.json"
-    if cache_path.exists():
+    cache_path = sia_dir / "cache" / "file_hashes.db"
+    if HashCache.exists(cache_path):
         try:
-            cache_data = json.loads(cache_path.read_text())
-            cache_size = cache_path.stat().st_size
+            cache_stats = HashCache(cache_path).get_stats()
             table.add_row("", "")  # Separator
-            table.add_row("Cached Files", str(len(cache_data)))
-            table.add_row("Cache Size", f"{cache_size:,} bytes")
-        except (json.JSONDecodeError, OSError):
+            table.add_row("Cached Files", str(cache_stats["total_files"]))
+            table.add_row("Cache Size", f"{cache_stats['cache_size_bytes']:,} bytes")
+        except OSError:
             pass
 
     # Index age and size
@@ -1131,8 +1353,8 @@ def status():
             pass
 
     # Chunk index staleness (v2.0)
-    chunk_index_path = sia_dir / "chunk_index.json"
-    if chunk_index_path.exists():
+    chunk_index_path = sia_dir / "chunk_index.db"
+    if ChunkIndex.exists(chunk_index_path):
         try:
             chunk_index = ChunkIndex(chunk_index_path)
             summary = chunk_index.get_staleness_summary()
@@ -1149,7 +1371,7 @@ def status():
     console.print(table)
 
     # Recommendations
-    if chunk_index_path.exists():
+    if ChunkIndex.exists(chunk_index_path):
         try:
             chunk_index = ChunkIndex(chunk_index_path)
             summary = chunk_index.get_staleness_summary()
@@ -1195,8 +1417,8 @@ def compact(path: str, threshold: float, force: bool):
     sia_dir, config = require_initialized()
 
     # Check if chunk index exists
-    chunk_index_path = sia_dir / "chunk_index.json"
-    if not chunk_index_path.exists():
+    chunk_index_path = sia_dir / "chunk_index.db"
+    if not ChunkIndex.exists(chunk_index_path):
         console.print("[yellow]Chunk index not found. Compaction requires chunk tracking.[/yellow]")
         console.print(
             "[dim]Run incremental indexing to build chunk index, or use --clean to rebuild.[/dim]"
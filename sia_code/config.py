@@ -66,6 +66,14 @@ class EmbeddingConfig(BaseModel):
     - BGE: "BAAI/bge-small-en-v1.5" (384d), "BAAI/bge-base-en-v1.5" (768d), "BAAI/bge-large-en-v1.5" (1024d)
     - MiniLM: "sentence-transformers/all-MiniLM-L6-v2" (384d)
     - Other HuggingFace models compatible with sentence-transformers
+
+    backend "onnx" runs the model through ONNX Runtime (pip install sia-code[onnx]);
+    model_file picks a specific export in the model repo, e.g. a quantized
+    "onnx/model_quantized.onnx".
+
+    truncate_dimensions opts in to storing only the first `dimensions` components
+    of a wider model's output, re-normalized (Matryoshka truncation). Models not
+    trained for it lose some retrieval quality.
     """
 
     enabled: bool = True
@@ -73,6 +81,9 @@ class EmbeddingConfig(BaseModel):
     model: str = "BAAI/bge-base-en-v1.5"  # Model name (see supported models above)
     api_key_env: str = ""  # Environment variable for API key (not needed for local models)
     dimensions: int = 768  # Embedding dimensions (auto-detected for most models)
+    backend: str = "torch"  # sentence-transformers backend: "torch" or "onnx"
+    model_file: str = ""  # Optional model file within the repo (ONNX backend)
+    truncate_dimensions: bool = False  # Truncate wider model output to `dimensions`
 
 
 class IndexingConfig(BaseModel):
@@ -6,6 +6,7 @@ from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Set
 
+from .record_store import RecordStore
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +83,9 @@ class ChunkIndex:
     The sidecar maintains a mapping of files to their associated chunks,
     allowing us to track which chunks are valid (current) vs stale (outdated).
     This solves the chunk accumulation problem where Memvid can't delete chunks.
+
+    File entries are persisted in SQLite (see RecordStore); save() writes only
+    the files updated or removed since the last save.
     """
 
     VERSION = "1.0"
@@ -90,55 +94,64 @@ class ChunkIndex:
         """Initialize chunk index.
 
         Args:
-            index_path: Path to chunk index file (typically .pci/chunk_index.json)
+            index_path: Path to chunk index file (typically .sia-code/chunk_index.db);
+                a legacy chunk_index.json next to it is imported on first load
         """
-        self.index_path = index_path
+        self._store = RecordStore(index_path)
+        self.index_path = self._store.db_path
         self.files: dict[str, FileChunkMetadata] = {}
         self.dirty = False
         self.load()
 
+    @staticmethod
+    def exists(index_path: Path) -> bool:
+        """Return True if a chunk index (current or legacy format) exists at index_path."""
+        return RecordStore.exists(index_path)
+
     def load(self):
         """Load chunk index from disk."""
-        if self.index_path.exists():
-            try:
-                with open(self.index_path) as f:
-                    data = json.load(f)
-
-                    # Verify version
-                    if data.get("version") != self.VERSION:
-                        logger.warning(
-                            f"Chunk index version mismatch: {data.get('version')} != {self.VERSION}"
-                        )
-
-                    # Load files
-                    self.files = {
-                        k: FileChunkMetadata.from_dict(v) for k, v in data.get("files", {}).items()
-                    }
-
-                logger.info(f"Loaded chunk index with {len(self.files)} files")
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
-                logger.error(f"Corrupted chunk index, starting fresh: {e}")
-                self.files = {}
+        try:
+            if self.index_path.exists():
+                files = self._store.load()
+                if files is None:
+                    raise ValueError("unreadable chunk index database")
+            elif self._store.legacy_path.exists():
+                files = self._load_legacy()
+                # Imported entries are written to the database on the next save
+                self._store.touch_all()
                 self.dirty = True
-        else:
-            # New chunk index - mark dirty so it gets created on save
+            else:
+                # New chunk index - mark dirty so it gets created on save
+                self._store.touch_all()
+                self.dirty = True
+                logger.info("Creating new chunk index")
+                return
+
+            self.files = {k: FileChunkMetadata.from_dict(v) for k, v in files.items()}
+            logger.info(f"Loaded chunk index with {len(self.files)} files")
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Corrupted chunk index, starting fresh: {e}")
+            self.files = {}
+            self._store.touch_all()
             self.dirty = True
-            logger.info("Creating new chunk index")
+
+    def _load_legacy(self) -> dict[str, dict]:
+        """Read file entries from a chunk_index.json written by an older version."""
+        with open(self._store.legacy_path) as f:
+            data = json.load(f)
+
+        # Verify version
+        if data.get("version") != self.VERSION:
+            logger.warning(f"Chunk index version mismatch: {data.get('version')} != {self.VERSION}")
+
+        return data.get("files", {})
 
     def save(self):
-        """Save chunk index to disk."""
+        """Save changed file entries to disk."""
         if not self.dirty:
             return
 
-        self.index_path.parent.mkdir(parents=True, exist_ok=True)
-
-        data = {
-            "version": self.VERSION,
-            "files": {k: v.to_dict() for k, v in self.files.items()},
-        }
-
-        with open(self.index_path, "w") as f:
-            json.dump(data, f, indent=2)
+        self._store.flush(self.files)
 
         self.dirty = False
         logger.debug(f"Saved chunk index with {len(self.files)} files")
@@ -150,7 +163,7 @@ class ChunkIndex:
 
         Args:
             file_path: Path to file
-            file_hash: SHA256 hash of file content
+            file_hash: Content hash from HashCache.compute_hash
             mtime: File modification time
             size: File size in bytes
             chunk_ids: List of chunk IDs for this file
@@ -178,6 +191,7 @@ class ChunkIndex:
             metadata.size = size
             metadata.set_valid_chunks(chunk_ids)
 
+        self._store.touch(path_str)
         self.dirty = True
         logger.debug(f"Updated chunk index for {file_path}: {len(chunk_ids)} chunks")
 
@@ -224,6 +238,7 @@ class ChunkIndex:
             # Mark all chunks as stale before removing
             self.files[path_str].mark_chunks_stale()
             del self.files[path_str]
+            self._store.drop(path_str)
             self.dirty = True
             logger.debug(f"Removed {file_path} from chunk index")
 
@@ -239,6 +254,7 @@ class ChunkIndex:
                 # Mark chunks as stale before removing
                 self.files[path_str].mark_chunks_stale()
                 del self.files[path_str]
+                self._store.drop(path_str)
                 removed.append(path_str)
                 self.dirty = True
 
@@ -278,6 +294,7 @@ class ChunkIndex:
         """
         for metadata in self.files.values():
             metadata.stale_chunks = []
+        self._store.touch_all()
         self.dirty = True
         logger.info("Cleared all stale chunks from index")
 
@@ -6,7 +6,7 @@ import time
 import os
 import shutil
 import subprocess
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from typing import Callable
 
 import pathspec
@@ -484,13 +484,18 @@ class IndexingCoordinator:
         stats["skipped_files"] = 0
         git_context = _get_git_commit_context(directory)
 
-        for idx, file_path in enumerate(files, 1):
+        # Check all files for changes concurrently: stat() and the hashers release
+        # the GIL, so unchanged-file scans of large trees scale with the threads
+        with ThreadPoolExecutor() as pool:
+            changed_flags = list(pool.map(cache.has_changed, files))
+
+        for idx, (file_path, changed) in enumerate(zip(files, changed_flags), 1):
             # Update progress for checking phase
             if progress_callback:
                 progress_callback("checking", idx, len(files), file_path.name)
 
             # Check if file changed
-            if not cache.has_changed(file_path):
+            if not changed:
                 stats["skipped_files"] += 1
                 continue
 
@@ -528,10 +533,10 @@ class IndexingCoordinator:
                     chunk_id_strs = [str(cid) for cid in chunk_ids]
 
                     # Update hash cache
-                    cache.update(file_path, chunk_id_strs)
+                    entry = cache.update(file_path, chunk_id_strs)
 
                     # Update chunk index (marks old chunks stale, adds new as valid)
-                    file_hash = cache.compute_hash(file_path)
+                    file_hash = entry.hash if entry else cache.compute_hash(file_path)
                     chunk_index.update_file(
                         file_path,
                         file_hash,
@@ -626,6 +631,9 @@ class IndexingCoordinator:
             embedding_enabled=self.backend.embedding_enabled,
             embedding_model=self.backend.embedding_model,
             ndim=self.backend.ndim if hasattr(self.backend, "ndim") else 768,
+            embedding_backend=getattr(self.backend, "embedding_backend", "torch"),
+            embedding_model_file=getattr(self.backend, "embedding_model_file", ""),
+            embedding_truncate=getattr(self.backend, "embedding_truncate", False),
         )
         new_backend.create_index()
 
@@ -2,9 +2,26 @@
 
 import hashlib
 import json
+import threading
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from .record_store import RecordStore
+
+try:
+    from blake3 import blake3
+
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Digests carry their algorithm ("blake3:<hex>"), so entries hashed with another
+# algorithm (including untagged SHA-256 ones from older versions) never compare equal
+HASH_ALGORITHM = "blake3" if BLAKE3_AVAILABLE else "blake2b"
+
+# Files at least this large are hashed from a memory map with multithreaded BLAKE3
+MMAP_HASH_THRESHOLD = 1 << 20
+
 
 @dataclass
 class FileHash:
@@ -15,6 +32,15 @@ class FileHash:
     mtime: float
     size: int
     chunks: list[str]  # ChunkIds stored for this file
+    mtime_ns: int = 0  # Exact mtime; 0 for entries written before it was recorded
+
+    def matches_stat(self, stat) -> bool:
+        """Return True if the file's size and mtime are the ones recorded."""
+        if stat.st_size != self.size:
+            return False
+        if self.mtime_ns:
+            return stat.st_mtime_ns == self.mtime_ns
+        return stat.st_mtime == self.mtime
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -30,67 +56,99 @@ class HashCache:
     """Manages file hash cache for incremental indexing.
 
     The cache stores file hashes and metadata to detect changes
-    without re-indexing unchanged files.
+    without re-indexing unchanged files. Entries are persisted in SQLite
+    (see RecordStore); save() writes only the files updated or removed
+    since the last save.
     """
 
     def __init__(self, cache_path: Path):
         """Initialize hash cache.
 
         Args:
-            cache_path: Path to cache file (typically .pci/cache/file_hashes.json)
+            cache_path: Path to cache file (typically .sia-code/cache/file_hashes.db);
+                a legacy file_hashes.json next to it is imported on first load
         """
-        self.cache_path = cache_path
+        self._store = RecordStore(cache_path)
+        self.cache_path = self._store.db_path
         self.hashes: dict[str, FileHash] = {}
         self.dirty = False
+        # Digests computed by has_changed(), reused by update() while the stat still matches
+        self._fresh: dict[str, tuple[int, int, str]] = {}
+        # has_changed() may run on several threads; guards its (rare) writes
+        self._lock = threading.Lock()
         self.load()
 
+    @staticmethod
+    def exists(cache_path: Path) -> bool:
+        """Return True if a cache (current or legacy format) exists at cache_path."""
+        return RecordStore.exists(cache_path)
+
     def load(self) -> None:
         """Load cache from disk."""
-        if self.cache_path.exists():
-            try:
-                with open(self.cache_path) as f:
+        try:
+            if self.cache_path.exists():
+                data = self._store.load()
+                if data is None:
+                    raise ValueError("unreadable cache database")
+            elif self._store.legacy_path.exists():
+                with open(self._store.legacy_path) as f:
                     data = json.load(f)
-                    self.hashes = {k: FileHash.from_dict(v) for k, v in data.items()}
-            except (json.JSONDecodeError, KeyError):
-                # Corrupted cache, start fresh
-                self.hashes = {}
+                # Imported entries are written to the database on the next save
+                self._store.touch_all()
                 self.dirty = True
+            else:
+                return
+            self.hashes = {k: FileHash.from_dict(v) for k, v in data.items()}
+        except (ValueError, KeyError, TypeError):
+            # Corrupted cache, start fresh
+            self.hashes = {}
+            self._store.touch_all()
+            self.dirty = True
 
     def save(self) -> None:
-        """Save cache to disk."""
+        """Save changed entries to disk."""
         if not self.dirty:
             return
 
-        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.cache_path, "w") as f:
-            json.dump({k: v.to_dict() for k, v in self.hashes.items()}, f, indent=2)
+        self._store.flush(self.hashes)
         self.dirty = False
 
     def compute_hash(self, file_path: Path) -> str:
-        """Compute SHA256 hash of file contents.
+        """Compute a content hash for change detection.
+
+        The hash only tells whether a file changed, so speed is what matters:
+        BLAKE3 when the `blake3` package is installed
+        (`pip install "sia-code[fast-hash]"`), BLAKE2b otherwise.
 
         Args:
             file_path: Path to file
 
         Returns:
-            Hex digest of file hash
+            Digest tagged with its algorithm (e.g. "blake3:<hex>"), or "" if unreadable
         """
-        hasher = hashlib.sha256()
         try:
-            with open(file_path, "rb") as f:
-                # Read in chunks to handle large files
-                for chunk in iter(lambda: f.read(8192), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+            if BLAKE3_AVAILABLE:
+                if file_path.stat().st_size >= MMAP_HASH_THRESHOLD:
+                    hasher = blake3(max_threads=blake3.AUTO)
+                    hasher.update_mmap(str(file_path))
+                else:
+                    hasher = blake3(file_path.read_bytes())
+            else:
+                hasher = hashlib.blake2b(digest_size=32)
+                with open(file_path, "rb") as f:
+                    # Read in chunks to handle large files
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        hasher.update(chunk)
+            return f"{HASH_ALGORITHM}:{hasher.hexdigest()}"
         except Exception:
             return ""
 
     def has_changed(self, file_path: Path) -> bool:
-        """Check if file has changed since last index.
+        """Check if file has changed since last index (safe to call from several threads).
 
         Uses a two-stage check:
-        1. Quick check: modification time and size
-        2. Thorough check: SHA256 hash if mtime/size differ
+        1. Quick check: modification time (ns) and size, a stat() call only
+        2. Thorough check: content hash if mtime/size differ
 
         Args:
             file_path: Path to file to check
@@ -108,45 +166,69 @@ class HashCache:
 
         try:
             stat = file_path.stat()
-            current_mtime = stat.st_mtime
-            current_size = stat.st_size
 
-            # Quick check: mtime and size
-            if current_mtime == cached.mtime and current_size == cached.size:
+            # Quick check: mtime (ns) and size
+            if cached.matches_stat(stat):
                 # Likely unchanged (mtime and size match)
                 return False
 
             # Mtime or size changed - verify with hash
             current_hash = self.compute_hash(file_path)
-            return current_hash != cached.hash
+            with self._lock:
+                if current_hash != cached.hash:
+                    self._fresh[path_str] = (stat.st_mtime_ns, stat.st_size, current_hash)
+                    return True
+
+                # Same content with a new mtime (touch, checkout): record the new stat
+                # so the next scan takes the quick path instead of hashing again
+                cached.mtime = stat.st_mtime
+                cached.mtime_ns = stat.st_mtime_ns
+                cached.size = stat.st_size
+                self._store.touch(path_str)
+                self.dirty = True
+                return False
 
         except (OSError, FileNotFoundError):
             # File disappeared or inaccessible
             return True
 
-    def update(self, file_path: Path, chunk_ids: list[str]) -> None:
+    def update(self, file_path: Path, chunk_ids: list[str]) -> FileHash | None:
         """Update cache entry for a file.
 
         Args:
             file_path: Path to file
             chunk_ids: List of chunk IDs stored for this file
+
+        Returns:
+            The new entry, or None if the file could not be read
         """
         try:
             path_str = str(file_path.absolute())
             stat = file_path.stat()
 
-            self.hashes[path_str] = FileHash(
+            # Reuse the digest from has_changed() unless the file moved on since
+            fresh = self._fresh.pop(path_str, None)
+            if fresh is not None and fresh[:2] == (stat.st_mtime_ns, stat.st_size):
+                file_hash = fresh[2]
+            else:
+                file_hash = self.compute_hash(file_path)
+
+            entry = FileHash(
                 path=path_str,
-                hash=self.compute_hash(file_path),
+                hash=file_hash,
                 mtime=stat.st_mtime,
                 size=stat.st_size,
                 chunks=chunk_ids,
+                mtime_ns=stat.st_mtime_ns,
             )
+            self.hashes[path_str] = entry
+            self._store.touch(path_str)
             self.dirty = True
+            return entry
 
         except (OSError, FileNotFoundError):
             # Couldn't update, skip
-            pass
+            return None
 
     def get_chunks(self, file_path: Path) -> list[str]:
         """Get chunk IDs for a file.
@@ -171,6 +253,7 @@ class HashCache:
         path_str = str(file_path.absolute())
         if path_str in self.hashes:
             del self.hashes[path_str]
+            self._store.drop(path_str)
             self.dirty = True
 
     def get_stats(self) -> dict:
@@ -190,5 +273,4 @@ class HashCache:
         """Clear entire cache."""
         self.hashes = {}
         self.dirty = True
-        if self.cache_path.exists():
-            self.cache_path.unlink()
+        self._store.delete()
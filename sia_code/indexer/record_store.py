@@ -0,0 +1,121 @@
+"""SQLite persistence for the incremental indexing sidecars (hash cache, chunk index)."""
+
+import json
+import logging
+from pathlib import Path
+
+from ..storage.sqlite_runtime import connect_sqlite, get_sqlite_module
+
+logger = logging.getLogger(__name__)
+
+
+class RecordStore:
+    """Path-keyed JSON records in a single SQLite table.
+
+    The owner keeps its records in memory and reports which keys it changed
+    or removed; flush() writes only those keys in one transaction, so saving
+    after an incremental run costs O(changed files) instead of rewriting
+    every entry.
+
+    Sidecars used to be JSON files. A store is addressed by either name: the
+    records live in the `.db` sibling, and the `.json` one (legacy_path) is
+    only read by owners to import an index written by an older version.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize record store.
+
+        Args:
+            path: Sidecar path; the suffix is replaced by `.db`
+        """
+        self.db_path = path.with_suffix(".db")
+        self.legacy_path = path.with_suffix(".json")
+        self._changed: set[str] = set()
+        self._removed: set[str] = set()
+        self._rewrite = False
+
+    @staticmethod
+    def exists(path: Path) -> bool:
+        """Return True if a sidecar (SQLite or legacy JSON) exists for this path."""
+        return path.with_suffix(".db").exists() or path.with_suffix(".json").exists()
+
+    def _connect(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = connect_sqlite(self.db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS records (key TEXT PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        return conn
+
+    def load(self) -> dict[str, dict] | None:
+        """Read every record.
+
+        Returns:
+            Records by key ({} if the database does not exist yet), or None
+            if the database is unreadable
+        """
+        if not self.db_path.exists():
+            return {}
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute("SELECT key, data FROM records").fetchall()
+            finally:
+                conn.close()
+            return {key: json.loads(data) for key, data in rows}
+        except (get_sqlite_module().DatabaseError, json.JSONDecodeError) as e:
+            logger.error(f"Unreadable sidecar {self.db_path}: {e}")
+            return None
+
+    def touch(self, key: str) -> None:
+        """Record that the entry for key was added or changed."""
+        self._changed.add(key)
+        self._removed.discard(key)
+
+    def drop(self, key: str) -> None:
+        """Record that the entry for key was removed."""
+        self._removed.add(key)
+        self._changed.discard(key)
+
+    def touch_all(self) -> None:
+        """Rewrite every record on the next flush (e.g. after an import or a bulk change)."""
+        self._rewrite = True
+        self._changed.clear()
+        self._removed.clear()
+
+    def flush(self, records: dict) -> None:
+        """Write pending changes.
+
+        Args:
+            records: Current in-memory records by key; values provide to_dict()
+        """
+        if self._rewrite:
+            upserts = records.keys()
+        else:
+            upserts = [key for key in self._changed if key in records]
+
+        conn = self._connect()
+        try:
+            with conn:
+                if self._rewrite:
+                    conn.execute("DELETE FROM records")
+                else:
+                    conn.executemany(
+                        "DELETE FROM records WHERE key = ?", [(key,) for key in self._removed]
+                    )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO records (key, data) VALUES (?, ?)",
+                    [(key, json.dumps(records[key].to_dict())) for key in upserts],
+                )
+        finally:
+            conn.close()
+
+        self._changed.clear()
+        self._removed.clear()
+        self._rewrite = False
+
+    def delete(self) -> None:
+        """Delete the database and the legacy JSON file; the next flush rewrites everything."""
+        self.db_path.unlink(missing_ok=True)
+        self.legacy_path.unlink(missing_ok=True)
+        self.touch_all()
@@ -201,8 +201,7 @@ class GitSyncService:
             True if changelog with this tag exists
         """
         try:
-            existing = self.backend.get_changelogs(limit=1000)
-            return any(c.tag == tag for c in existing)
+            return self.backend.has_changelog(tag)
         except Exception:
             # If check fails, assume not duplicate to avoid data loss
             return False
@@ -219,11 +218,7 @@ class GitSyncService:
             True if event with these attributes exists
         """
         try:
-            existing = self.backend.get_timeline_events(limit=1000)
-            return any(
-                e.event_type == event_type and e.from_ref == from_ref and e.to_ref == to_ref
-                for e in existing
-            )
+            return self.backend.has_timeline_event(event_type, from_ref, to_ref)
         except Exception:
             # If check fails, assume not duplicate to avoid data loss
             return False
@@ -310,6 +310,33 @@ class StorageBackend(ABC):
         """
         ...
 
+    def has_changelog(self, tag: str) -> bool:
+        """Return True if a changelog entry exists for the tag.
+
+        The default scans get_changelogs(); backends override it with a
+        direct lookup.
+
+        Args:
+            tag: Git tag name
+        """
+        return any(c.tag == tag for c in self.get_changelogs(limit=1000))
+
+    def has_timeline_event(self, event_type: str, from_ref: str, to_ref: str) -> bool:
+        """Return True if a timeline event with these attributes exists.
+
+        The default scans get_timeline_events(); backends override it with a
+        direct lookup.
+
+        Args:
+            event_type: Type of event (merge, tag, etc.)
+            from_ref: Source git ref
+            to_ref: Target git ref
+        """
+        return any(
+            e.event_type == event_type and e.from_ref == from_ref and e.to_ref == to_ref
+            for e in self.get_timeline_events(limit=1000)
+        )
+
     # ===================================================================
     # Unified Search (Code + Memory)
     # ===================================================================
@@ -414,3 +441,14 @@ class StorageBackend(ABC):
             ImportResult with counts (added, updated, skipped)
         """
         ...
+
+    def prefetch_query_embeddings(self, queries: list[str]) -> None:
+        """Embed upcoming search queries ahead of time.
+
+        Backends with embeddings may encode all queries in one batch here so
+        the searches that follow skip per-query model calls. Optional; the
+        default does nothing.
+
+        Args:
+            queries: Query texts about to be searched
+        """
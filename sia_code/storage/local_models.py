@@ -0,0 +1,42 @@
+"""Process-wide cache of locally loaded embedding models."""
+
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=2)
+def load_sentence_transformer(
+    model_name: str, backend: str = "torch", model_file: str | None = None
+):
+    """Load a SentenceTransformer once per process.
+
+    Backends are created per command, so a process that runs several commands
+    (tests driving the CLI in-process, interactive mode) would otherwise load
+    the same weights again for each one.
+
+    Args:
+        model_name: Hugging Face model name
+        backend: SentenceTransformer backend ('torch', 'onnx', 'openvino')
+        model_file: Model file inside the repo for non-torch backends
+
+    Returns:
+        Loaded SentenceTransformer model
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    # Auto-detect device (GPU if available, CPU fallback)
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    if backend == "torch":
+        model = SentenceTransformer(model_name, device=device)
+    else:
+        model_kwargs = {"file_name": model_file} if model_file else None
+        model = SentenceTransformer(
+            model_name, device=device, backend=backend, model_kwargs=model_kwargs
+        )
+
+    logger.info(f"Loaded local {model_name} ({backend}) on {device.upper()}")
+    return model
@@ -1,8 +1,20 @@
 """SQLite runtime helpers with FTS5 compatibility checks."""
 
+import os
 from pathlib import Path
 import sqlite3 as stdlib_sqlite3
 
+# Bound-parameter limit of SQLite builds before 3.32; statements are sized to fit it
+SQLITE_MAX_VARIABLES = 999
+
+# Applied when SIA_CODE_SQLITE_FAST=1: trades crash safety for fewer fsyncs.
+# Meant for throwaway indexes (tests); never set it for an index you keep.
+FAST_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA temp_store=MEMORY",
+)
+
 
 def _supports_fts5(sqlite_module) -> bool:
     """Return True when the given sqlite module supports FTS5."""
@@ -54,8 +66,20 @@ def get_sqlite_module():
 
 
 def connect_sqlite(path: Path, check_same_thread: bool = False):
-    """Create a sqlite connection with row factory configured."""
+    """Create a sqlite connection with row factory configured.
+
+    With SIA_CODE_SQLITE_FAST=1 the connection skips fsyncs and keeps its
+    rollback journal in memory (see FAST_PRAGMAS).
+    """
     sqlite_module = get_sqlite_module()
     conn = sqlite_module.connect(str(path), check_same_thread=check_same_thread)
     conn.row_factory = sqlite_module.Row
+    if os.environ.get("SIA_CODE_SQLITE_FAST") == "1":
+        for pragma in FAST_PRAGMAS:
+            conn.execute(pragma)
     return conn
+
+
+def batched(items: list, size: int) -> list[list]:
+    """Split items into consecutive lists of at most size elements."""
+    return [items[i : i + size] for i in range(0, len(items), size)]
@@ -3,8 +3,9 @@
 import json
 import sqlite3
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import numpy as np
 
@@ -19,7 +20,22 @@ from ..core.models import (
 )
 from ..core.types import ChunkType, Language
 from .base import StorageBackend
-from .sqlite_runtime import connect_sqlite
+from .local_models import load_sentence_transformer
+from .sqlite_runtime import SQLITE_MAX_VARIABLES, batched, connect_sqlite
+
+# Columns written per chunk by store_chunks_batch, in parameter order
+CHUNK_INSERT_COLUMNS = (
+    "id",
+    "uri",
+    "symbol",
+    "chunk_type",
+    "file_path",
+    "start_line",
+    "end_line",
+    "language",
+    "code",
+    "metadata",
+)
 
 
 class _MemoryAdapter:
@@ -86,6 +102,9 @@ class SqliteVecBackend(StorageBackend):
         embedding_enabled: bool = True,
         embedding_model: str = "BAAI/bge-base-en-v1.5",
         ndim: int = 768,
+        embedding_backend: str = "torch",
+        embedding_model_file: str = "",
+        embedding_truncate: bool = False,
         **kwargs,
     ):
         """Initialize sqlite-vec + SQLite backend.
@@ -95,11 +114,17 @@ class SqliteVecBackend(StorageBackend):
             embedding_enabled: Whether to enable embeddings
             embedding_model: Embedding model name (e.g., 'bge-small')
             ndim: Embedding dimensionality
+            embedding_backend: sentence-transformers backend ('torch' or 'onnx')
+            embedding_model_file: Model file to load for non-torch backends
+            embedding_truncate: Truncate model output wider than ndim (Matryoshka)
             **kwargs: Additional configuration
         """
         super().__init__(path, **kwargs)
         self.embedding_enabled = embedding_enabled
         self.embedding_model = embedding_model
+        self.embedding_backend = embedding_backend
+        self.embedding_model_file = embedding_model_file
+        self.embedding_truncate = embedding_truncate
         self.ndim = ndim
 
         # Paths
@@ -108,9 +133,13 @@ class SqliteVecBackend(StorageBackend):
         # Will be initialized in create_index() or open_index()
         self.conn: sqlite3.Connection | None = None
         self._embedder = None  # Lazy-loaded embedding model
+        self._prefetched_embeddings: dict[str, np.ndarray] = {}
         self._vector_table_initialized = False
+        self._truncation_logged = False  # Warn once when embedding_truncate cuts vectors
         self._using_vec_extension = False
         self._vec_extension_error: Exception | None = None
+        # Brute-force fallback: (data_version, ids, unit-length vector matrix)
+        self._fallback_vectors: tuple[int, np.ndarray, np.ndarray] | None = None
 
         # Thread-local storage for parallel search
         import threading
@@ -120,6 +149,10 @@ class SqliteVecBackend(StorageBackend):
         # Search result cache
         self._search_cache: dict[str, list] | None = None
         self._search_cache_enabled = False
+        # Bumped on every chunk write; part of the lexical cache key (see search_lexical)
+        self._write_epoch = 0
+        # Multi-row INSERT statements by row count (see _insert_chunks_sql)
+        self._insert_sql_cache: dict[int, str] = {}
 
         self.mem = _MemoryAdapter(self)
 
@@ -257,6 +290,7 @@ class SqliteVecBackend(StorageBackend):
                 "INSERT OR REPLACE INTO vectors(id, embedding) VALUES (?, ?)",
                 (vector_id, payload),
             )
+            self._fallback_vectors = None
 
     def _vector_search(self, query_vector: np.ndarray, k: int) -> list[tuple[str, float]]:
         """Search vectors, returning list of (id, score)."""
@@ -282,24 +316,46 @@ class SqliteVecBackend(StorageBackend):
             rows = cursor.fetchall()
             return [(str(row[0]), 1.0 - float(row[1])) for row in rows]
 
-        cursor.execute("SELECT id, embedding FROM vectors")
-        rows = cursor.fetchall()
-        if not rows:
+        query = np.asarray(query_vector, dtype=np.float32).ravel()
+        ids, matrix = self._load_fallback_vectors(query.size)
+        if not len(ids):
             return []
 
-        query = np.asarray(query_vector, dtype=np.float32)
-        query_norm = np.linalg.norm(query) or 1.0
-        scored = []
-        for row in rows:
-            vec = np.frombuffer(row[1], dtype=np.float32)
-            if vec.size != query.size:
-                continue
-            denom = (np.linalg.norm(vec) or 1.0) * query_norm
-            score = float(np.dot(vec, query) / denom)
-            scored.append((str(row[0]), score))
+        # Rows are unit length, so one matrix-vector product gives every cosine score
+        scores = matrix @ (query / (np.linalg.norm(query) or 1.0))
+        if k < len(scores):
+            top = np.sort(np.argpartition(-scores, k)[:k])
+        else:
+            top = np.arange(len(scores))
+        # Stable sort on row order, so ties rank as they were stored
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(str(ids[i]), float(scores[i])) for i in top]
 
-        scored.sort(key=lambda item: item[1], reverse=True)
-        return scored[:k]
+    def _load_fallback_vectors(self, ndim: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return ids and a normalized (n, ndim) float32 matrix of the fallback vectors.
+
+        The matrix is rebuilt only after our own writes (see _vector_insert) or
+        when another connection has committed since it was loaded.
+        """
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        cached = self._fallback_vectors
+        if cached is not None and cached[0] == data_version and cached[2].shape[1] == ndim:
+            return cached[1], cached[2]
+
+        row_bytes = ndim * np.dtype(np.float32).itemsize
+        rows = [
+            row
+            for row in self.conn.execute("SELECT id, embedding FROM vectors")
+            if len(row[1]) == row_bytes
+        ]
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        matrix = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32)
+        matrix = matrix.reshape(len(rows), ndim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1.0, norms)
+
+        self._fallback_vectors = (data_version, ids, matrix)
+        return ids, matrix
 
     def _get_embedder(self):
         """Lazy-load the embedding model with GPU if available.
@@ -312,28 +368,22 @@ class SqliteVecBackend(StorageBackend):
 
             logger = logging.getLogger(__name__)
 
-            # Try embedding daemon first (fast path with model sharing)
+            # Try embedding daemon first (fast path with model sharing); it only
+            # serves torch models, so other backends always load locally
             try:
                 from ..embed_server.client import EmbedClient
 
-                if EmbedClient.is_available():
+                if self.embedding_backend == "torch" and EmbedClient.is_available():
                     self._embedder = EmbedClient(model_name=self.embedding_model)
                     logger.info(f"Using embedding daemon for {self.embedding_model}")
                     return self._embedder
             except Exception as e:
                 logger.debug(f"Embedding daemon not available: {e}")
 
-            # Fallback to local model (current behavior)
-            from sentence_transformers import SentenceTransformer
-            import torch
-
-            # Auto-detect device (GPU if available, CPU fallback)
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-
-            self._embedder = SentenceTransformer(self.embedding_model, device=device)
-
-            # Log device for debugging
-            logger.info(f"Loaded local {self.embedding_model} on {device.upper()}")
+            # Fallback to local model, shared with other backends in this process
+            self._embedder = load_sentence_transformer(
+                self.embedding_model, self.embedding_backend, self.embedding_model_file
+            )
 
         return self._embedder
 
@@ -361,12 +411,26 @@ class SqliteVecBackend(StorageBackend):
         if not self.embedding_enabled:
             return None
 
+        prefetched = self._prefetched_embeddings.get(text)
+        if prefetched is not None:
+            return prefetched
+
         # Use cached version to avoid re-embedding same text
         cached_result = self._embed_cached(text)
         if cached_result is not None:
             return np.array(cached_result)
         return None
 
+    def prefetch_query_embeddings(self, queries: list[str]) -> None:
+        """Embed queries in one model call for the searches that follow."""
+        if not self.embedding_enabled:
+            return
+        pending = [q for q in dict.fromkeys(queries) if q not in self._prefetched_embeddings]
+        if not pending:
+            return
+        vectors = self._embed_batch(pending)
+        self._prefetched_embeddings.update(zip(pending, vectors))
+
     def _embed_cached(self, text: str) -> tuple | None:
         """Cached embedding with LRU cache.
 
@@ -381,19 +445,50 @@ class SqliteVecBackend(StorageBackend):
             def cached_encode(text: str) -> tuple:
                 embedder = self._get_embedder()
                 vector = embedder.encode(text, convert_to_numpy=True)
-                return tuple(vector.tolist())
+                return tuple(self._truncate_vectors(np.asarray(vector)).tolist())
 
             self._embedding_cache = cached_encode
 
         return self._embedding_cache(text)
 
+    def _truncate_vectors(self, vectors: np.ndarray) -> np.ndarray:
+        """Cut model output down to the configured ``ndim`` (Matryoshka truncation).
+
+        Only done when ``embedding_truncate`` is set; otherwise, and for vectors
+        already at ``ndim``, the input is returned unchanged. Truncated vectors
+        are re-normalized to unit length, with a warning logged once per backend.
+        """
+        if vectors.shape[-1] <= self.ndim or not self.embedding_truncate:
+            return vectors
+        if not self._truncation_logged:
+            import logging
+
+            logger = logging.getLogger(__name__)
+            logger.warning(
+                f"Truncating {vectors.shape[-1]}-dimensional {self.embedding_model} "
+                f"embeddings to {self.ndim} dimensions (embedding.truncate_dimensions)"
+            )
+            self._truncation_logged = True
+        truncated = vectors[..., : self.ndim]
+        norms = np.linalg.norm(truncated, axis=-1, keepdims=True)
+        return truncated / np.where(norms == 0, 1.0, norms)
+
     def _get_embed_batch_size(self) -> int:
-        """Compute embedding batch size based on host capacity."""
+        """Compute embedding batch size based on host capacity.
+
+        SIA_CODE_EMBED_BATCH_SIZE overrides the computed size (e.g. small
+        batches are often faster on CPU-only hosts).
+        """
         if getattr(self, "_embed_batch_size", None):
             return self._embed_batch_size
 
         import os
 
+        override = os.environ.get("SIA_CODE_EMBED_BATCH_SIZE", "")
+        if override.isdigit() and int(override) > 0:
+            self._embed_batch_size = int(override)
+            return self._embed_batch_size
+
         try:
             import psutil
 
@@ -437,22 +532,26 @@ class SqliteVecBackend(StorageBackend):
         batch_size = self._get_embed_batch_size()
         encoded = []
 
+        # Batch texts of similar length together so each batch pads to a short
+        # longest-sequence; results are put back in input order below
+        order = np.argsort([len(text) for text in texts], kind="stable")
+
         # Process in batches to avoid memory spikes
         for idx in range(0, len(texts), batch_size):
-            batch = texts[idx : idx + batch_size]
+            batch = [texts[i] for i in order[idx : idx + batch_size]]
             vectors = embedder.encode(
                 batch,
                 batch_size=batch_size,
                 show_progress_bar=False,
                 convert_to_numpy=True,
             )
-            encoded.append(np.asarray(vectors, dtype=np.float32))
+            encoded.append(self._truncate_vectors(np.asarray(vectors, dtype=np.float32)))
 
         # Combine all batches
-        if len(encoded) == 1:
-            return encoded[0]
-        else:
-            return np.vstack(encoded)
+        stacked = encoded[0] if len(encoded) == 1 else np.vstack(encoded)
+        result = np.empty_like(stacked)
+        result[order] = stacked
+        return result
 
     def _make_chunk_key(self, chunk_id: int) -> str:
         """Create vector index key for chunk."""
@@ -536,6 +635,7 @@ class SqliteVecBackend(StorageBackend):
         # Create SQLite database (check_same_thread=False for parallel search)
         self.conn = connect_sqlite(self.db_path, check_same_thread=False)
         self._vector_table_initialized = False
+        self._fallback_vectors = None
         self._create_tables()
 
         # Ensure vector table exists when embeddings are enabled
@@ -553,6 +653,7 @@ class SqliteVecBackend(StorageBackend):
         # Open SQLite database (check_same_thread=False for parallel search)
         self.conn = connect_sqlite(self.db_path, check_same_thread=False)
         self._vector_table_initialized = False
+        self._fallback_vectors = None
 
         # Ensure schema is up to date for older indexes
         self._create_tables()
@@ -565,6 +666,7 @@ class SqliteVecBackend(StorageBackend):
             self.conn.commit()
             self.conn.close()
             self.conn = None
+        self.clear_search_cache()
 
     def seal(self) -> None:
         """Seal the index to finalize WAL and reduce storage.
@@ -769,6 +871,31 @@ class SqliteVecBackend(StorageBackend):
     # Code Operations
     # ===================================================================
 
+    def _chunk_ids_by_uri(self, cursor, uris: list[str]) -> dict[str, int]:
+        """Look up chunk ids for the given URIs (URIs without a chunk are omitted)."""
+        ids: dict[str, int] = {}
+        for batch in batched(uris, SQLITE_MAX_VARIABLES):
+            placeholders = ",".join("?" * len(batch))
+            cursor.execute(f"SELECT uri, id FROM chunks WHERE uri IN ({placeholders})", batch)
+            ids.update((row["uri"], int(row["id"])) for row in cursor.fetchall())
+        return ids
+
+    def _insert_chunks_sql(self, row_count: int) -> str:
+        """Return the multi-row chunks INSERT for row_count rows, built once per size.
+
+        Identical SQL text also lets sqlite3's statement cache reuse the
+        compiled statement across batches.
+        """
+        sql = self._insert_sql_cache.get(row_count)
+        if sql is None:
+            row = "(" + ",".join("?" * len(CHUNK_INSERT_COLUMNS)) + ")"
+            sql = (
+                f"INSERT INTO chunks ({', '.join(CHUNK_INSERT_COLUMNS)}) "
+                f"VALUES {','.join([row] * row_count)}"
+            )
+            self._insert_sql_cache[row_count] = sql
+        return sql
+
     def store_chunks_batch(self, chunks: list[Chunk]) -> list[str]:
         """Store multiple code chunks.
 
@@ -785,72 +912,69 @@ class SqliteVecBackend(StorageBackend):
         chunk_ids: list[int] = []
         embed_texts: list[str] = []
 
-        # Phase 1: preserve stable IDs on conflict without REPLACE row churn
-        for chunk in chunks:
-            uri = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
-            cursor.execute("SELECT id FROM chunks WHERE uri = ?", (uri,))
-            row = cursor.fetchone()
+        # One transaction for the whole batch, taking the write lock up front.
+        # Inside a caller's transaction, join it and leave commit to the caller.
+        owns_transaction = not self.conn.in_transaction
+        if owns_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
 
-            if row is None:
-                cursor.execute(
-                    """
-                    INSERT INTO chunks (
-                        uri, symbol, chunk_type, file_path, start_line, end_line, language, code, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        uri,
-                        chunk.symbol,
-                        chunk.chunk_type.value,
-                        str(chunk.file_path),
-                        chunk.start_line,
-                        chunk.end_line,
-                        chunk.language.value,
-                        chunk.code,
-                        json.dumps(chunk.metadata),
-                    ),
+        try:
+            # Phase 1: preserve stable IDs on conflict without REPLACE row churn.
+            # Rows are keyed by URI; a URI repeated in the batch keeps its last chunk,
+            # as with sequential upserts.
+            rows: dict[str, tuple] = {}
+            for chunk in chunks:
+                uri = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
+                rows[uri] = (
+                    uri,
+                    chunk.symbol,
+                    chunk.chunk_type.value,
+                    str(chunk.file_path),
+                    chunk.start_line,
+                    chunk.end_line,
+                    chunk.language.value,
+                    chunk.code,
+                    json.dumps(chunk.metadata),
                 )
-                chunk_id = int(cursor.lastrowid)
-            else:
-                chunk_id = int(row[0])
-                cursor.execute("DELETE FROM chunks WHERE id = ?", (chunk_id,))
+                embed_texts.append(f"{chunk.symbol}\n\n{chunk.code}")
+
+            uris = list(rows)
+            existing = self._chunk_ids_by_uri(cursor, uris)
+            for batch in batched(list(existing.values()), SQLITE_MAX_VARIABLES):
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(f"DELETE FROM chunks WHERE id IN ({placeholders})", batch)
+
+            # Re-insert updated rows under their old id; new rows get NULL (auto id)
+            values = [(existing.get(uri),) + rows[uri] for uri in uris]
+            rows_per_statement = SQLITE_MAX_VARIABLES // len(CHUNK_INSERT_COLUMNS)
+            for batch in batched(values, rows_per_statement):
                 cursor.execute(
-                    """
-                    INSERT INTO chunks (
-                        id, uri, symbol, chunk_type, file_path, start_line, end_line, language, code, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        chunk_id,
-                        uri,
-                        chunk.symbol,
-                        chunk.chunk_type.value,
-                        str(chunk.file_path),
-                        chunk.start_line,
-                        chunk.end_line,
-                        chunk.language.value,
-                        chunk.code,
-                        json.dumps(chunk.metadata),
-                    ),
+                    self._insert_chunks_sql(len(batch)), list(chain.from_iterable(batch))
                 )
 
-            chunk_ids.append(chunk_id)
-            embed_texts.append(f"{chunk.symbol}\n\n{chunk.code}")
+            new_ids = self._chunk_ids_by_uri(cursor, [uri for uri in uris if uri not in existing])
+            ids_by_uri = {**existing, **new_ids}
+            chunk_ids = [
+                ids_by_uri[f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"]
+                for chunk in chunks
+            ]
 
-        # Phase 2: Batch-embed all chunks (inserted or updated)
-        if self.embedding_enabled and chunk_ids:
-            try:
+            # Phase 2: Batch-embed all chunks (inserted or updated)
+            if self.embedding_enabled and chunk_ids:
                 vectors = self._embed_batch(embed_texts)
 
                 if vectors is not None:
                     for j, chunk_id in enumerate(chunk_ids):
                         self._vector_insert(int(chunk_id), vectors[j])
-            except Exception:
-                # Rollback SQLite inserts to avoid chunks without embeddings
+        except Exception:
+            # Roll back the whole batch: no half-written batches, no chunks without embeddings
+            if owns_transaction:
                 self.conn.rollback()
-                raise
+            raise
 
-        self.conn.commit()
+        if owns_transaction:
+            self.conn.commit()
+        self._write_epoch += 1
         return [str(chunk_id) for chunk_id in chunk_ids]
 
     def get_chunk(self, chunk_id: str) -> Chunk | None:
@@ -1096,6 +1220,10 @@ class SqliteVecBackend(StorageBackend):
     ) -> list[SearchResult]:
         """Lexical full-text search using SQLite FTS5.
 
+        Results are kept in an LRU cache until the chunks change, either through
+        this backend or another connection. Set SIA_CODE_SEARCH_CACHE=0 to
+        always query FTS5 (e.g. for benchmarks).
+
         Args:
             query: Query text
             k: Number of results to return
@@ -1108,47 +1236,83 @@ class SqliteVecBackend(StorageBackend):
         if self.conn is None:
             raise RuntimeError("Index not initialized")
 
-        cursor = self.conn.cursor()
+        import os
+
+        if os.environ.get("SIA_CODE_SEARCH_CACHE", "1") == "0":
+            return self._search_lexical_uncached(query, k, include_deps, tier_boost)
+
+        from functools import lru_cache
+
+        # Create cache on first call
+        if getattr(self, "_lexical_cache", None) is None:
+
+            @lru_cache(maxsize=256)
+            def cached_search(
+                state: tuple, query: str, k: int, include_deps: bool, boost: tuple | None
+            ) -> list[SearchResult]:
+                tier_boost = dict(boost) if boost is not None else None
+                return self._search_lexical_uncached(query, k, include_deps, tier_boost)
+
+            self._lexical_cache = cached_search
+
+        # Our own writes bump the epoch; data_version moves when another
+        # connection commits. Either one makes every older entry unreachable.
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        state = (self._write_epoch, data_version)
+        boost = tuple(sorted(tier_boost.items())) if tier_boost is not None else None
+        return list(self._lexical_cache(state, query, k, include_deps, boost))
+
+    def clear_search_cache(self) -> None:
+        """Drop all cached lexical search results."""
+        if getattr(self, "_lexical_cache", None) is not None:
+            self._lexical_cache.cache_clear()
+
+    def _search_lexical_uncached(
+        self, query: str, k: int, include_deps: bool, tier_boost: dict | None
+    ) -> list[SearchResult]:
+        """Run search_lexical() against FTS5, bypassing the result cache."""
+        return list(self.iter_search_lexical(query, k, include_deps, tier_boost))
+
+    def iter_search_lexical(
+        self, query: str, k: int = 10, include_deps: bool = True, tier_boost: dict | None = None
+    ) -> Iterator[SearchResult]:
+        """Yield lexical search results one at a time.
 
-        # Sanitize query for FTS5 using token extraction
-        sanitized_query = self._sanitize_fts5_query(query)
+        Produces the same results, scores and order as search_lexical(): the
+        top k FTS5 matches are boosted, tier-filtered and re-sorted, so nothing
+        is yielded until the query has finished. Candidates come from a single
+        FTS5/chunks join. The result cache is not consulted.
 
-        # FTS5 search
+        Args:
+            query: Query text
+            k: Maximum number of results to yield
+            include_deps: Whether to include dependency tier chunks (default: True)
+            tier_boost: Score multipliers per tier (default: project=1.0, dep=0.7, stdlib=0.5)
+
+        Yields:
+            Search results in boosted score order
+        """
+        if self.conn is None:
+            raise RuntimeError("Index not initialized")
+
+        cursor = self.conn.cursor()
         cursor.execute(
             """
-            SELECT chunks.id, bm25(chunks_fts) as rank
+            SELECT chunks.id, chunks.symbol, chunks.chunk_type, chunks.file_path,
+                   chunks.start_line, chunks.end_line, chunks.language, chunks.code,
+                   chunks.metadata, chunks.created_at, bm25(chunks_fts) as rank
             FROM chunks_fts
             JOIN chunks ON chunks.id = chunks_fts.rowid
             WHERE chunks_fts MATCH ?
             ORDER BY rank
             LIMIT ?
         """,
-            (sanitized_query, k),
+            (self._sanitize_fts5_query(query), k),
         )
 
-        rows = cursor.fetchall()
-        if not rows:
-            return []
-
-        ids_with_scores = []
-        for row in rows:
-            score = abs(float(row["rank"])) / 100.0  # Rough normalization
-            ids_with_scores.append((str(row["id"]), score))
-
-        chunk_ids = [chunk_id for chunk_id, _ in ids_with_scores]
-        placeholders = ",".join("?" * len(chunk_ids))
-        cursor.execute(
-            f"""
-            SELECT id, symbol, chunk_type, file_path, start_line, end_line,
-                   language, code, metadata, created_at
-            FROM chunks WHERE id IN ({placeholders})
-            """,
-            chunk_ids,
-        )
-
-        chunk_lookup = {}
+        results = []
         for row in cursor.fetchall():
-            chunk_lookup[str(row["id"])] = Chunk(
+            chunk = Chunk(
                 id=str(row["id"]),
                 symbol=row["symbol"],
                 chunk_type=ChunkType(row["chunk_type"]),
@@ -1160,15 +1324,11 @@ class SqliteVecBackend(StorageBackend):
                 metadata=json.loads(row["metadata"]) if row["metadata"] else {},
                 created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else None,
             )
+            score = abs(float(row["rank"])) / 100.0  # Rough normalization
+            results.append(SearchResult(chunk=chunk, score=score))
 
-        results = []
-        for chunk_id, score in ids_with_scores:
-            chunk = chunk_lookup.get(chunk_id)
-            if chunk:
-                results.append(SearchResult(chunk=chunk, score=score))
-
-        # Apply tier filtering and boosting
-        return self._apply_tier_filtering(results, k, include_deps, tier_boost)
+        # Apply tier filtering and boosting exactly as search_lexical() does
+        yield from self._apply_tier_filtering(results, k, include_deps, tier_boost)
 
     def search_hybrid(
         self,
@@ -1883,6 +2043,29 @@ class SqliteVecBackend(StorageBackend):
 
         return changelogs
 
+    def has_changelog(self, tag: str) -> bool:
+        """Return True if a changelog entry exists for the tag."""
+        if self.conn is None:
+            raise RuntimeError("Index not initialized")
+
+        row = self.conn.execute("SELECT 1 FROM changelogs WHERE tag = ? LIMIT 1", (tag,))
+        return row.fetchone() is not None
+
+    def has_timeline_event(self, event_type: str, from_ref: str, to_ref: str) -> bool:
+        """Return True if a timeline event with these attributes exists."""
+        if self.conn is None:
+            raise RuntimeError("Index not initialized")
+
+        row = self.conn.execute(
+            """
+            SELECT 1 FROM timeline
+            WHERE event_type = ? AND from_ref = ? AND to_ref = ?
+            LIMIT 1
+        """,
+            (event_type, from_ref, to_ref),
+        )
+        return row.fetchone() is not None
+
     # ===================================================================
     # Unified Search (Code + Memory)
     # ===================================================================
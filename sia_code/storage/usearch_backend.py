@@ -1,10 +1,11 @@
 """Usearch + SQLite FTS5 storage backend for code and memory."""
 
 import json
+import os
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import numpy as np
 from usearch.index import Index, MetricKind
@@ -20,7 +21,8 @@ from ..core.models import (
 )
 from ..core.types import ChunkType, Language
 from .base import StorageBackend
-from .sqlite_runtime import connect_sqlite
+from .local_models import load_sentence_transformer
+from .sqlite_runtime import SQLITE_MAX_VARIABLES, batched, connect_sqlite
 
 
 class _MemoryAdapter:
@@ -90,6 +92,9 @@ class UsearchSqliteBackend(StorageBackend):
         ndim: int = 768,
         dtype: str = "f16",
         metric: str = "cos",
+        embedding_backend: str = "torch",
+        embedding_model_file: str = "",
+        embedding_truncate: bool = False,
         **kwargs,
     ):
         """Initialize usearch + SQLite backend.
@@ -101,11 +106,23 @@ class UsearchSqliteBackend(StorageBackend):
             ndim: Embedding dimensionality
             dtype: Vector data type ('f16', 'f32', 'i8')
             metric: Distance metric ('cos', 'l2sq', 'ip')
+            embedding_backend: sentence-transformers backend ('torch' or 'onnx')
+            embedding_model_file: Model file to load for non-torch backends
+            embedding_truncate: Not supported; must be False
             **kwargs: Additional configuration
+
+        Raises:
+            ValueError: If embedding_truncate is set
         """
+        if embedding_truncate:
+            raise ValueError(
+                "embedding.truncate_dimensions is only supported by the sqlite-vec backend"
+            )
         super().__init__(path, **kwargs)
         self.embedding_enabled = embedding_enabled
         self.embedding_model = embedding_model
+        self.embedding_backend = embedding_backend
+        self.embedding_model_file = embedding_model_file
         self.ndim = ndim
         self.dtype = dtype
         self.metric = metric
@@ -118,6 +135,7 @@ class UsearchSqliteBackend(StorageBackend):
         self.vector_index: Index | None = None
         self.conn: sqlite3.Connection | None = None
         self._embedder = None  # Lazy-loaded embedding model
+        self._in_memory = False  # Set by in_memory(): nothing is read from or saved to disk
 
         # Thread-local storage for parallel search
         import threading
@@ -127,6 +145,8 @@ class UsearchSqliteBackend(StorageBackend):
         # Search result cache
         self._search_cache: dict[str, list] | None = None
         self._search_cache_enabled = False
+        # Bumped on every chunk write; part of the lexical cache key (see search_lexical)
+        self._write_epoch = 0
 
         self.mem = _MemoryAdapter(self)
 
@@ -179,28 +199,22 @@ class UsearchSqliteBackend(StorageBackend):
 
             logger = logging.getLogger(__name__)
 
-            # Try embedding daemon first (fast path with model sharing)
+            # Try embedding daemon first (fast path with model sharing); it only
+            # serves torch models, so other backends always load locally
             try:
                 from ..embed_server.client import EmbedClient
 
-                if EmbedClient.is_available():
+                if self.embedding_backend == "torch" and EmbedClient.is_available():
                     self._embedder = EmbedClient(model_name=self.embedding_model)
                     logger.info(f"Using embedding daemon for {self.embedding_model}")
                     return self._embedder
             except Exception as e:
                 logger.debug(f"Embedding daemon not available: {e}")
 
-            # Fallback to local model (current behavior)
-            from sentence_transformers import SentenceTransformer
-            import torch
-
-            # Auto-detect device (GPU if available, CPU fallback)
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-
-            self._embedder = SentenceTransformer(self.embedding_model, device=device)
-
-            # Log device for debugging
-            logger.info(f"Loaded local {self.embedding_model} on {device.upper()}")
+            # Fallback to local model, shared with other backends in this process
+            self._embedder = load_sentence_transformer(
+                self.embedding_model, self.embedding_backend, self.embedding_model_file
+            )
 
         return self._embedder
 
@@ -396,9 +410,26 @@ class UsearchSqliteBackend(StorageBackend):
     # Index Lifecycle
     # ===================================================================
 
+    @classmethod
+    def in_memory(cls, **kwargs) -> "UsearchSqliteBackend":
+        """Create an index that lives only in RAM (SQLite `:memory:` + unsaved vectors).
+
+        The returned backend is already created; close() discards it. Meant for
+        tests and other throwaway indexes.
+
+        Args:
+            **kwargs: Backend configuration, as for the constructor (without path)
+        """
+        backend = cls(path=Path(":memory:"), **kwargs)
+        backend.db_path = Path(":memory:")
+        backend._in_memory = True
+        backend.create_index()
+        return backend
+
     def create_index(self) -> None:
         """Create a new index (vectors + SQLite)."""
-        self.path.mkdir(parents=True, exist_ok=True)
+        if not self._in_memory:
+            self.path.mkdir(parents=True, exist_ok=True)
 
         # Create usearch vector index
         self.vector_index = Index(
@@ -469,7 +500,7 @@ class UsearchSqliteBackend(StorageBackend):
             is_viewed = getattr(self, "_is_viewed", False)
             modified_after_view = getattr(self, "_modified_after_view", False)
 
-            if not is_viewed or modified_after_view:
+            if not self._in_memory and (not is_viewed or modified_after_view):
                 self.vector_index.save(str(self.vector_path))
 
             self._is_viewed = False  # Reset flags
@@ -479,6 +510,7 @@ class UsearchSqliteBackend(StorageBackend):
             self.conn.commit()
             self.conn.close()
             self.conn = None
+        self.clear_search_cache()
 
     def seal(self) -> None:
         """Seal the index to finalize WAL and reduce storage.
@@ -682,6 +714,15 @@ class UsearchSqliteBackend(StorageBackend):
     # Code Operations
     # ===================================================================
 
+    def _chunk_ids_by_uri(self, cursor, uris: list[str]) -> dict[str, int]:
+        """Look up chunk ids for the given URIs (URIs without a chunk are omitted)."""
+        ids: dict[str, int] = {}
+        for batch in batched(uris, SQLITE_MAX_VARIABLES):
+            placeholders = ",".join("?" * len(batch))
+            cursor.execute(f"SELECT uri, id FROM chunks WHERE uri IN ({placeholders})", batch)
+            ids.update((row["uri"], int(row["id"])) for row in cursor.fetchall())
+        return ids
+
     def store_chunks_batch(self, chunks: list[Chunk]) -> list[str]:
         """Store multiple code chunks.
 
@@ -698,61 +739,58 @@ class UsearchSqliteBackend(StorageBackend):
         chunk_ids: list[int] = []
         embed_texts: list[str] = []
 
-        # Phase 1: preserve stable IDs on conflict without REPLACE row churn
-        for chunk in chunks:
-            uri = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
-            cursor.execute("SELECT id FROM chunks WHERE uri = ?", (uri,))
-            row = cursor.fetchone()
-
-            if row is None:
-                cursor.execute(
-                    """
-                    INSERT INTO chunks (
-                        uri, symbol, chunk_type, file_path, start_line, end_line, language, code, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        uri,
-                        chunk.symbol,
-                        chunk.chunk_type.value,
-                        str(chunk.file_path),
-                        chunk.start_line,
-                        chunk.end_line,
-                        chunk.language.value,
-                        chunk.code,
-                        json.dumps(chunk.metadata),
-                    ),
-                )
-                chunk_id = int(cursor.lastrowid)
-            else:
-                chunk_id = int(row[0])
-                cursor.execute("DELETE FROM chunks WHERE id = ?", (chunk_id,))
-                cursor.execute(
-                    """
-                    INSERT INTO chunks (
-                        id, uri, symbol, chunk_type, file_path, start_line, end_line, language, code, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        chunk_id,
-                        uri,
-                        chunk.symbol,
-                        chunk.chunk_type.value,
-                        str(chunk.file_path),
-                        chunk.start_line,
-                        chunk.end_line,
-                        chunk.language.value,
-                        chunk.code,
-                        json.dumps(chunk.metadata),
-                    ),
+        # One transaction for the whole batch, taking the write lock up front.
+        # Inside a caller's transaction, join it and leave commit to the caller.
+        owns_transaction = not self.conn.in_transaction
+        if owns_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+
+        try:
+            # Phase 1: preserve stable IDs on conflict without REPLACE row churn.
+            # Rows are keyed by URI; a URI repeated in the batch keeps its last chunk,
+            # as with sequential upserts.
+            rows: dict[str, tuple] = {}
+            for chunk in chunks:
+                uri = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
+                rows[uri] = (
+                    uri,
+                    chunk.symbol,
+                    chunk.chunk_type.value,
+                    str(chunk.file_path),
+                    chunk.start_line,
+                    chunk.end_line,
+                    chunk.language.value,
+                    chunk.code,
+                    json.dumps(chunk.metadata),
                 )
+                embed_texts.append(f"{chunk.symbol}\n\n{chunk.code}")
 
-            chunk_ids.append(chunk_id)
-            embed_texts.append(f"{chunk.symbol}\n\n{chunk.code}")
+            uris = list(rows)
+            existing = self._chunk_ids_by_uri(cursor, uris)
+            cursor.executemany(
+                "DELETE FROM chunks WHERE id = ?", [(chunk_id,) for chunk_id in existing.values()]
+            )
 
-        # Phase 2: Batch-embed all chunks (inserted or updated)
-        if self.embedding_enabled and chunk_ids:
-            try:
+            # Re-insert updated rows under their old id; new rows get NULL (auto id)
+            cursor.executemany(
+                """
+                INSERT INTO chunks (
+                    id, uri, symbol, chunk_type, file_path, start_line, end_line, language, code,
+                    metadata
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                [(existing.get(uri),) + rows[uri] for uri in uris],
+            )
+
+            new_ids = self._chunk_ids_by_uri(cursor, [uri for uri in uris if uri not in existing])
+            ids_by_uri = {**existing, **new_ids}
+            chunk_ids = [
+                ids_by_uri[f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"]
+                for chunk in chunks
+            ]
+
+            # Phase 2: Batch-embed all chunks (inserted or updated)
+            if self.embedding_enabled and chunk_ids:
                 vectors = self._embed_batch(embed_texts)
 
                 if vectors is not None:
@@ -762,12 +800,15 @@ class UsearchSqliteBackend(StorageBackend):
                         # Track that we modified the index after viewing
                         if getattr(self, "_is_viewed", False):
                             self._modified_after_view = True
-            except Exception:
-                # Rollback SQLite inserts to avoid chunks without embeddings
+        except Exception:
+            # Roll back the whole batch: no half-written batches, no chunks without embeddings
+            if owns_transaction:
                 self.conn.rollback()
-                raise
+            raise
 
-        self.conn.commit()
+        if owns_transaction:
+            self.conn.commit()
+        self._write_epoch += 1
         return [str(chunk_id) for chunk_id in chunk_ids]
 
     def get_chunk(self, chunk_id: str) -> Chunk | None:
@@ -1019,6 +1060,10 @@ class UsearchSqliteBackend(StorageBackend):
     ) -> list[SearchResult]:
         """Lexical full-text search using SQLite FTS5.
 
+        Results are kept in an LRU cache until the chunks change, either through
+        this backend or another connection. Set SIA_CODE_SEARCH_CACHE=0 to
+        always query FTS5 (e.g. for benchmarks).
+
         Args:
             query: Query text
             k: Number of results to return
@@ -1031,47 +1076,81 @@ class UsearchSqliteBackend(StorageBackend):
         if self.conn is None:
             raise RuntimeError("Index not initialized")
 
-        cursor = self.conn.cursor()
+        if os.environ.get("SIA_CODE_SEARCH_CACHE", "1") == "0":
+            return self._search_lexical_uncached(query, k, include_deps, tier_boost)
+
+        from functools import lru_cache
 
-        # Sanitize query for FTS5 using token extraction
-        sanitized_query = self._sanitize_fts5_query(query)
+        # Create cache on first call
+        if getattr(self, "_lexical_cache", None) is None:
+
+            @lru_cache(maxsize=256)
+            def cached_search(
+                state: tuple, query: str, k: int, include_deps: bool, boost: tuple | None
+            ) -> list[SearchResult]:
+                tier_boost = dict(boost) if boost is not None else None
+                return self._search_lexical_uncached(query, k, include_deps, tier_boost)
+
+            self._lexical_cache = cached_search
+
+        # Our own writes bump the epoch; data_version moves when another
+        # connection commits. Either one makes every older entry unreachable.
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        state = (self._write_epoch, data_version)
+        boost = tuple(sorted(tier_boost.items())) if tier_boost is not None else None
+        return list(self._lexical_cache(state, query, k, include_deps, boost))
+
+    def clear_search_cache(self) -> None:
+        """Drop all cached lexical search results."""
+        if getattr(self, "_lexical_cache", None) is not None:
+            self._lexical_cache.cache_clear()
+
+    def _search_lexical_uncached(
+        self, query: str, k: int, include_deps: bool, tier_boost: dict | None
+    ) -> list[SearchResult]:
+        """Run search_lexical() against FTS5, bypassing the result cache."""
+        return list(self.iter_search_lexical(query, k, include_deps, tier_boost))
 
-        # FTS5 search
+    def iter_search_lexical(
+        self, query: str, k: int = 10, include_deps: bool = True, tier_boost: dict | None = None
+    ) -> Iterator[SearchResult]:
+        """Yield lexical search results one at a time.
+
+        Produces the same results, scores and order as search_lexical(): the
+        top k FTS5 matches are boosted, tier-filtered and re-sorted, so nothing
+        is yielded until the query has finished. Candidates come from a single
+        FTS5/chunks join. The result cache is not consulted.
+
+        Args:
+            query: Query text
+            k: Maximum number of results to yield
+            include_deps: Whether to include dependency tier chunks (default: True)
+            tier_boost: Score multipliers per tier (default: project=1.0, dep=0.7, stdlib=0.5)
+
+        Yields:
+            Search results in boosted score order
+        """
+        if self.conn is None:
+            raise RuntimeError("Index not initialized")
+
+        cursor = self.conn.cursor()
         cursor.execute(
             """
-            SELECT chunks.id, bm25(chunks_fts) as rank
+            SELECT chunks.id, chunks.symbol, chunks.chunk_type, chunks.file_path,
+                   chunks.start_line, chunks.end_line, chunks.language, chunks.code,
+                   chunks.metadata, chunks.created_at, bm25(chunks_fts) as rank
             FROM chunks_fts
             JOIN chunks ON chunks.id = chunks_fts.rowid
             WHERE chunks_fts MATCH ?
             ORDER BY rank
             LIMIT ?
         """,
-            (sanitized_query, k),
+            (self._sanitize_fts5_query(query), k),
         )
 
-        rows = cursor.fetchall()
-        if not rows:
-            return []
-
-        ids_with_scores = []
-        for row in rows:
-            score = abs(float(row["rank"])) / 100.0  # Rough normalization
-            ids_with_scores.append((str(row["id"]), score))
-
-        chunk_ids = [chunk_id for chunk_id, _ in ids_with_scores]
-        placeholders = ",".join("?" * len(chunk_ids))
-        cursor.execute(
-            f"""
-            SELECT id, symbol, chunk_type, file_path, start_line, end_line,
-                   language, code, metadata, created_at
-            FROM chunks WHERE id IN ({placeholders})
-            """,
-            chunk_ids,
-        )
-
-        chunk_lookup = {}
+        results = []
         for row in cursor.fetchall():
-            chunk_lookup[str(row["id"])] = Chunk(
+            chunk = Chunk(
                 id=str(row["id"]),
                 symbol=row["symbol"],
                 chunk_type=ChunkType(row["chunk_type"]),
@@ -1083,15 +1162,11 @@ class UsearchSqliteBackend(StorageBackend):
                 metadata=json.loads(row["metadata"]) if row["metadata"] else {},
                 created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else None,
             )
+            score = abs(float(row["rank"])) / 100.0  # Rough normalization
+            results.append(SearchResult(chunk=chunk, score=score))
 
-        results = []
-        for chunk_id, score in ids_with_scores:
-            chunk = chunk_lookup.get(chunk_id)
-            if chunk:
-                results.append(SearchResult(chunk=chunk, score=score))
-
-        # Apply tier filtering and boosting
-        return self._apply_tier_filtering(results, k, include_deps, tier_boost)
+        # Apply tier filtering and boosting exactly as search_lexical() does
+        yield from self._apply_tier_filtering(results, k, include_deps, tier_boost)
 
     def search_hybrid(
         self,
@@ -1822,6 +1897,29 @@ class UsearchSqliteBackend(StorageBackend):
 
         return changelogs
 
+    def has_changelog(self, tag: str) -> bool:
+        """Return True if a changelog entry exists for the tag."""
+        if self.conn is None:
+            raise RuntimeError("Index not initialized")
+
+        row = self.conn.execute("SELECT 1 FROM changelogs WHERE tag = ? LIMIT 1", (tag,))
+        return row.fetchone() is not None
+
+    def has_timeline_event(self, event_type: str, from_ref: str, to_ref: str) -> bool:
+        """Return True if a timeline event with these attributes exists."""
+        if self.conn is None:
+            raise RuntimeError("Index not initialized")
+
+        row = self.conn.execute(
+            """
+            SELECT 1 FROM timeline
+            WHERE event_type = ? AND from_ref = ? AND to_ref = ?
+            LIMIT 1
+        """,
+            (event_type, from_ref, to_ref),
+        )
+        return row.fetchone() is not None
+
     # ===================================================================
     # Unified Search (Code + Memory)
     # ===================================================================
@@ -34,6 +34,7 @@ from .llm_evaluation import (
 from .tasks.architectural_tasks import (
     ArchitecturalTask,
     get_all_tasks,
+    get_task,
     get_tasks_by_codebase,
     get_tasks_by_difficulty,
     get_tasks_by_type,
@@ -62,6 +63,7 @@ __all__ = [
     # Tasks
     "ArchitecturalTask",
     "get_all_tasks",
+    "get_task",
     "get_tasks_by_codebase",
     "get_tasks_by_difficulty",
     "get_tasks_by_type",
@@ -138,7 +138,7 @@ def index_repository(repo_path: Path) -> tuple[float, dict]:
         "throughput": 0.0,
     }
 
-    for line in stdout.split("\n"):
+    for line in stdout.splitlines():
         if "Files indexed:" in line:
             stats["files_indexed"] = int(line.split(":")[-1].strip())
         elif "Total chunks:" in line:
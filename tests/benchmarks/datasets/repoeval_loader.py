@@ -6,7 +6,7 @@ Based on the RepoCoder paper: https://github.com/microsoft/CodeT/tree/main/RepoC
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 
 @dataclass
@@ -35,18 +35,21 @@ class RepoEvalQuery:
 
 def load_repoeval(
     dataset_path: Path, repo_filter: Optional[str] = None, max_queries: Optional[int] = None
-) -> list[RepoEvalQuery]:
-    """Load RepoEval dataset from JSONL file.
+) -> Iterator[RepoEvalQuery]:
+    """Stream RepoEval queries from a JSONL file.
+
+    Queries are parsed lazily, one line at a time, so callers never hold the
+    whole dataset in memory.
 
     Args:
         dataset_path: Path to .jsonl file
         repo_filter: Only load queries for this repo (e.g., "huggingface_diffusers")
         max_queries: Maximum number of queries to load
 
-    Returns:
-        List of RepoEval queries
+    Yields:
+        RepoEval queries in dataset order
     """
-    queries = []
+    loaded = 0
 
     with open(dataset_path, "r") as f:
         for line in f:
@@ -72,13 +75,12 @@ def load_repoeval(
                 ground_truth=metadata["ground_truth"],
             )
 
-            queries.append(query)
+            yield query
+            loaded += 1
 
-            if max_queries and len(queries) >= max_queries:
+            if max_queries and loaded >= max_queries:
                 break
 
-    return queries
-
 
 def get_ground_truth_files(query: RepoEvalQuery) -> list[str]:
     """Get ground truth file paths for a query.
@@ -99,7 +101,9 @@ if __name__ == "__main__":
 
     if dataset_path.exists():
         # Load first 10 queries for huggingface_diffusers
-        queries = load_repoeval(dataset_path, repo_filter="huggingface_diffusers", max_queries=10)
+        queries = list(
+            load_repoeval(dataset_path, repo_filter="huggingface_diffusers", max_queries=10)
+        )
 
         print(f"Loaded {len(queries)} queries")
         print("\nExample query:")
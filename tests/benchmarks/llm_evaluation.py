@@ -10,6 +10,11 @@ from dataclasses import dataclass, asdict
 from typing import Dict, List, Optional, Any, Protocol
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .tasks.architectural_tasks import ArchitecturalTask
 from .tasks.evaluation_prompts import (
     create_judge_prompt,
@@ -75,6 +80,25 @@ class EvaluationResult:
         return asdict(self)
 
 
+# SDK clients shared across judges, keyed by (SDK class, API key)
+_SDK_CLIENTS: Dict[tuple, Any] = {}
+
+
+def _shared_sdk_client(sdk_class: Any, api_key: Optional[str]) -> Any:
+    """Return a process-wide SDK client for the given provider and API key.
+
+    Each OpenAI/Anthropic SDK client owns a pooled HTTP client, so sharing one
+    instance keeps connections alive across judge calls instead of paying a new
+    TCP+TLS handshake for every evaluation.
+    """
+    key = (sdk_class, api_key)
+    client = _SDK_CLIENTS.get(key)
+    if client is None:
+        client = sdk_class(api_key=api_key)
+        _SDK_CLIENTS[key] = client
+    return client
+
+
 class OpenAIClient:
     """OpenAI API client for LLM judge evaluation."""
 
@@ -91,7 +115,7 @@ class OpenAIClient:
             raise ImportError("OpenAI package not installed. Install with: pip install openai")
 
         self.model = model
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        self.client = _shared_sdk_client(OpenAI, api_key or os.getenv("OPENAI_API_KEY"))
 
     def generate(self, prompt: str, temperature: float = 0.0) -> str:
         """Generate completion using OpenAI API."""
@@ -121,7 +145,7 @@ class AnthropicClient:
             )
 
         self.model = model
-        self.client = Anthropic(api_key=api_key or os.getenv("ANTHROPIC_API_KEY"))
+        self.client = _shared_sdk_client(Anthropic, api_key or os.getenv("ANTHROPIC_API_KEY"))
 
     def generate(self, prompt: str, temperature: float = 0.0) -> str:
         """Generate completion using Anthropic API."""
@@ -365,6 +389,11 @@ def save_evaluation_results(results: List[EvaluationResult], output_path: Path)
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    if orjson is not None:
+        # orjson serializes dataclasses natively, skipping the per-result dict copy
+        output_path.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        return
+
     with open(output_path, "w") as f:
         json.dump([r.to_dict() for r in results], f, indent=2)
 
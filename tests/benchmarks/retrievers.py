@@ -234,10 +234,7 @@ class GrepRetriever:
                     # Group by file
                     file_chunks = {}
 
-                    for line in output.split("\n"):
-                        if not line:
-                            continue
-
+                    for line in output.splitlines():
                         # Parse: filepath:line_number:content or filepath-line_number-content
                         match = re.match(r"^([^:]+):(\d+)[:|-](.*)$", line)
                         if match:
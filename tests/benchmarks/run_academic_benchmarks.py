@@ -57,8 +57,8 @@ def evaluate_retriever_on_query(
         task_id=query.query_id,
         question=query.query,
         codebase="sia-code",
-        expected_files=query.relevant_files,
-        expected_concepts=[],
+        expected_files=tuple(query.relevant_files),
+        expected_concepts=(),
         difficulty=query.difficulty,
         task_type=query.category,
     )
@@ -72,10 +72,9 @@ def evaluate_retriever_on_query(
     codebase_root = Path("/home/dxta/dev/portable-code-index/pci")  # TODO: Make configurable
 
     for chunk in chunks:
-        lines = chunk.split("\n")
-        for line in lines:
+        for line in chunk.splitlines():
             if line.startswith("# File: "):
-                filepath = line.replace("# File: ", "").strip()
+                filepath = line[len("# File: ") :].strip()
 
                 # Normalize to relative path if absolute
                 filepath_obj = Path(filepath)
@@ -13,12 +13,20 @@ Usage:
 """
 
 import json
+import re
 import subprocess
 import sys
 import time
 from pathlib import Path
 from datetime import datetime
 
+# 'sia-code' from the same environment as the running Python
+_SIA_CODE_BIN = str(Path(sys.executable).parent / "sia-code")
+
+# Index summary lines printed by `sia-code index`
+_INDEX_STATS_RE = re.compile(r"^\s*(Files indexed|Total chunks):\s*(\d+)", re.MULTILINE)
+_INDEX_STAT_KEYS = {"Files indexed": "files", "Total chunks": "chunks"}
+
 # Repository configurations
 REPOSITORIES = [
     {
@@ -138,10 +146,8 @@ backend.close()
 
     # Index repository
     start = time.time()
-    # Use the sia-code from the same environment as the running Python
-    sia_code_path = str(Path(sys.executable).parent / "sia-code")
     result = subprocess.run(
-        [sia_code_path, "index", "."],
+        [_SIA_CODE_BIN, "index", "."],
         cwd=repo_path,
         capture_output=True,
         text=True,
@@ -151,11 +157,8 @@ backend.close()
 
     # Parse stats
     stats = {"files": 0, "chunks": 0}
-    for line in result.stdout.split("\n"):
-        if "Files indexed:" in line:
-            stats["files"] = int(line.split(":")[-1].strip())
-        elif "Total chunks:" in line:
-            stats["chunks"] = int(line.split(":")[-1].strip())
+    for label, value in _INDEX_STATS_RE.findall(result.stdout):
+        stats[_INDEX_STAT_KEYS[label]] = int(value)
 
     # Get index size
     index_size = sum(f.stat().st_size for f in sia_dir.rglob("*") if f.is_file())
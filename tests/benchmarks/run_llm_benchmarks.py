@@ -10,20 +10,26 @@ Usage:
 
     # Run full benchmark suite
     python -m tests.benchmarks.run_llm_benchmarks --suite sia-code --judges gpt-4o,claude-opus --output results/
+
+    # Run suite with a quick judge pass, escalating only borderline scores
+    python -m tests.benchmarks.run_llm_benchmarks --suite sia-code --escalation-margin 25
 """
 
 import argparse
 import json
 import sys
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from .tasks.architectural_tasks import (
     get_all_tasks,
+    get_task,
     get_tasks_by_codebase,
     ArchitecturalTask,
 )
-from .llm_evaluation import create_judge, save_evaluation_results, EvaluationResult
+from .llm_evaluation import create_judge, save_evaluation_results, EvaluationResult, LLMJudge
 from .retrievers import create_retriever
 
 
@@ -31,6 +37,43 @@ from .retrievers import create_retriever
 DEFAULT_INDEX_PATH = Path(".pci/index.db")
 DEFAULT_CODEBASE_PATH = Path(".")
 
+# Number of evaluations between progress flushes in suite mode
+PROGRESS_FLUSH_EVERY = 16
+
+# Suggested band around the midpoint score for --escalation-margin
+DEFAULT_ESCALATION_MARGIN = 25.0
+
+
+class ProgressBuffer:
+    """Collect progress lines and write them to stdout in batches.
+
+    Avoids one write syscall (and line-buffered flush) per status line when a
+    suite runs thousands of evaluations.
+    """
+
+    def __init__(self, flush_every: int = PROGRESS_FLUSH_EVERY):
+        self.flush_every = max(1, flush_every)
+        self._lines: List[str] = []
+        self._pending_evaluations = 0
+
+    def add(self, line: str) -> None:
+        """Queue a progress line."""
+        self._lines.append(line)
+
+    def evaluation_done(self) -> None:
+        """Mark one evaluation as finished, flushing every `flush_every` calls."""
+        self._pending_evaluations += 1
+        if self._pending_evaluations >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued lines in a single call."""
+        if self._lines:
+            sys.stdout.write("\n".join(self._lines) + "\n")
+            sys.stdout.flush()
+            self._lines.clear()
+        self._pending_evaluations = 0
+
 
 def generate_tool_response(
     task: ArchitecturalTask, tool_name: str, retriever, top_k: int = 10
@@ -67,6 +110,12 @@ def generate_tool_response(
     return response
 
 
+@lru_cache(maxsize=None)
+def _cached_judge(judge_model: str, rubric: str) -> LLMJudge:
+    """Create a judge once per (model, rubric) pair."""
+    return create_judge(judge_model, rubric)
+
+
 def run_single_evaluation(
     task_id: str,
     tool_name: str,
@@ -74,6 +123,7 @@ def run_single_evaluation(
     rubric: str = "comprehensive",
     index_path: Path = DEFAULT_INDEX_PATH,
     codebase_path: Path = DEFAULT_CODEBASE_PATH,
+    escalation_margin: Optional[float] = None,
 ) -> EvaluationResult:
     """Run evaluation for a single task and tool.
 
@@ -84,17 +134,17 @@ def run_single_evaluation(
         rubric: Scoring rubric to use
         index_path: Path to index file (for sia-code)
         codebase_path: Path to codebase root (for grep)
+        escalation_margin: If set, judge with the "quick" rubric first and only
+            run `rubric` when the quick score is within this distance of 50
 
     Returns:
         Evaluation result
     """
     # Get task
-    tasks = {t.task_id: t for t in get_all_tasks()}
-    if task_id not in tasks:
+    task = get_task(task_id)
+    if task is None:
         raise ValueError(f"Task not found: {task_id}")
 
-    task = tasks[task_id]
-
     # Create retriever
     retriever = create_retriever(
         tool_name=tool_name,
@@ -105,8 +155,14 @@ def run_single_evaluation(
     # Generate tool response
     tool_response = generate_tool_response(task, tool_name, retriever)
 
+    # Two-stage judging: a cheap quick pass settles clear-cut responses
+    if escalation_margin is not None and rubric != "quick":
+        quick_result = _cached_judge(judge_model, "quick").evaluate(task, tool_response, tool_name)
+        if abs(quick_result.score - 50.0) > escalation_margin:
+            return quick_result
+
     # Create judge and evaluate
-    judge = create_judge(judge_model, rubric)
+    judge = _cached_judge(judge_model, rubric)
     result = judge.evaluate(task, tool_response, tool_name)
 
     return result
@@ -132,12 +188,10 @@ def run_comparison(
         Comparison results
     """
     # Get task
-    tasks = {t.task_id: t for t in get_all_tasks()}
-    if task_id not in tasks:
+    task = get_task(task_id)
+    if task is None:
         raise ValueError(f"Task not found: {task_id}")
 
-    task = tasks[task_id]
-
     # Generate responses from all tools
     tool_responses = {}
     for tool_name in tool_names:
@@ -163,6 +217,7 @@ def run_benchmark_suite(
     rubric: str = "comprehensive",
     index_path: Path = DEFAULT_INDEX_PATH,
     codebase_path: Path = DEFAULT_CODEBASE_PATH,
+    escalation_margin: Optional[float] = None,
 ) -> None:
     """Run complete benchmark suite for a codebase.
 
@@ -174,6 +229,7 @@ def run_benchmark_suite(
         rubric: Scoring rubric to use
         index_path: Path to index file (for sia-code)
         codebase_path: Path to codebase root (for grep)
+        escalation_margin: Enable quick-then-full judging (see run_single_evaluation)
     """
     # Get tasks for codebase
     tasks = get_tasks_by_codebase(codebase)
@@ -185,17 +241,22 @@ def run_benchmark_suite(
     print(f"\n=== Running {len(tasks)} tasks for {codebase} ===")
     print(f"Tools: {', '.join(tools)}")
     print(f"Judges: {', '.join(judges)}")
-    print(f"Rubric: {rubric}\n")
+    if escalation_margin is not None:
+        print(f"Rubric: quick -> {rubric} (escalation margin {escalation_margin:g})\n")
+    else:
+        print(f"Rubric: {rubric}\n")
 
     # Run evaluations
-    all_results = []
+    all_results: List[EvaluationResult] = []
+    results_by_tool: Dict[str, List[EvaluationResult]] = defaultdict(list)
+    progress = ProgressBuffer()
 
     for task in tasks:
-        print(f"\nTask: {task.task_id} ({task.difficulty}, {task.task_type})")
-        print(f"Question: {task.question}")
+        progress.add(f"\nTask: {task.task_id} ({task.difficulty}, {task.task_type})")
+        progress.add(f"Question: {task.question}")
 
         for tool_name in tools:
-            print(f"  Evaluating {tool_name}...")
+            progress.add(f"  Evaluating {tool_name}...")
 
             for judge_model in judges:
                 try:
@@ -206,19 +267,25 @@ def run_benchmark_suite(
                         rubric,
                         index_path,
                         codebase_path,
+                        escalation_margin,
                     )
                     all_results.append(result)
+                    results_by_tool[tool_name].append(result)
 
-                    print(f"    {judge_model}: {result.score:.1f}/100")
-                    print(
+                    progress.add(f"    {judge_model}: {result.score:.1f}/100")
+                    progress.add(
                         f"      Coverage: {result.file_coverage:.1f}F {result.concept_coverage:.1f}C"
                     )
-                    print(
+                    progress.add(
                         f"      Quality: {result.accuracy:.1f}A {result.completeness:.1f}C {result.clarity:.1f}Cl"
                     )
 
                 except Exception as e:
-                    print(f"    {judge_model}: ERROR - {e}")
+                    progress.add(f"    {judge_model}: ERROR - {e}")
+
+                progress.evaluation_done()
+
+    progress.flush()
 
     # Save results
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -230,7 +297,7 @@ def run_benchmark_suite(
     # Print summary
     print("\n=== Summary ===")
     for tool_name in tools:
-        tool_results = [r for r in all_results if r.tool_name == tool_name]
+        tool_results = results_by_tool.get(tool_name)
         if tool_results:
             avg_score = sum(r.score for r in tool_results) / len(tool_results)
             print(f"{tool_name}: {avg_score:.1f}/100 (avg across {len(tool_results)} evaluations)")
@@ -262,6 +329,17 @@ def main():
         choices=["comprehensive", "quick", "strict"],
         help="Scoring rubric to use",
     )
+    parser.add_argument(
+        "--escalation-margin",
+        type=float,
+        nargs="?",
+        const=DEFAULT_ESCALATION_MARGIN,
+        default=None,
+        help=(
+            "Suite only: judge with the quick rubric first and escalate to --rubric only "
+            f"when |score - 50| <= margin (default when given: {DEFAULT_ESCALATION_MARGIN:g})"
+        ),
+    )
     parser.add_argument(
         "--output",
         type=Path,
@@ -309,6 +387,7 @@ def main():
             args.rubric,
             args.index_path,
             args.codebase_path,
+            args.escalation_margin,
         )
         return
 
@@ -7,99 +7,322 @@ This script:
 4. Compares against ground truth files
 """
 
+import asyncio
 import json
-import subprocess
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from tests.benchmarks.datasets.repoeval_loader import (
-    load_repoeval,
-    get_ground_truth_files,
-)
-from tests.benchmarks.metrics import recall_at_k, precision_at_k, mean_reciprocal_rank
+# 'sia-code' from the same environment as the running Python
+_SIA_CODE_BIN = str(Path(sys.executable).parent / "sia-code")
 
+# Concurrent sia-code processes; each loads its own index and embedding model
+DEFAULT_CONCURRENCY = min(4, os.cpu_count() or 1)
 
-def run_sia_code_search(repo_path: Path, query: str, top_k: int = 10) -> list[str]:
-    """Run sia-code search and return file paths.
+
+def _repo_prefix(repo_path: Path) -> str:
+    """Resolved repo path with a trailing separator, for `_to_repo_relative`."""
+    return os.path.join(str(repo_path.resolve()), "")
+
+
+def _to_repo_relative(file_path: str, repo_prefix: str) -> str:
+    """Convert a path reported by sia-code to a path relative to the repo.
+
+    Pure string work: sia-code reports absolute paths under the resolved repo
+    root, so no per-result filesystem lookups are needed.
+    """
+    if file_path.startswith(repo_prefix):
+        # Make relative to repo
+        return file_path[len(repo_prefix) :]
+    # Already relative, normalize
+    return file_path.lstrip("./")
+
+
+class SiaCodeClient:
+    """Persistent `sia-code search --batch` child shared across queries.
+
+    Spawning `sia-code search` per query pays interpreter startup and index open on
+    every call; this keeps one process alive and streams JSON requests through it.
+    """
+
+    # Result lines carry full chunk code, so allow lines well past asyncio's 64 KiB default
+    STREAM_LIMIT = 16 * 1024 * 1024
+
+    def __init__(self, repo_path: Path, timeout: float = 30.0):
+        self.repo_path = repo_path
+        self.repo_prefix = _repo_prefix(repo_path)
+        self.timeout = timeout
+        self._proc: Optional[asyncio.subprocess.Process] = None
+
+    async def __aenter__(self) -> "SiaCodeClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Launch the batch-mode child process."""
+        self._proc = await asyncio.create_subprocess_exec(
+            _SIA_CODE_BIN,
+            "search",
+            "--batch",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            cwd=self.repo_path,
+            limit=self.STREAM_LIMIT,
+        )
+
+    def is_running(self) -> bool:
+        """Whether the child process is alive."""
+        return self._proc is not None and self._proc.returncode is None
+
+    async def restart(self) -> None:
+        """Kill the child (e.g. stuck on a timed-out query) and launch a fresh one."""
+        if self._proc is not None:
+            if self._proc.returncode is None:
+                self._proc.kill()
+            await self._proc.wait()
+            self._proc = None
+        await self.start()
+
+    async def close(self) -> None:
+        """Close stdin and wait for the child to exit."""
+        if self._proc is None:
+            return
+        try:
+            if self._proc.stdin:
+                self._proc.stdin.close()
+            await asyncio.wait_for(self._proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            self._proc.kill()
+            await self._proc.wait()
+        self._proc = None
+
+    async def search(self, query: str, top_k: int = 10) -> list[str]:
+        """Run one search and return file paths (relative to repo).
+
+        Raises:
+            TimeoutError: If no answer arrives within `timeout` seconds
+            RuntimeError: If the child exits or reports an error
+            OSError: If the pipe to the child breaks (e.g. BrokenPipeError)
+        """
+        if self._proc is None or self._proc.stdin is None or self._proc.stdout is None:
+            raise RuntimeError("sia-code client is not running")
+
+        self._proc.stdin.write((json.dumps({"query": query, "limit": top_k}) + "\n").encode())
+        await self._proc.stdin.drain()
+
+        while True:
+            try:
+                line = await asyncio.wait_for(self._proc.stdout.readline(), self.timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"No response within {self.timeout}s")
+            if not line:
+                raise RuntimeError("sia-code batch process exited")
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Skip non-JSON notices (e.g. backend warnings)
+            break
+
+        if "error" in response:
+            raise RuntimeError(response["error"])
+
+        return [
+            _to_repo_relative(r["chunk"]["file_path"], self.repo_prefix)
+            for r in response.get("results", [])
+        ]
+
+
+async def retrieve_all(
+    repo_path: Path, query_texts: list[str], top_k: int, concurrency: int = DEFAULT_CONCURRENCY
+) -> list[list[str]]:
+    """Run all searches across a pool of batch-mode sia-code processes.
+
+    Searches are read-only, so up to `concurrency` of them run at once, each
+    worker owning one long-lived child. Duplicate query texts are searched once.
 
     Args:
         repo_path: Path to the indexed repository
-        query: Search query
-        top_k: Number of results to return
+        query_texts: Queries to run
+        top_k: Number of results per query
+        concurrency: Number of concurrent sia-code processes
 
     Returns:
-        List of file paths (relative to repo)
+        Retrieved file paths for each query, in input order ([] on failure)
     """
-    try:
-        # Use 'sia-code' from the same environment as the running Python
-        sia_code_path = str(Path(sys.executable).parent / "sia-code")
-        result = subprocess.run(
-            [sia_code_path, "search", query, "--limit", str(top_k)],
-            capture_output=True,
-            text=True,
-            cwd=repo_path,
-            timeout=30,
+    # RepoEval repeats prompts across tasks; only search each distinct text once
+    unique_texts = list(dict.fromkeys(query_texts))
+    retrieved: list[list[str]] = [[] for _ in unique_texts]
+    pending: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(len(unique_texts)):
+        pending.put_nowait(i)
+
+    completed = 0
+    failed = 0
+
+    async def worker() -> None:
+        nonlocal completed, failed
+        async with SiaCodeClient(repo_path) as client:
+            while True:
+                try:
+                    i = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                query = unique_texts[i]
+                try:
+                    retrieved[i] = await client.search(query, top_k=top_k)
+                except TimeoutError:
+                    # Checked before OSError, of which TimeoutError is a subclass
+                    print(f"WARNING: Search timed out for query: {query[:50]}...", file=sys.stderr)
+                    failed += 1
+                    await client.restart()
+                except RuntimeError as e:
+                    print(f"ERROR: Search failed: {e}", file=sys.stderr)
+                    failed += 1
+                    if not client.is_running():
+                        await client.restart()
+                except OSError as e:
+                    # Broken pipe or reset connection: the child is gone or unusable
+                    print(f"ERROR: Lost sia-code process: {e!r}", file=sys.stderr)
+                    failed += 1
+                    await client.restart()
+
+                completed += 1
+                if completed % 10 == 0:
+                    print(f"Processed query {completed}/{len(unique_texts)}...")
+
+    workers = max(1, min(concurrency, len(unique_texts)))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    if failed:
+        print(f"WARNING: {failed}/{len(unique_texts)} queries failed", file=sys.stderr)
+
+    by_text = dict(zip(unique_texts, retrieved))
+    return [list(by_text[text]) for text in query_texts]
+
+
+class InProcessSearcher:
+    """Search an index directly through sia-code's Python API.
+
+    Opens the backend once and reuses it for every query, skipping process
+    startup, index open and JSON round-trips entirely. Mirrors the defaults of
+    `sia-code search` (hybrid mode, stale-chunk filtering).
+    """
+
+    def __init__(self, repo_path: Path):
+        from sia_code.config import Config
+        from sia_code.indexer.chunk_index import ChunkIndex
+        from sia_code.storage.factory import create_backend
+
+        self.repo_path = repo_path
+        self.repo_prefix = _repo_prefix(repo_path)
+        sia_dir = repo_path / ".sia-code"
+        self.config = Config.load(sia_dir / "config.json")
+
+        valid_chunks = None
+        chunk_index_path = sia_dir / "chunk_index.db"
+        if ChunkIndex.exists(chunk_index_path):
+            valid_chunks = ChunkIndex(chunk_index_path).get_valid_chunks()
+
+        self.backend = create_backend(
+            path=sia_dir,
+            backend_type=self.config.storage.backend,
+            embedding_enabled=self.config.embedding.enabled,
+            embedding_model=self.config.embedding.model,
+            ndim=self.config.embedding.dimensions,
+            embedding_backend=self.config.embedding.backend,
+            embedding_model_file=self.config.embedding.model_file,
+            embedding_truncate=self.config.embedding.truncate_dimensions,
+            valid_chunks=valid_chunks,
         )
+        self.backend.open_index()
+
+    def search(self, query: str, top_k: int = 10) -> list[str]:
+        """Run one hybrid search and return file paths (relative to repo)."""
+        results = self.backend.search_hybrid(
+            query,
+            k=top_k,
+            vector_weight=self.config.search.vector_weight,
+            tier_boost=self.config.search.tier_boost,
+        )
+        return [_to_repo_relative(str(r.chunk.file_path), self.repo_prefix) for r in results]
+
+    def search_all(self, query_texts: list[str], top_k: int) -> list[list[str]]:
+        """Run every distinct query once and return results in input order."""
+        by_text: dict[str, list[str]] = {}
+        for text in dict.fromkeys(query_texts):
+            try:
+                by_text[text] = self.search(text, top_k=top_k)
+            except Exception as e:
+                print(f"ERROR: Search failed: {e}", file=sys.stderr)
+                by_text[text] = []
+            if len(by_text) % 10 == 0:
+                print(f"Processed query {len(by_text)}...")
+        return [list(by_text[text]) for text in query_texts]
+
+    def close(self) -> None:
+        """Close the backend."""
+        self.backend.close()
+
+
+def _search_chunk(repo_path: Path, query_texts: list[str], top_k: int) -> list[list[str]]:
+    """Worker entry point: search one batch of queries with a private backend."""
+    searcher = InProcessSearcher(repo_path)
+    try:
+        return searcher.search_all(query_texts, top_k)
+    finally:
+        searcher.close()
 
-        if result.returncode != 0:
-            print(f"ERROR: sia-code search failed: {result.stderr}", file=sys.stderr)
-            return []
-
-        # Parse output to extract file paths
-        # Handle line wrapping: paths may be split across multiple lines
-        files = []
-        lines = result.stdout.strip().split("\n")
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Look for lines starting with "/" (absolute paths)
-            if line.startswith("/"):
-                # Check if next line completes the path (filename with ":")
-                full_path = line
-                if i + 1 < len(lines):
-                    next_line = lines[i + 1].strip()
-                    # If next line starts with filename char (including underscore) and has ":", it's the continuation
-                    if (
-                        next_line
-                        and (next_line[0].isalnum() or next_line[0] == "_")
-                        and ":" in next_line
-                    ):
-                        full_path = line + next_line
-                        i += 1  # Skip the next line since we consumed it
-
-                # Extract file path (before the ":")
-                if ":" in full_path:
-                    file_path = full_path.split(":")[0].strip()
-
-                    # Convert absolute path to relative path
-                    file_path = str(Path(file_path).resolve())
-                    repo_path_str = str(repo_path.resolve())
-
-                    if file_path.startswith(repo_path_str):
-                        # Make relative to repo
-                        file_path = file_path[len(repo_path_str) :].lstrip("/")
-                    else:
-                        # Already relative, normalize
-                        file_path = file_path.lstrip("./")
-
-                    files.append(file_path)
-
-            i += 1
-
-        return files
-
-    except subprocess.TimeoutExpired:
-        print(f"WARNING: Search timed out for query: {query[:50]}...", file=sys.stderr)
-        return []
-    except Exception as e:
-        print(f"ERROR: Search failed: {e}", file=sys.stderr)
-        return []
+
+def search_in_processes(
+    repo_path: Path, query_texts: list[str], top_k: int, workers: int = DEFAULT_CONCURRENCY
+) -> list[list[str]]:
+    """Run in-process searches across a pool of worker processes.
+
+    Distinct queries are split into one contiguous batch per worker; each worker
+    opens its own read-only backend, so this relies on the index allowing
+    concurrent readers (sqlite-vec does). With one worker, searches run here.
+
+    Args:
+        repo_path: Path to the indexed repository
+        query_texts: Queries to run
+        top_k: Number of results per query
+        workers: Number of worker processes
+
+    Returns:
+        Retrieved file paths for each query, in input order ([] on failure)
+    """
+    unique_texts = list(dict.fromkeys(query_texts))
+    workers = max(1, min(workers, len(unique_texts)))
+
+    if workers == 1:
+        searcher = InProcessSearcher(repo_path)
+        try:
+            return searcher.search_all(query_texts, top_k)
+        finally:
+            searcher.close()
+
+    batch_size = -(-len(unique_texts) // workers)
+    batches = [
+        unique_texts[start : start + batch_size]
+        for start in range(0, len(unique_texts), batch_size)
+    ]
+    with ProcessPoolExecutor(max_workers=len(batches)) as executor:
+        partials = executor.map(_search_chunk, repeat(repo_path), batches, repeat(top_k))
+        by_text = {
+            text: retrieved
+            for batch, results in zip(batches, partials)
+            for text, retrieved in zip(batch, results)
+        }
+    return [list(by_text[text]) for text in query_texts]
 
 
 def run_benchmark(
@@ -108,6 +331,8 @@ def run_benchmark(
     repo_name: str,
     max_queries: Optional[int] = None,
     k_values: list[int] = [1, 5, 10],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    in_process: bool = False,
 ) -> dict:
     """Run benchmark on a repository.
 
@@ -117,80 +342,81 @@ def run_benchmark(
         repo_name: Repository name to filter (e.g., "huggingface_diffusers")
         max_queries: Maximum queries to evaluate (None = all)
         k_values: K values for Recall@k and Precision@k
+        concurrency: Number of concurrent search processes
+        in_process: Search through sia-code's Python API instead of subprocesses
 
     Returns:
         Dictionary of results
     """
-    # Load queries
-    print(f"Loading queries for {repo_name}...")
-    queries = load_repoeval(dataset_path, repo_filter=repo_name, max_queries=max_queries)
-    print(f"Loaded {len(queries)} queries")
-
-    # Initialize results
-    results = {f"recall@{k}": [] for k in k_values}
-    results.update({f"precision@{k}": [] for k in k_values})
-    results["mrr"] = []
-    results["queries_processed"] = 0
-    results["queries_failed"] = 0
+    # Imported here so --help and early path checks in main() stay fast
+    import numpy as np
 
-    # Run retrieval for each query
-    for i, query in enumerate(queries):
-        if (i + 1) % 10 == 0:
-            print(f"Processing query {i + 1}/{len(queries)}...")
+    from tests.benchmarks.datasets.repoeval_loader import load_repoeval, get_ground_truth_files
+    from tests.benchmarks.metrics import recall_at_k, precision_at_k, mean_reciprocal_rank
 
-        # Get ground truth
-        ground_truth_files = get_ground_truth_files(query)
+    # Resolve once; every search reuses it to relativize result paths
+    repo_path = repo_path.resolve()
 
-        # Run search
-        retrieved_files = run_sia_code_search(repo_path, query.query_text, top_k=max(k_values))
+    # Stream queries, keeping only the retrieval text and ground truth of each
+    print(f"Loading queries for {repo_name}...")
+    query_texts = []
+    gt_sets = []
+    for query in load_repoeval(dataset_path, repo_filter=repo_name, max_queries=max_queries):
+        query_texts.append(query.query_text)
+        gt_sets.append(frozenset(get_ground_truth_files(query)))
+    num_queries = len(query_texts)
+    print(f"Loaded {num_queries} queries")
+
+    # Per-query scores, preallocated so failed queries simply keep 0.0
+    recall_keys = {k: f"recall@{k}" for k in k_values}
+    precision_keys = {k: f"precision@{k}" for k in k_values}
+    scores = {key: np.zeros(num_queries) for key in recall_keys.values()}
+    scores.update({key: np.zeros(num_queries) for key in precision_keys.values()})
+    scores["mrr"] = np.zeros(num_queries)
+    queries_processed = 0
+    queries_failed = 0
+
+    # Without ground truth every metric is 0.0 whatever is retrieved, so don't search
+    searchable = [i for i, gt_set in enumerate(gt_sets) if gt_set]
+    queries_skipped_no_gt = num_queries - len(searchable)
+    search_texts = [query_texts[i] for i in searchable]
+
+    top_k = max(k_values)
+    if in_process:
+        # Batches of queries fan out to worker processes, each with one opened index
+        searched = search_in_processes(repo_path, search_texts, top_k, concurrency)
+    else:
+        # Run retrieval concurrently through long-lived sia-code processes
+        searched = asyncio.run(retrieve_all(repo_path, search_texts, top_k, concurrency))
 
+    # Score each searched query; metric functions take their own top-k prefix of the ranking
+    for i, retrieved_files in zip(searchable, searched):
+        gt_set = gt_sets[i]
         if not retrieved_files:
-            results["queries_failed"] += 1
-            # Add 0 scores for this query
-            for k in k_values:
-                results[f"recall@{k}"].append(0.0)
-                results[f"precision@{k}"].append(0.0)
-            results["mrr"].append(0.0)
+            queries_failed += 1
             continue
 
-        results["queries_processed"] += 1
+        queries_processed += 1
 
         # Compute metrics for each k
         for k in k_values:
-            recall = recall_at_k(retrieved_files[:k], set(ground_truth_files), k)
-            precision = precision_at_k(retrieved_files[:k], set(ground_truth_files), k)
-            results[f"recall@{k}"].append(recall)
-            results[f"precision@{k}"].append(precision)
+            scores[recall_keys[k]][i] = recall_at_k(retrieved_files, gt_set, k)
+            scores[precision_keys[k]][i] = precision_at_k(retrieved_files, gt_set, k)
 
         # Compute MRR
-        mrr = mean_reciprocal_rank(retrieved_files, set(ground_truth_files))
-        results["mrr"].append(mrr)
+        scores["mrr"][i] = mean_reciprocal_rank(retrieved_files, gt_set)
 
-    # Aggregate results
+    # Aggregate results (failed and skipped queries count as 0.0)
     aggregated = {
         "repo_name": repo_name,
-        "total_queries": len(queries),
-        "queries_processed": results["queries_processed"],
-        "queries_failed": results["queries_failed"],
+        "total_queries": num_queries,
+        "queries_processed": queries_processed,
+        "queries_failed": queries_failed,
+        "queries_skipped_no_gt": queries_skipped_no_gt,
     }
 
-    for k in k_values:
-        recall_scores = [
-            r for r in results[f"recall@{k}"] if r > 0 or results["queries_processed"] > 0
-        ]
-        precision_scores = [
-            p for p in results[f"precision@{k}"] if p > 0 or results["queries_processed"] > 0
-        ]
-
-        aggregated[f"recall@{k}"] = (
-            sum(recall_scores) / len(recall_scores) if recall_scores else 0.0
-        )
-        aggregated[f"precision@{k}"] = (
-            sum(precision_scores) / len(precision_scores) if precision_scores else 0.0
-        )
-
-    mrr_scores = [m for m in results["mrr"] if m > 0 or results["queries_processed"] > 0]
-    aggregated["mrr"] = sum(mrr_scores) / len(mrr_scores) if mrr_scores else 0.0
+    for key, values in scores.items():
+        aggregated[key] = float(values.mean()) if num_queries else 0.0
 
     return aggregated
 
@@ -203,6 +429,17 @@ def main():
     parser.add_argument("--repo", default="huggingface_diffusers", help="Repository name")
     parser.add_argument("--output", type=Path, help="Output JSON file path")
     parser.add_argument("--sample-size", type=int, default=50, help="Number of queries to test")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Number of concurrent search processes (sia-code children or in-process workers)",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Search via sia-code's Python API instead of the installed CLI",
+    )
     args = parser.parse_args()
 
     # Configuration
@@ -238,6 +475,8 @@ def main():
         repo_name=repo_name,
         max_queries=args.sample_size,
         k_values=[1, 5, 10],
+        concurrency=args.concurrency,
+        in_process=args.in_process,
     )
 
     # Print results
@@ -246,6 +485,7 @@ def main():
     print(f"Total queries: {results['total_queries']}")
     print(f"Queries processed: {results['queries_processed']}")
     print(f"Queries failed: {results['queries_failed']}")
+    print(f"Queries skipped (no ground truth): {results['queries_skipped_no_gt']}")
     print()
     print(f"Recall@1:  {results['recall@1']:.1%}")
     print(f"Recall@5:  {results['recall@5']:.1%}")
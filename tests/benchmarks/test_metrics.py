@@ -17,64 +17,49 @@ from tests.benchmarks.metrics import (
 class TestMetrics:
     """Test suite for retrieval metrics."""
 
-    def test_recall_at_k_perfect(self):
-        """Test recall with perfect retrieval."""
-        retrieved = ["doc1", "doc2", "doc3"]
-        relevant = {"doc1", "doc2", "doc3"}
-
-        assert recall_at_k(retrieved, relevant, k=3) == 1.0
-        assert recall_at_k(retrieved, relevant, k=5) == 1.0
-
-    def test_recall_at_k_partial(self):
-        """Test recall with partial retrieval."""
-        retrieved = ["doc1", "doc2", "doc4"]
-        relevant = {"doc1", "doc2", "doc3"}
-
-        # Found 2 out of 3 relevant
-        assert recall_at_k(retrieved, relevant, k=3) == 2 / 3
-
-    def test_recall_at_k_none(self):
-        """Test recall with no relevant docs retrieved."""
-        retrieved = ["doc4", "doc5"]
-        relevant = {"doc1", "doc2", "doc3"}
-
-        assert recall_at_k(retrieved, relevant, k=2) == 0.0
-
-    def test_precision_at_k_perfect(self):
-        """Test precision with all relevant."""
-        retrieved = ["doc1", "doc2", "doc3"]
-        relevant = {"doc1", "doc2", "doc3"}
-
-        assert precision_at_k(retrieved, relevant, k=3) == 1.0
-
-    def test_precision_at_k_partial(self):
-        """Test precision with some irrelevant."""
-        retrieved = ["doc1", "doc4", "doc2"]
-        relevant = {"doc1", "doc2", "doc3"}
-
-        # 2 relevant out of 3 retrieved
-        assert precision_at_k(retrieved, relevant, k=3) == 2 / 3
-
-    def test_mrr_first_position(self):
-        """Test MRR when first result is relevant."""
-        retrieved = ["doc1", "doc4", "doc5"]
-        relevant = {"doc1", "doc2"}
-
-        assert mean_reciprocal_rank(retrieved, relevant) == 1.0
-
-    def test_mrr_second_position(self):
-        """Test MRR when second result is relevant."""
-        retrieved = ["doc4", "doc1", "doc5"]
-        relevant = {"doc1", "doc2"}
-
-        assert mean_reciprocal_rank(retrieved, relevant) == 0.5
-
-    def test_mrr_no_relevant(self):
-        """Test MRR when no relevant docs retrieved."""
-        retrieved = ["doc4", "doc5", "doc6"]
-        relevant = {"doc1", "doc2"}
-
-        assert mean_reciprocal_rank(retrieved, relevant) == 0.0
+    @pytest.mark.parametrize(
+        "retrieved,relevant,k,expected",
+        [
+            pytest.param(["doc1", "doc2", "doc3"], {"doc1", "doc2", "doc3"}, 3, 1.0, id="perfect"),
+            pytest.param(
+                ["doc1", "doc2", "doc3"], {"doc1", "doc2", "doc3"}, 5, 1.0, id="k-past-end"
+            ),
+            # Found 2 out of 3 relevant
+            pytest.param(
+                ["doc1", "doc2", "doc4"], {"doc1", "doc2", "doc3"}, 3, 2 / 3, id="partial"
+            ),
+            pytest.param(["doc4", "doc5"], {"doc1", "doc2", "doc3"}, 2, 0.0, id="none"),
+        ],
+    )
+    def test_recall_at_k(self, retrieved, relevant, k, expected):
+        """Test recall across perfect, partial and empty retrieval."""
+        assert recall_at_k(retrieved, relevant, k=k) == pytest.approx(expected, rel=1e-9)
+
+    @pytest.mark.parametrize(
+        "retrieved,relevant,k,expected",
+        [
+            pytest.param(["doc1", "doc2", "doc3"], {"doc1", "doc2", "doc3"}, 3, 1.0, id="perfect"),
+            # 2 relevant out of 3 retrieved
+            pytest.param(
+                ["doc1", "doc4", "doc2"], {"doc1", "doc2", "doc3"}, 3, 2 / 3, id="partial"
+            ),
+        ],
+    )
+    def test_precision_at_k(self, retrieved, relevant, k, expected):
+        """Test precision with all and some relevant results."""
+        assert precision_at_k(retrieved, relevant, k=k) == pytest.approx(expected, rel=1e-9)
+
+    @pytest.mark.parametrize(
+        "retrieved,relevant,expected",
+        [
+            pytest.param(["doc1", "doc4", "doc5"], {"doc1", "doc2"}, 1.0, id="first-position"),
+            pytest.param(["doc4", "doc1", "doc5"], {"doc1", "doc2"}, 0.5, id="second-position"),
+            pytest.param(["doc4", "doc5", "doc6"], {"doc1", "doc2"}, 0.0, id="no-relevant"),
+        ],
+    )
+    def test_mrr(self, retrieved, relevant, expected):
+        """Test MRR by rank of the first relevant result."""
+        assert mean_reciprocal_rank(retrieved, relevant) == pytest.approx(expected, rel=1e-9)
 
     def test_hit_at_k_true(self):
         """Test Hit@k when relevant doc in top-k."""
@@ -99,7 +84,7 @@ class TestMetrics:
 
         # Perfect ranking: relevant docs first
         ndcg = ndcg_at_k(retrieved, relevant, k=3)
-        assert ndcg == 1.0
+        assert ndcg == pytest.approx(1.0, rel=1e-9)
 
     def test_ndcg_imperfect_ranking(self):
         """Test nDCG with imperfect ranking."""
@@ -127,9 +112,9 @@ class TestMetrics:
         assert "hit@1" in metrics
 
         # Verify values
-        assert metrics["mrr"] == 1.0  # doc1 is first
-        assert metrics["recall@3"] == 2 / 3  # found 2 of 3
-        assert metrics["precision@3"] == 2 / 3  # 2 relevant in top 3
+        assert metrics["mrr"] == pytest.approx(1.0, rel=1e-9)  # doc1 is first
+        assert metrics["recall@3"] == pytest.approx(2 / 3, rel=1e-9)  # found 2 of 3
+        assert metrics["precision@3"] == pytest.approx(2 / 3, rel=1e-9)  # 2 relevant in top 3
         assert metrics["hit@1"] == 1.0  # doc1 in top 1
 
 
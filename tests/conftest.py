@@ -0,0 +1,8 @@
+"""Settings shared by every test suite."""
+
+import os
+
+# Test indexes are throwaway (tmp_path or rebuildable fixture caches), so skip
+# SQLite fsyncs; spawned sia-code processes inherit this. Set
+# SIA_CODE_SQLITE_FAST=0 to test with default durability.
+os.environ.setdefault("SIA_CODE_SQLITE_FAST", "1")
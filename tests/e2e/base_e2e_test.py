@@ -1,10 +1,183 @@
 """Base test class for E2E tests with common utilities."""
 
+import functools
 import json
+import os
+import queue
 import subprocess
+import tempfile
+import threading
 import time
+import traceback
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+
+import pytest
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses the large semantic payloads several times faster; both accept str or bytes
+json_loads = orjson.loads if orjson is not None else json.loads
+json_dumps = orjson.dumps if orjson is not None else json.dumps
+
+# Commands that rewrite the index; persistent search children must be restarted after them
+INDEX_MUTATING_COMMANDS = {"init", "index", "compact"}
+
+# Run CLI commands through click's CliRunner in this process instead of spawning
+# `sia-code`, skipping interpreter startup and imports on every call.
+# E2E_IN_PROCESS=0 spawns a real process per command (and enforces timeouts).
+E2E_IN_PROCESS = os.environ.get("E2E_IN_PROCESS", "1") == "1"
+
+# Commands that always run as a real process: init covers the installed entry point,
+# and interactive (like any --watch run) blocks until killed, which needs a timeout
+SUBPROCESS_COMMANDS = {"init", "interactive"}
+
+# In-process runs swap the working directory and sys.stdout, which are process-wide
+_IN_PROCESS_LOCK = threading.Lock()
+
+# Seconds a persistent search child may take to answer one query (the first one
+# includes opening the index and loading the embedding model)
+RUNNER_SEARCH_TIMEOUT = 120
+
+
+def _run_cli_in_process(args: list[str], cwd: Path) -> subprocess.CompletedProcess:
+    """Invoke the sia-code click app in-process and shape the result like subprocess.run."""
+    from click.testing import CliRunner
+
+    from sia_code.cli import main
+
+    try:
+        runner = CliRunner(mix_stderr=False)
+    except TypeError:
+        runner = CliRunner()  # click >= 8.2 always captures stderr separately
+
+    with _IN_PROCESS_LOCK:
+        previous_cwd = os.getcwd()
+        os.chdir(cwd)
+        try:
+            result = runner.invoke(main, args)
+        finally:
+            os.chdir(previous_cwd)
+
+    stderr = result.stderr
+    if result.exception is not None and not isinstance(result.exception, SystemExit):
+        # A subprocess would have printed the traceback; keep it for assertion messages
+        stderr += "".join(traceback.format_exception(*result.exc_info))
+
+    return subprocess.CompletedProcess(
+        ["sia-code"] + args, result.exit_code, stdout=result.stdout, stderr=stderr
+    )
+
+
+def _index_version(index_dir: Path) -> int:
+    """Modification time of an index; changes whenever it is rewritten."""
+    try:
+        return (Path(index_dir) / "index.db").stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+@dataclass(slots=True)
+class SearchResults:
+    """One parsed search response, with its hit list pulled out once."""
+
+    results: list[dict[str, Any]]
+    raw: dict[str, Any]
+
+    @classmethod
+    def from_json(cls, text: str | bytes) -> "SearchResults":
+        """Parse a serialized search response."""
+        raw = json_loads(text)
+        return cls(raw.get("results", []), raw)
+
+    @classmethod
+    def empty(cls, query: str, regex: bool) -> "SearchResults":
+        """Stand-in for a search that failed or returned nothing."""
+        raw = {"query": query, "mode": "lexical" if regex else "semantic", "results": []}
+        return cls(raw["results"], raw)
+
+
+class SiaCodeRunner:
+    """Persistent `sia-code search --batch` child for one repository and search mode.
+
+    Keeps the interpreter and opened index alive across searches instead of
+    spawning `sia-code search` for every assertion. A reader thread moves the
+    child's stdout lines onto a queue, so every read can wait with a deadline.
+    """
+
+    def __init__(self, cwd: Path, regex: bool = True, index_dir: Optional[Path] = None):
+        cmd = ["sia-code", "search", "--batch", "--no-filter"]
+        if regex:
+            cmd.append("--regex")
+        env = None
+        if index_dir is not None:
+            env = {**os.environ, "SIA_CODE_INDEX_DIR": str(index_dir)}
+        self.proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self._lines: queue.Queue[Optional[str]] = queue.Queue()
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+
+    def _read_stdout(self) -> None:
+        """Queue each stdout line of the child, then None once it closes stdout."""
+        for line in self.proc.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def search(
+        self, query: str, limit: int = 10, timeout: float = RUNNER_SEARCH_TIMEOUT
+    ) -> Optional[dict[str, Any]]:
+        """Run one search; returns None if the child is gone or reports an error.
+
+        Kills the child and fails the test if no response arrives within
+        `timeout` seconds.
+        """
+        if self.proc.poll() is not None:
+            return None
+        try:
+            self.proc.stdin.write(json.dumps({"query": query, "limit": limit}) + "\n")
+            self.proc.stdin.flush()
+        except BrokenPipeError:
+            return None
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.proc.kill()
+                self.proc.wait()
+                pytest.fail(f"sia-code search --batch gave no response to {query!r} in {timeout}s")
+            if line is None:
+                return None  # Child exited
+            try:
+                response = json_loads(line)
+            except json.JSONDecodeError:
+                continue  # Skip non-JSON notices
+            return None if "error" in response else response
+
+    def close(self) -> None:
+        """Close stdin (ends the batch loop) and wait; kill if it does not exit."""
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
 
 
 class BaseE2ETest:
@@ -20,29 +193,81 @@ class BaseE2ETest:
     EXPECTED_KEYWORD: str = ""
     EXPECTED_SYMBOL: str = ""
 
+    # Persistent search children for this test class, keyed by (index dir, regex)
+    _runners: dict[tuple[Path, bool], SiaCodeRunner] = {}
+
+    # Serialized responses shared by every test class in the session, keyed by
+    # (index dir, index version, regex, limit, query)
+    _search_cache: dict[tuple[str, int, bool, int, str], str | bytes] = {}
+
+    # CLI invocation pieces that are identical for every run_cli call
+    _CLI_PREFIX = ("sia-code",)
+    _run = staticmethod(functools.partial(subprocess.run, stderr=subprocess.PIPE, text=True))
+
+    @classmethod
+    def setup_class(cls):
+        cls._runners = {}
+
+    @classmethod
+    def teardown_class(cls):
+        cls._close_runners()
+
+    @classmethod
+    def _close_runners(cls) -> None:
+        for runner in cls._runners.values():
+            runner.close()
+        cls._runners = {}
+
+    def _get_runner(self, cwd: Path, regex: bool) -> SiaCodeRunner:
+        # A child opens its index once, so children are per index directory
+        key = (self.index_dir(Path(cwd)), regex)
+        runner = self._runners.get(key)
+        if runner is None or runner.proc.poll() is not None:
+            # Also replaces a child killed after a search timed out
+            runner = self._runners[key] = SiaCodeRunner(cwd, regex=regex)
+        return runner
+
     def run_cli(
-        self, args: list[str], cwd: Path, timeout: int = 300
+        self, args: list[str], cwd: Path, timeout: int = 300, capture_stdout: bool = True
     ) -> subprocess.CompletedProcess:
         """Run sia-code CLI command.
 
+        By default the command runs in this process through click's CliRunner
+        (calls are serialized and `timeout` is not enforced); `init`,
+        `interactive`, `--watch` runs and every command under E2E_IN_PROCESS=0
+        spawn the `sia-code` executable.
+
         Args:
             args: CLI arguments (e.g., ["search", "query"])
             cwd: Working directory
             timeout: Command timeout in seconds (default: 5 min)
+            capture_stdout: Set False when only the return code matters; stdout
+                goes to /dev/null instead of being read through a pipe
 
         Returns:
-            CompletedProcess with stdout, stderr, returncode
+            CompletedProcess with stdout ("" if not captured), stderr, returncode
         """
-        cmd = ["sia-code"] + args
+        if args and args[0] in INDEX_MUTATING_COMMANDS:
+            # Persistent search children would keep serving the old index
+            self._close_runners()
+
+        cmd = [*self._CLI_PREFIX, *args]
         start = time.perf_counter()
         print(f"E2E timing start: {cmd} cwd={cwd}")
-        result = subprocess.run(
-            cmd,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
+        in_process = not (args and args[0] in SUBPROCESS_COMMANDS) and "--watch" not in args
+        if E2E_IN_PROCESS and in_process:
+            result = _run_cli_in_process(args, cwd)
+            if not capture_stdout:
+                result.stdout = ""
+        else:
+            result = self._run(
+                cmd,
+                cwd=cwd,
+                stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+                timeout=timeout,
+            )
+            if result.stdout is None:
+                result.stdout = ""
         elapsed = time.perf_counter() - start
         print(
             "E2E timing end: "
@@ -51,59 +276,114 @@ class BaseE2ETest:
         )
         return result
 
+    @staticmethod
+    def index_dir(repo: Path) -> Path:
+        """Index directory sia-code uses for repo (honors SIA_CODE_INDEX_DIR)."""
+        override = os.environ.get("SIA_CODE_INDEX_DIR")
+        return Path(override) if override else repo / ".sia-code"
+
     def search_json(
-        self, query: str, cwd: Path, regex: bool = True, limit: int = 10
-    ) -> dict[str, Any]:
-        """Run search command and parse JSON output.
+        self, query: str, cwd: Path, regex: bool = True, limit: int = 10, cached: bool = True
+    ) -> SearchResults:
+        """Run a search through the class's persistent sia-code child.
+
+        Successful responses are memoized for the session until the index file
+        changes; each call parses a fresh copy.
 
         Args:
             query: Search query
             cwd: Working directory
             regex: Use regex/lexical search (default: True)
             limit: Maximum results (default: 10)
+            cached: Reuse an earlier identical search (default: True)
 
         Returns:
-            Parsed JSON dict with "query", "mode", "results" keys
+            SearchResults with the hit list and the full response
         """
-        args = ["search", query, "--format", "json", "-k", str(limit), "--no-filter"]
-        if regex:
-            args.append("--regex")
+        index_dir = self.index_dir(Path(cwd))
+        key = (str(index_dir.resolve()), _index_version(index_dir), regex, limit, query)
+        if cached and key in self._search_cache:
+            return SearchResults.from_json(self._search_cache[key])
 
-        result = self.run_cli(args, cwd)
+        runner = self._get_runner(cwd, regex)
+        response = runner.search(query, limit)
 
-        if result.returncode != 0:
-            return {"query": query, "mode": "lexical" if regex else "semantic", "results": []}
+        if response is None:
+            # Child died or errored; start a fresh one for the next search
+            runner.close()
+            self._runners.pop((index_dir, regex), None)
+            return SearchResults.empty(query, regex)
 
-        # Handle "No results found" message
-        if "no results" in result.stdout.lower():
-            return {"query": query, "mode": "lexical" if regex else "semantic", "results": []}
+        self._search_cache[key] = json_dumps(response)
+        return SearchResults(response.get("results", []), response)
 
-        try:
-            return json.loads(result.stdout)
-        except json.JSONDecodeError:
-            return {"query": query, "mode": "lexical" if regex else "semantic", "results": []}
+    def search_json_many(
+        self, queries: list[str], cwd: Path, regex: bool = True, limit: int = 10
+    ) -> list[SearchResults]:
+        """Run several searches with one `sia-code search --queries-file` call.
 
-    def get_result_symbols(self, results: dict[str, Any]) -> list[str]:
+        The CLI embeds all queries in a single batch. Responses share the
+        session cache with search_json.
+
+        Args:
+            queries: Search queries
+            cwd: Working directory
+            regex: Use regex/lexical search (default: True)
+            limit: Maximum results per query (default: 10)
+
+        Returns:
+            SearchResults in query order
+        """
+        index_dir = self.index_dir(Path(cwd))
+        repo = str(index_dir.resolve())
+        version = _index_version(index_dir)
+        missing = [q for q in queries if (repo, version, regex, limit, q) not in self._search_cache]
+
+        if missing:
+            with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+                json.dump([{"query": q, "limit": limit} for q in missing], f)
+            args = ["search", "--queries-file", f.name, "--no-filter"]
+            if regex:
+                args.append("--regex")
+            try:
+                result = self.run_cli(args, cwd)
+            finally:
+                os.unlink(f.name)
+            if result.returncode == 0:
+                for response in json_loads(result.stdout):
+                    if "error" not in response:
+                        key = (repo, version, regex, limit, response["query"])
+                        self._search_cache[key] = json_dumps(response)
+
+        responses = []
+        for query in queries:
+            cached = self._search_cache.get((repo, version, regex, limit, query))
+            responses.append(
+                SearchResults.from_json(cached) if cached else SearchResults.empty(query, regex)
+            )
+        return responses
+
+    def get_result_symbols(self, results: SearchResults) -> list[str]:
         """Extract symbol names from search results.
 
         Args:
-            results: Parsed JSON search results
+            results: Search results from search_json
 
         Returns:
             List of symbol names
         """
-        return [r["chunk"]["symbol"] for r in results.get("results", [])]
+        return [r["chunk"]["symbol"] for r in results.results]
 
-    def get_result_file_paths(self, results: dict[str, Any]) -> list[str]:
+    def get_result_file_paths(self, results: SearchResults) -> list[str]:
         """Extract file paths from search results.
 
         Args:
-            results: Parsed JSON search results
+            results: Search results from search_json
 
         Returns:
             List of file paths
         """
-        return [r["chunk"]["file_path"] for r in results.get("results", [])]
+        return [r["chunk"]["file_path"] for r in results.results]
 
     def assert_contains_language_extension(self, file_paths: list[str], extensions: list[str]):
         """Assert that at least one file has a language-specific extension.
@@ -117,6 +397,74 @@ class BaseE2ETest:
         )
 
 
+def _is_valid_config(path: Path) -> bool:
+    """Whether path holds a JSON config with the main sections."""
+    config = json_loads(path.read_bytes())
+    return {"embedding", "indexing", "chunking"} <= config.keys()
+
+
+class InitTestsMixin:
+    """Initialization checks shared by the language suites.
+
+    Every check reads the session's initialized_repo, so `sia-code init` runs
+    once per session instead of once per test.
+    """
+
+    @pytest.mark.parametrize(
+        "artifact,validator",
+        [
+            ("", Path.is_dir),
+            ("config.json", _is_valid_config),
+            ("index.db", Path.is_file),
+        ],
+        ids=["directory", "config", "index"],
+    )
+    def test_init_creates(self, initialized_repo, artifact, validator):
+        """Test that 'sia-code init' creates .sia-code with a valid config and index file."""
+        path = initialized_repo / ".sia-code" / artifact
+        assert path.exists(), f"{path} not created"
+        assert validator(path), f"{path} is not valid"
+
+
+class SearchTestsMixin:
+    """`sia-code search` CLI checks shared by the language suites.
+
+    All cases run lexical searches against the session's embedding-free index;
+    assertions on the results themselves go through `indexed_backend`.
+    """
+
+    @pytest.mark.parametrize("query_source", ["keyword", "symbol"])
+    def test_search_finds(self, lexical_indexed_repo, e2e_symbol, query_source):
+        """Test that searching for the language keyword or a known symbol succeeds."""
+        if query_source == "keyword":
+            query = self.EXPECTED_KEYWORD
+        else:
+            query = e2e_symbol or self.EXPECTED_SYMBOL
+        result = self.run_cli(
+            ["search", query, "--regex", "-k", "5", "--no-filter"], lexical_indexed_repo
+        )
+        assert result.returncode == 0
+
+    @pytest.mark.parametrize("output_format", ["json", "ndjson", "table", "csv"])
+    def test_search_output_format(self, lexical_indexed_repo, output_format):
+        """Test that each --format renders search output."""
+        result = self.run_cli(
+            [
+                "search",
+                self.EXPECTED_KEYWORD,
+                "--regex",
+                "--format",
+                output_format,
+                "-k",
+                "3",
+                "--no-filter",
+            ],
+            lexical_indexed_repo,
+        )
+        assert result.returncode == 0
+        assert len(result.stdout) > 0
+
+
 class PythonE2ETest(BaseE2ETest):
     """Python-specific E2E test base."""
 
@@ -1,12 +1,67 @@
 """Shared fixtures for E2E tests across multiple language repositories."""
 
+import hashlib
 import json
 import os
 import shutil
 import subprocess
+import sys
+import threading
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
+from filelock import FileLock
+
+# Persistent clone cache shared across test sessions (override with E2E_CACHE_DIR)
+E2E_CACHE_DIR = Path(os.environ.get("E2E_CACHE_DIR", Path.home() / ".cache" / "sia-code-e2e"))
+
+# Directories queued for background deletion (same filesystem as the cache)
+E2E_TRASH_DIR = E2E_CACHE_DIR / ".trash"
+
+# Smaller/faster embedding model for CI to avoid CPU timeout
+# bge-small is ~3x faster than bge-base on CPU, still tests full embedding pipeline.
+# E2E_EMBEDDING_MODEL / E2E_EMBEDDING_DIMENSIONS pin another (e.g. even smaller) model.
+CI_EMBEDDING_MODEL = os.environ.get("E2E_EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+CI_EMBEDDING_DIMENSIONS = int(os.environ.get("E2E_EMBEDDING_DIMENSIONS", "384"))
+
+# E2E_FAST=1 stores embeddings truncated to E2E_FAST_DIM (default 128) dimensions,
+# shrinking the index and vector inserts at some cost in retrieval quality
+E2E_FAST = os.environ.get("E2E_FAST") == "1"
+if E2E_FAST:
+    CI_EMBEDDING_DIMENSIONS = int(os.environ.get("E2E_FAST_DIM", "128"))
+
+# Parse worker processes for the fixture index run (`--parallel --workers`); half
+# the cores by default, leaving the rest to the embedding threads
+E2E_INDEX_WORKERS = int(os.environ.get("E2E_INDEX_WORKERS", (os.cpu_count() or 2) // 2 or 1))
+
+# Embedding config overrides per backend. "onnx-int8" runs an INT8-quantized ONNX
+# export of bge-small through ONNX Runtime (skipped when onnxruntime is missing).
+EMBEDDING_BACKENDS = {
+    "torch": {},
+    "onnx-int8": {
+        "backend": "onnx",
+        "model": "Xenova/bge-small-en-v1.5",
+        "model_file": "onnx/model_quantized.onnx",
+    },
+}
+
+# Backends the suite runs against, comma-separated (e.g. "torch,onnx-int8")
+E2E_EMBEDDING_BACKENDS = os.environ.get("E2E_EMBEDDING_BACKENDS", "torch").split(",")
+
+# Tests marked `slow` rewrite the whole index. They run when E2E_FULL_INDEX_TESTS=1
+# or when the branch changes indexing code relative to E2E_DIFF_BASE; if git
+# cannot tell, they run.
+E2E_FULL_INDEX_TESTS = os.environ.get("E2E_FULL_INDEX_TESTS") == "1"
+E2E_DIFF_BASE = os.environ.get("E2E_DIFF_BASE", "origin/main")
+INDEXER_PATHS = ("sia_code/indexer/", "sia_code/parser/", "sia_code/storage/")
+SIA_CODE_ROOT = Path(__file__).resolve().parents[2]
+
+# E2E_INDEX_CACHE=1 keeps built fixture indexes under E2E_CACHE_DIR/indexes, keyed by
+# target commit, index config and indexing code, and restores them instead of reindexing
+E2E_INDEX_CACHE = os.environ.get("E2E_INDEX_CACHE") == "1"
+E2E_INDEX_CACHE_DIR = E2E_CACHE_DIR / "indexes"
 
 
 @pytest.fixture(scope="session")
@@ -39,132 +94,498 @@ def e2e_symbol():
     return os.environ.get("E2E_SYMBOL", "main")
 
 
+def _clone_repo(repo_url: str, sparse_paths: str, repo_dir: Path) -> None:
+    """Clone a repository, sparsely when paths are given, shallowly otherwise."""
+    if sparse_paths:
+        # Sparse checkout for large repos
+        subprocess.run(
+            [
+                "git",
+                "clone",
+                "--filter=blob:none",
+                "--sparse",
+                repo_url,
+                str(repo_dir),
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+        # Set sparse checkout paths
+        subprocess.run(
+            ["git", "sparse-checkout", "set"] + sparse_paths.split(),
+            cwd=repo_dir,
+            check=True,
+            capture_output=True,
+        )
+    else:
+        # Full shallow clone
+        subprocess.run(
+            ["git", "clone", "--depth", "1", repo_url, str(repo_dir)],
+            check=True,
+            capture_output=True,
+        )
+
+
+def _write_ci_config(init_config: Path, index_dir: Path, embedding_backend: str) -> None:
+    """Write index_dir/config.json: the `sia-code init` config with the CI embedding model."""
+    ci_config = json.loads(init_config.read_text())
+    ci_config["embedding"] = {
+        **ci_config["embedding"],
+        "model": CI_EMBEDDING_MODEL,
+        "dimensions": CI_EMBEDDING_DIMENSIONS,
+        "truncate_dimensions": E2E_FAST,
+        "backend": "torch",
+        "model_file": "",
+        **EMBEDDING_BACKENDS[embedding_backend],
+    }
+    index_dir.mkdir(parents=True, exist_ok=True)
+    (index_dir / "config.json").write_text(json.dumps(ci_config, indent=2))
+
+
+def _delete_in_background(path: Path) -> None:
+    threading.Thread(
+        target=shutil.rmtree, args=(path,), kwargs={"ignore_errors": True}, daemon=True
+    ).start()
+
+
+def _discard_dir(path: Path) -> None:
+    """Remove a directory without waiting for the recursive unlink.
+
+    The directory is renamed into E2E_TRASH_DIR (instant) and deleted by a
+    daemon thread. Anything a thread leaves unfinished at interpreter exit is
+    swept by the next session. Falls back to a synchronous rmtree on Windows or
+    when the rename is not possible.
+    """
+    if not path.exists():
+        return
+    if os.name != "nt":
+        E2E_TRASH_DIR.mkdir(parents=True, exist_ok=True)
+        trash = E2E_TRASH_DIR / uuid.uuid4().hex
+        try:
+            os.replace(path, trash)
+        except OSError:
+            pass
+        else:
+            _delete_in_background(trash)
+            return
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _copy_index(src: Path, dst: Path) -> None:
+    """Copy an index directory, as copy-on-write clones where the filesystem allows.
+
+    On Linux `cp --reflink=auto` makes the copy near-instant on btrfs/XFS and
+    degrades to a regular copy elsewhere; other platforms use shutil.copytree.
+    """
+    if sys.platform.startswith("linux"):
+        result = subprocess.run(
+            ["cp", "-R", "--reflink=auto", str(src), str(dst)], capture_output=True
+        )
+        if result.returncode == 0:
+            return
+        _discard_dir(dst)
+    shutil.copytree(src, dst)
+
+
+def _empty_trash() -> None:
+    """Delete leftovers from earlier sessions' background deletes."""
+    if E2E_TRASH_DIR.exists():
+        for leftover in E2E_TRASH_DIR.iterdir():
+            _delete_in_background(leftover)
+
+
+def _refresh_clone(repo_dir: Path) -> None:
+    """Bring a cached clone up to date and drop leftovers from earlier sessions."""
+    fetch = subprocess.run(
+        ["git", "-C", str(repo_dir), "fetch", "--depth", "1", "origin"],
+        capture_output=True,
+    )
+    if fetch.returncode == 0:
+        subprocess.run(
+            ["git", "-C", str(repo_dir), "reset", "--hard", "FETCH_HEAD"],
+            check=True,
+            capture_output=True,
+        )
+    # Offline: keep the cached revision. Either way remove untracked and ignored
+    # files so every session starts from a clean checkout; the (large) index is
+    # moved aside first so git clean doesn't unlink it synchronously.
+    _discard_dir(repo_dir / ".sia-code")
+    subprocess.run(
+        ["git", "-C", str(repo_dir), "clean", "-ffdx"],
+        check=True,
+        capture_output=True,
+    )
+
+
+def _indexer_changed() -> bool:
+    """Whether this checkout changes indexing code relative to E2E_DIFF_BASE.
+
+    Returns True when git is unavailable or the base cannot be resolved.
+    """
+    try:
+        changed = subprocess.run(
+            ["git", "diff", "--name-only", f"{E2E_DIFF_BASE}...HEAD"],
+            cwd=SIA_CODE_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.splitlines()
+    except (OSError, subprocess.CalledProcessError):
+        return True
+    return any(path.startswith(INDEXER_PATHS) for path in changed)
+
+
+def _index_cache_key(repo: Path, index_dir: Path) -> str | None:
+    """Content address of repo's fixture index, or None if repo is not a git checkout.
+
+    Covers the checked-out commit, the repository path (the index stores absolute
+    paths), index_dir/config.json and the source of the indexing packages.
+    """
+    head = subprocess.run(
+        ["git", "-C", str(repo), "rev-parse", "HEAD"], capture_output=True, text=True
+    )
+    if head.returncode != 0:
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(head.stdout.strip().encode())
+    digest.update(str(repo.resolve()).encode())
+    digest.update((index_dir / "config.json").read_bytes())
+    for package in INDEXER_PATHS:
+        for source in sorted((SIA_CODE_ROOT / package).rglob("*.py")):
+            digest.update(source.relative_to(SIA_CODE_ROOT).as_posix().encode())
+            digest.update(source.read_bytes())
+    return digest.hexdigest()[:32]
+
+
+def _shared_dir(tmp_path_factory) -> Path:
+    """Temp directory shared by every pytest-xdist worker of this run.
+
+    Without xdist this is simply the session's base temp directory.
+    """
+    basetemp = tmp_path_factory.getbasetemp()
+    return basetemp.parent if os.environ.get("PYTEST_XDIST_WORKER") else basetemp
+
+
+@contextmanager
+def _once_per_run(tmp_path_factory, step: str):
+    """Serialize a setup step across xdist workers.
+
+    Yields True for the worker that must perform the step and False for workers
+    that arrive after it completed. A step that raises is not marked done, so
+    the next worker retries it.
+    """
+    shared = _shared_dir(tmp_path_factory)
+    done_marker = shared / f"{step}.done"
+    with FileLock(str(shared / f"{step}.lock")):
+        if done_marker.exists():
+            yield False
+            return
+        yield True
+        done_marker.touch()
+
+
 @pytest.fixture(scope="session")
 def target_repo(tmp_path_factory, e2e_repo_url, e2e_sparse_paths):
     """Clone target repository for testing.
 
     Uses sparse checkout for large repos if E2E_SPARSE_PATHS is set.
     Falls back to E2E_REPO_PATH if URL not provided.
+
+    Clones are cached under E2E_CACHE_DIR, keyed by URL and sparse paths, and
+    refreshed with a shallow fetch in later sessions instead of recloned. Under
+    pytest-xdist only the first worker refreshes; the rest share its checkout.
     """
     # Check if repo path provided directly
     repo_path_env = os.environ.get("E2E_REPO_PATH")
     if repo_path_env:
         repo_path = Path(repo_path_env).resolve()
         if repo_path.exists():
-            yield repo_path
-            return
+            return repo_path
 
     # Clone repository
     if not e2e_repo_url:
         pytest.skip("E2E_REPO_URL not provided")
 
-    tmp_dir = tmp_path_factory.mktemp("repos")
-    repo_dir = tmp_dir / "target-repo"
+    cache_key = hashlib.sha1(f"{e2e_repo_url}\n{e2e_sparse_paths}".encode()).hexdigest()[:16]
+    repo_dir = E2E_CACHE_DIR / cache_key
+    E2E_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _empty_trash()
 
-    try:
-        if e2e_sparse_paths:
-            # Sparse checkout for large repos
-            subprocess.run(
-                [
-                    "git",
-                    "clone",
-                    "--filter=blob:none",
-                    "--sparse",
-                    e2e_repo_url,
-                    str(repo_dir),
-                ],
-                check=True,
-                capture_output=True,
-            )
+    with _once_per_run(tmp_path_factory, "target_repo") as first:
+        if first:
+            with FileLock(str(repo_dir) + ".lock"):
+                if (repo_dir / ".git").exists():
+                    _refresh_clone(repo_dir)
+                else:
+                    # Drop any partial clone left by an interrupted session
+                    _discard_dir(repo_dir)
+                    try:
+                        _clone_repo(e2e_repo_url, e2e_sparse_paths, repo_dir)
+                    except Exception:
+                        _discard_dir(repo_dir)
+                        raise
 
-            # Set sparse checkout paths
-            subprocess.run(
-                ["git", "sparse-checkout", "set"] + e2e_sparse_paths.split(),
-                cwd=repo_dir,
-                check=True,
-                capture_output=True,
-            )
-        else:
-            # Full shallow clone
-            subprocess.run(
-                ["git", "clone", "--depth", "1", e2e_repo_url, str(repo_dir)],
-                check=True,
-                capture_output=True,
-            )
+    return repo_dir
 
-        yield repo_dir
-    finally:
-        # Cleanup
-        if repo_dir.exists():
-            shutil.rmtree(repo_dir, ignore_errors=True)
+
+@pytest.fixture(scope="session", params=E2E_EMBEDDING_BACKENDS)
+def embedding_backend(request):
+    """Embedding backend the index is built and searched with."""
+    if request.param == "onnx-int8":
+        pytest.importorskip("onnxruntime")
+    return request.param
 
 
 @pytest.fixture(scope="session")
-def initialized_repo(target_repo):
-    """Initialize sia-code in the target repository."""
-    result = subprocess.run(
-        ["sia-code", "init"],
-        cwd=target_repo,
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
+def initialized_repo(tmp_path_factory, target_repo):
+    """Initialize sia-code in the target repository (once across xdist workers).
 
-    if result.returncode != 0:
-        pytest.fail(f"Failed to initialize sia-code: {result.stderr}")
-
-    # Verify initialization
-    sia_dir = target_repo / ".sia-code"
-    assert sia_dir.exists(), ".sia-code directory not created"
-    assert (sia_dir / "config.json").exists(), "config.json not created"
-    assert (sia_dir / "index.db").exists(), "index.db not created"
-
-    # Use smaller/faster embedding model for CI to avoid CPU timeout
-    # bge-small is ~3x faster than bge-base on CPU, still tests full embedding pipeline
-    config_path = sia_dir / "config.json"
-    with open(config_path) as f:
-        ci_config = json.load(f)
-    ci_config["embedding"]["model"] = "BAAI/bge-small-en-v1.5"
-    ci_config["embedding"]["dimensions"] = 384
-    with open(config_path, "w") as f:
-        json.dump(ci_config, f, indent=2)
+    The resulting .sia-code keeps the default config; the embedding-backed
+    indexes are built in directories of their own (see shared_index_dir).
+    """
+    with _once_per_run(tmp_path_factory, "initialized_repo") as first:
+        if not first:
+            return target_repo
+
+        result = subprocess.run(
+            ["sia-code", "init"],
+            cwd=target_repo,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=30,
+        )
+
+        if result.returncode != 0:
+            pytest.fail(f"Failed to initialize sia-code: {result.stderr}")
+
+        # Verify initialization
+        sia_dir = target_repo / ".sia-code"
+        assert sia_dir.exists(), ".sia-code directory not created"
+        assert (sia_dir / "config.json").exists(), "config.json not created"
+        assert (sia_dir / "index.db").exists(), "index.db not created"
 
     return target_repo
 
 
 @pytest.fixture(scope="session")
-def indexed_repo(initialized_repo):
-    """Index the target repository.
+def shared_index_dir(tmp_path_factory, initialized_repo, embedding_backend):
+    """Index of the target repository for one embedding backend, built once per run.
+
+    Each backend gets its own directory, selected through SIA_CODE_INDEX_DIR
+    (see indexed_repo), with the CI embedding model (384d bge-small) in its
+    config. Under pytest-xdist a file lock ensures a single worker indexes
+    while the others wait and reuse the result, and workers testing another
+    backend never see this directory change. With E2E_INDEX_CACHE=1 a finished
+    index is kept on disk and restored by later runs with the same commit,
+    config and indexing code.
+    """
+    index_dir = _shared_dir(tmp_path_factory) / f"sia-code-{embedding_backend}"
+    with _once_per_run(tmp_path_factory, f"indexed_repo-{embedding_backend}") as first:
+        if not first:
+            return index_dir
+
+        _discard_dir(index_dir)
+        _write_ci_config(
+            initialized_repo / ".sia-code" / "config.json", index_dir, embedding_backend
+        )
+
+        cache_key = _index_cache_key(initialized_repo, index_dir) if E2E_INDEX_CACHE else None
+        cached_index = E2E_INDEX_CACHE_DIR / cache_key if cache_key else None
+        if cached_index is not None and (cached_index / "index.db").exists():
+            _discard_dir(index_dir)
+            _copy_index(cached_index, index_dir)
+            os.utime(cached_index)  # Marks the entry as used for CI cache pruning
+            return index_dir
+
+        # Predictable CPU throughput: small embedding batches, and half the cores
+        # each for OpenMP (torch/ONNX) and the tokenizer's rayon pool, which
+        # TOKENIZERS_PARALLELISM keeps enabled; sizing both avoids oversubscription.
+        # Values already set in the environment win.
+        threads = str((os.cpu_count() or 2) // 2 or 1)
+        env = {
+            "SIA_CODE_EMBED_BATCH_SIZE": "8",
+            "OMP_NUM_THREADS": threads,
+            "RAYON_NUM_THREADS": threads,
+            "TOKENIZERS_PARALLELISM": "true",
+            **os.environ,
+            "SIA_CODE_INDEX_DIR": str(index_dir),
+        }
+        cmd = ["sia-code", "index", "--clean"]
+        if E2E_INDEX_WORKERS > 1:
+            cmd += ["--parallel", "--workers", str(E2E_INDEX_WORKERS)]
+        result = subprocess.run(
+            cmd + ["."],
+            cwd=initialized_repo,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=600,  # 10 minute timeout for large repos
+        )
+
+        if result.returncode != 0:
+            pytest.fail(f"Failed to index repository: {result.stderr}")
+
+        # Verify indexing completed
+        status = json.loads((index_dir / "index_status.json").read_text())
+        assert status["status"] == "complete", f"Indexing did not complete: {status}"
+
+        if cached_index is not None:
+            # Copy to a temporary name first so an interrupted copy is never a cache hit
+            partial = cached_index.with_name(f"{cache_key}.{uuid.uuid4().hex}.partial")
+            E2E_INDEX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _copy_index(index_dir, partial)
+            try:
+                os.replace(partial, cached_index)
+            except OSError:
+                _discard_dir(partial)  # Another run stored the same key meanwhile
+
+    return index_dir
+
+
+@pytest.fixture
+def indexed_repo(shared_index_dir, initialized_repo, monkeypatch):
+    """The target repository searched through the current backend's shared index."""
+    monkeypatch.setenv("SIA_CODE_INDEX_DIR", str(shared_index_dir))
+    return initialized_repo
 
-    This fixture indexes the repository once per test session,
-    making all subsequent tests faster.
 
-    Uses --clean to recreate index with CI-optimized dimensions (384d bge-small)
-    after initialized_repo modifies the config from default (768d bge-base).
+@pytest.fixture(scope="session")
+def lexical_index_dir(tmp_path_factory, initialized_repo):
+    """Embedding-free index of the target repository, built once per run.
+
+    Lexical (--regex) searches never touch vectors, so tests that only use
+    them do not need to wait for indexed_repo's embedding pass. The index is
+    built with embedding.enabled=false in a separate directory selected
+    through SIA_CODE_INDEX_DIR.
     """
-    # Check if index already has content (skip re-indexing if it does)
-    index_path = initialized_repo / ".sia-code" / "index.db"
-    if index_path.exists() and index_path.stat().st_size > 100000:  # >100KB means indexed
-        # Index exists and has content, skip re-indexing
-        return initialized_repo
-
-    result = subprocess.run(
-        ["sia-code", "index", "--clean", "."],
-        cwd=initialized_repo,
-        capture_output=True,
-        text=True,
-        timeout=600,  # 10 minute timeout for large repos
-    )
+    index_dir = _shared_dir(tmp_path_factory) / "lexical-sia-code"
+    with _once_per_run(tmp_path_factory, "lexical_index") as first:
+        if first:
+            index_dir.mkdir(exist_ok=True)
+            config = json.loads((initialized_repo / ".sia-code" / "config.json").read_text())
+            config["embedding"]["enabled"] = False
+            (index_dir / "config.json").write_text(json.dumps(config, indent=2))
+
+            result = subprocess.run(
+                ["sia-code", "index", "--clean", "."],
+                cwd=initialized_repo,
+                env={**os.environ, "SIA_CODE_INDEX_DIR": str(index_dir)},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=600,
+            )
+            if result.returncode != 0:
+                pytest.fail(f"Failed to build lexical index: {result.stderr}")
 
-    if result.returncode != 0:
-        pytest.fail(f"Failed to index repository: {result.stderr}")
+    return index_dir
 
-    # Verify indexing completed
-    assert "complete" in result.stdout.lower() or "indexed" in result.stdout.lower()
 
+@pytest.fixture
+def lexical_indexed_repo(lexical_index_dir, initialized_repo, monkeypatch):
+    """The target repository searched through its embedding-free index."""
+    monkeypatch.setenv("SIA_CODE_INDEX_DIR", str(lexical_index_dir))
     return initialized_repo
 
 
+@pytest.fixture(scope="session")
+def indexed_backend(lexical_index_dir):
+    """The embedding-free index opened read-only, for tests that assert on raw results.
+
+    Calling `search_lexical` directly skips CLI parsing and JSON round-trips;
+    the `search --format json` path keeps its own smoke tests.
+    """
+    from sia_code.cli import create_backend
+    from sia_code.config import Config
+
+    backend = create_backend(lexical_index_dir, Config.load(lexical_index_dir / "config.json"))
+    backend.open_index()
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def scratch_indexed_repo(shared_index_dir, initialized_repo, tmp_path, monkeypatch):
+    """The indexed repository for a test that rewrites the index.
+
+    The test works on a private copy of the shared index selected through
+    SIA_CODE_INDEX_DIR, so --clean/--update/compact runs never touch the
+    session's shared index, which other tests (or xdist workers) may be
+    searching at the same time.
+    """
+    scratch = tmp_path / "sia-code"
+    _copy_index(shared_index_dir, scratch)
+    monkeypatch.setenv("SIA_CODE_INDEX_DIR", str(scratch))
+    return initialized_repo
+
+
+@pytest.fixture(scope="session")
+def updated_index_dir(tmp_path_factory, shared_index_dir, initialized_repo, embedding_backend):
+    """Copy of the shared index after one `index --update`, built once per run.
+
+    The compact tests need chunk_index.db, which only incremental indexing
+    writes; they start from copies of this directory instead of each running
+    their own update.
+    """
+    index_dir = _shared_dir(tmp_path_factory) / f"updated-sia-code-{embedding_backend}"
+    with _once_per_run(tmp_path_factory, f"updated_index-{embedding_backend}") as first:
+        if first:
+            _discard_dir(index_dir)
+            _copy_index(shared_index_dir, index_dir)
+
+            result = subprocess.run(
+                ["sia-code", "index", "--update", "."],
+                cwd=initialized_repo,
+                env={**os.environ, "SIA_CODE_INDEX_DIR": str(index_dir)},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=600,
+            )
+            if result.returncode != 0:
+                pytest.fail(f"Index update failed: {result.stderr}")
+
+            assert (index_dir / "chunk_index.db").exists(), (
+                "chunk_index.db not created after incremental indexing. "
+                "This may indicate no files were indexed successfully."
+            )
+
+    return index_dir
+
+
+@pytest.fixture
+def updated_indexed_repo(updated_index_dir, initialized_repo, tmp_path, monkeypatch):
+    """The indexed repository with a private copy of the updated index.
+
+    Like scratch_indexed_repo, but the copy already has chunk_index.db.
+    """
+    scratch = tmp_path / "sia-code"
+    _copy_index(updated_index_dir, scratch)
+    monkeypatch.setenv("SIA_CODE_INDEX_DIR", str(scratch))
+    return initialized_repo
+
+
+def pytest_configure(config):
+    """Register the E2E markers."""
+    config.addinivalue_line(
+        "markers", "slow: rewrites the whole index; skipped unless indexing code changed"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip full-index tests when the indexer is unchanged."""
+    slow = [item for item in items if item.get_closest_marker("slow")]
+    if not slow or E2E_FULL_INDEX_TESTS or _indexer_changed():
+        return
+    skip = pytest.mark.skip(reason="indexer unchanged (set E2E_FULL_INDEX_TESTS=1 to run)")
+    for item in slow:
+        item.add_marker(skip)
+
+
 def pytest_addoption(parser):
     """Add command line options for E2E tests."""
     parser.addoption(
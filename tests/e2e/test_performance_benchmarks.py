@@ -3,11 +3,108 @@
 Measures latency, throughput, and resource efficiency.
 """
 
+import os
+import queue
+import statistics
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+
 import pytest
-import subprocess
 
-from .base_e2e_test import BaseE2ETest
+from .base_e2e_test import BaseE2ETest, SiaCodeRunner
+
+READ_CHUNK_SIZE = 1 << 20
+
+# Source files measured by the size and throughput benchmarks (all E2E languages)
+CODE_EXTENSIONS = (
+    ".py",
+    ".js",
+    ".jsx",
+    ".ts",
+    ".tsx",
+    ".go",
+    ".rs",
+    ".java",
+    ".c",
+    ".h",
+    ".cc",
+    ".cpp",
+    ".cxx",
+    ".hpp",
+    ".cs",
+    ".rb",
+    ".php",
+)
+
+# Persistent search processes used by the concurrency test; searches are CPU-bound,
+# so more processes than cores only adds context switching
+CONCURRENT_WORKERS = min(3, os.cpu_count() or 1)
+CONCURRENCY_REPEATS = 3
+
+
+def iter_source_files(root: str, extensions: tuple[str, ...]) -> Iterator[os.DirEntry]:
+    """Yield regular files under root with one of the given extensions.
+
+    Walks with os.scandir without following symlinks, and prunes hidden
+    directories such as .git and the .sia-code index.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        stack.append(entry.path)
+                elif entry.name.endswith(extensions) and entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+def measure_source(root: str, extensions: tuple[str, ...]) -> dict[str, int]:
+    """Measure source files under root in a single walk.
+
+    Lines are counted as b"\\n" in 1 MiB binary reads, avoiding a
+    `find ... -exec wc -l` subprocess. Sizes are the byte counts of those same
+    reads, so no file is stat'ed separately.
+
+    Returns:
+        Dict with "source_size" (bytes), "total_lines" and "file_count"
+    """
+    metrics = {"source_size": 0, "total_lines": 0, "file_count": 0}
+    for entry in iter_source_files(root, extensions):
+        try:
+            with open(entry.path, "rb") as f:
+                for buf in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+                    metrics["source_size"] += len(buf)
+                    metrics["total_lines"] += buf.count(b"\n")
+        except OSError:
+            continue
+        metrics["file_count"] += 1
+    return metrics
+
+
+@pytest.fixture(scope="session")
+def repo_metrics(target_repo):
+    """Source size, line count and file count of the target repository, measured once."""
+    return measure_source(str(target_repo), CODE_EXTENSIONS)
+
+
+@pytest.fixture(scope="class")
+def search_runners(shared_index_dir, initialized_repo):
+    """Pre-started, warmed `sia-code search --batch` children for concurrency tests.
+
+    Interpreter startup, imports and index open happen here, outside any timed
+    region, so timings reflect the search path itself.
+    """
+    runners = [
+        SiaCodeRunner(initialized_repo, regex=False, index_dir=shared_index_dir)
+        for _ in range(CONCURRENT_WORKERS)
+    ]
+    for runner in runners:
+        runner.search("warmup", limit=1)
+    yield runners
+    for runner in runners:
+        runner.close()
 
 
 class TestPerformanceBenchmarks(BaseE2ETest):
@@ -23,91 +120,57 @@ class TestPerformanceBenchmarks(BaseE2ETest):
             "async operations with timeout",
         ]
 
-        latencies = []
+        def timed_search(query: str) -> Optional[int]:
+            """Run one measured search; returns its latency in ns, or None on failure."""
+            start = time.perf_counter_ns()
+            result = self.run_cli(["search", query, "-k", "10"], indexed_repo, capture_stdout=False)
+            elapsed_ns = time.perf_counter_ns() - start
+            return elapsed_ns if result.returncode == 0 else None
 
-        for query in queries:
-            # Warm-up run
-            self.run_cli(["search", query, "-k", "5"], indexed_repo)
+        # A single warm-up run loads the index (and model) caches once
+        self.run_cli(["search", queries[0], "-k", "5"], indexed_repo, capture_stdout=False)
 
-            # Measured run
-            start = time.perf_counter()
-            result = self.run_cli(["search", query, "-k", "10"], indexed_repo)
-            elapsed = time.perf_counter() - start
-
-            if result.returncode == 0:
-                latencies.append(elapsed)
-
-        # Calculate percentiles
-        latencies.sort()
-        p50 = latencies[len(latencies) // 2] if latencies else 0
-        p95 = (
-            latencies[int(len(latencies) * 0.95)]
-            if len(latencies) > 1
-            else (latencies[0] if latencies else 0)
-        )
-        avg = sum(latencies) / len(latencies) if latencies else 0
+        # Measured runs go one at a time: in-process CLI runs serialize on a lock,
+        # so concurrent runs would time lock waits rather than searches
+        latencies_ns = [ns for ns in map(timed_search, queries) if ns is not None]
+
+        # Calculate percentiles (interpolated; quantiles needs at least two samples)
+        if len(latencies_ns) > 1:
+            p50_ns = statistics.median(latencies_ns)
+            p95_ns = statistics.quantiles(latencies_ns, n=20, method="inclusive")[-1]
+        else:
+            p50_ns = p95_ns = latencies_ns[0] if latencies_ns else 0
+        avg_ns = statistics.fmean(latencies_ns) if latencies_ns else 0
+
+        p50 = p50_ns / 1e9
+        p95 = p95_ns / 1e9
 
         print("\n=== Search Latency Benchmark ===")
-        print(f"Queries: {len(latencies)}")
-        print(f"Average: {avg * 1000:.0f}ms")
-        print(f"P50:     {p50 * 1000:.0f}ms")
-        print(f"P95:     {p95 * 1000:.0f}ms")
-        print(f"Min:     {min(latencies) * 1000:.0f}ms" if latencies else "N/A")
-        print(f"Max:     {max(latencies) * 1000:.0f}ms" if latencies else "N/A")
+        print(f"Queries: {len(latencies_ns)}")
+        print(f"Average: {avg_ns / 1e6:.1f}ms")
+        print(f"P50:     {p50_ns / 1e6:.1f}ms")
+        print(f"P95:     {p95_ns / 1e6:.1f}ms")
+        print(f"Min:     {min(latencies_ns) / 1e6:.1f}ms" if latencies_ns else "N/A")
+        print(f"Max:     {max(latencies_ns) / 1e6:.1f}ms" if latencies_ns else "N/A")
         print()
 
         # Relaxed thresholds for CI/local environments
         assert p50 < 5.0, f"P50 latency {p50:.2f}s exceeds 5s target"
         assert p95 < 10.0, f"P95 latency {p95:.2f}s exceeds 10s target"
 
-    def test_index_throughput(self, initialized_repo):
-        """Measure indexing throughput (lines per second)."""
-        # Count lines of code in the repository
-        try:
-            loc_result = subprocess.run(
-                [
-                    "find",
-                    ".",
-                    "-type",
-                    "f",
-                    "(",
-                    "-name",
-                    "*.py",
-                    "-o",
-                    "-name",
-                    "*.ts",
-                    "-o",
-                    "-name",
-                    "*.js",
-                    ")",
-                    "-exec",
-                    "wc",
-                    "-l",
-                    "{}",
-                    "+",
-                ],
-                cwd=initialized_repo,
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-
-            if loc_result.returncode == 0 and loc_result.stdout:
-                # Parse total from last line
-                lines = loc_result.stdout.strip().split("\n")
-                if lines:
-                    total_lines = int(lines[-1].strip().split()[0])
-                else:
-                    total_lines = 0
-            else:
-                total_lines = 0
+    def test_index_throughput(self, scratch_indexed_repo, repo_metrics):
+        """Measure indexing throughput (lines per second).
 
-        except (subprocess.TimeoutExpired, ValueError, IndexError):
-            total_lines = 0
+        Rebuilds a private copy of the index from scratch, so the shared
+        index other tests (or xdist workers) search is never rewritten.
+        """
+        total_lines = repo_metrics["total_lines"]
 
-        # Time indexing
+        # Time a full rebuild
         start = time.perf_counter()
-        result = self.run_cli(["index", "."], initialized_repo, timeout=600)
+        result = self.run_cli(
+            ["index", "--clean", "."], scratch_indexed_repo, timeout=600, capture_stdout=False
+        )
         elapsed = time.perf_counter() - start
 
         throughput = total_lines / elapsed if elapsed > 0 and total_lines > 0 else 0
@@ -124,21 +187,12 @@ class TestPerformanceBenchmarks(BaseE2ETest):
         if total_lines > 0:
             assert throughput > 10, f"Throughput {throughput:.0f} lines/sec unexpectedly low"
 
-    def test_index_size_efficiency(self, indexed_repo):
+    def test_index_size_efficiency(self, indexed_repo, repo_metrics):
         """Measure index size relative to source code size."""
-        # Calculate source code size
-        source_size = 0
-        code_extensions = {".py", ".ts", ".js", ".tsx", ".jsx", ".go", ".rs"}
-
-        for file_path in indexed_repo.rglob("*"):
-            if file_path.is_file() and file_path.suffix in code_extensions:
-                try:
-                    source_size += file_path.stat().st_size
-                except OSError:
-                    pass
+        source_size = repo_metrics["source_size"]
 
         # Get index size
-        index_path = indexed_repo / ".sia-code" / "index.db"
+        index_path = self.index_dir(indexed_repo) / "index.db"
         index_size = index_path.stat().st_size if index_path.exists() else 0
 
         ratio = index_size / source_size if source_size > 0 else 0
@@ -152,15 +206,17 @@ class TestPerformanceBenchmarks(BaseE2ETest):
         # Relaxed threshold - index can be larger than source with embeddings
         assert ratio < 20.0, f"Index ratio {ratio:.2f}x exceeds 20x target"
 
-    def test_search_result_count_consistency(self, indexed_repo):
+    def test_search_result_count_consistency(self, lexical_indexed_repo):
         """Verify search returns consistent result counts."""
         query = "function"
 
         # Run same search multiple times
         counts = []
         for _ in range(3):
-            results = self.search_json(query, indexed_repo, regex=True, limit=10)
-            counts.append(len(results.get("results", [])))
+            results = self.search_json(
+                query, lexical_indexed_repo, regex=True, limit=10, cached=False
+            )
+            counts.append(len(results.results))
 
         print("\n=== Search Consistency ===")
         print(f"Query: {query}")
@@ -170,27 +226,45 @@ class TestPerformanceBenchmarks(BaseE2ETest):
         # Results should be consistent across runs
         assert len(set(counts)) <= 2, f"Result counts vary too much: {counts}"
 
-    def test_concurrent_search_performance(self, indexed_repo):
-        """Measure performance degradation with concurrent searches."""
-        import concurrent.futures
-
-        queries = ["command", "option", "argument", "help", "group"]
-
-        # Sequential baseline
-        start_seq = time.perf_counter()
-        for query in queries:
-            self.run_cli(["search", query, "-k", "5"], indexed_repo)
-        elapsed_seq = time.perf_counter() - start_seq
-
-        # Concurrent execution
-        start_concurrent = time.perf_counter()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            futures = [
-                executor.submit(self.run_cli, ["search", q, "-k", "5"], indexed_repo)
-                for q in queries
-            ]
-            concurrent.futures.wait(futures)
-        elapsed_concurrent = time.perf_counter() - start_concurrent
+    def test_concurrent_search_performance(self, search_runners):
+        """Measure performance degradation with concurrent searches.
+
+        Searches go to long-lived processes, so the comparison measures
+        contention in the search path rather than process creation.
+        """
+        if len(search_runners) < 2:
+            pytest.skip("Concurrent speedup needs at least 2 CPUs")
+
+        queries = ["command", "option", "argument", "help", "group"] * 4
+
+        # Concurrent execution; each search checks out a process of its own
+        idle: queue.Queue[SiaCodeRunner] = queue.Queue()
+        for runner in search_runners:
+            idle.put(runner)
+
+        def pooled_search(query: str) -> None:
+            runner = idle.get()
+            try:
+                runner.search(query, limit=5)
+            finally:
+                idle.put(runner)
+
+        def run_sequential() -> float:
+            start = time.perf_counter()
+            for query in queries:
+                search_runners[0].search(query, limit=5)
+            return time.perf_counter() - start
+
+        def run_concurrent() -> float:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=len(search_runners)) as executor:
+                list(executor.map(pooled_search, queries))
+            return time.perf_counter() - start
+
+        # Searches are fast once processes are warm, so take the best of a few
+        # repeats to keep scheduler noise out of the comparison
+        elapsed_seq = min(run_sequential() for _ in range(CONCURRENCY_REPEATS))
+        elapsed_concurrent = min(run_concurrent() for _ in range(CONCURRENCY_REPEATS))
 
         speedup = elapsed_seq / elapsed_concurrent if elapsed_concurrent > 0 else 0
 
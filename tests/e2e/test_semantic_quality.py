@@ -4,109 +4,173 @@ Tests measure search quality using ground-truth queries from repository document
 Requires OPENAI_API_KEY to be set for embeddings.
 """
 
+import functools
+import os
+import re
+from dataclasses import dataclass
+
 import pytest
-from pathlib import Path
 
-from .base_e2e_test import BaseE2ETest
+from .base_e2e_test import BaseE2ETest, SearchResults
+
+
+@dataclass(frozen=True)
+class GroundTruth:
+    """One ground-truth query and the symbols or files that count as a hit."""
+
+    query: str
+    expected_symbols: tuple[str, ...] = ()
+    expected_files: tuple[str, ...] = ()
+    min_mrr: float = 0.0
+
+
+GROUND_TRUTH_CLICK: tuple[GroundTruth, ...] = (
+    GroundTruth(
+        query="how to create a command line interface",
+        expected_symbols=("command", "Command", "decorator"),
+        expected_files=("decorators.py", "core.py"),
+        min_mrr=0.3,
+    ),
+    GroundTruth(
+        query="how to add options to a command",
+        expected_symbols=("option", "Option"),
+        expected_files=("decorators.py", "core.py"),
+        min_mrr=0.3,
+    ),
+    GroundTruth(
+        query="how to prompt for user input",
+        expected_symbols=("prompt", "Prompt"),
+        expected_files=("termui.py", "decorators.py"),
+        min_mrr=0.2,
+    ),
+    GroundTruth(
+        query="handle command line arguments",
+        expected_symbols=("argument", "Argument", "parameter"),
+        expected_files=("core.py", "decorators.py"),
+        min_mrr=0.2,
+    ),
+    GroundTruth(
+        query="automatic help generation",
+        expected_symbols=("help", "format_help"),
+        expected_files=("core.py", "formatting.py"),
+        min_mrr=0.2,
+    ),
+)
+
+GROUND_TRUTH_PQUEUE: tuple[GroundTruth, ...] = (
+    GroundTruth(
+        query="how to limit concurrency in async operations",
+        expected_symbols=("PQueue", "concurrency"),
+        expected_files=("queue.ts", "index.ts"),
+        min_mrr=0.3,
+    ),
+    GroundTruth(
+        query="how to pause and resume a queue",
+        expected_symbols=("pause", "start"),
+        expected_files=("queue.ts",),
+        min_mrr=0.3,
+    ),
+    GroundTruth(
+        query="wait for queue to become empty",
+        expected_symbols=("onEmpty", "empty"),
+        expected_files=("queue.ts",),
+        min_mrr=0.3,
+    ),
+    GroundTruth(
+        query="rate limiting async operations",
+        expected_symbols=("intervalCap", "interval", "rate"),
+        expected_files=("queue.ts",),
+        min_mrr=0.2,
+    ),
+)
 
 
 class SemanticQualityMixin:
     """Mixin for semantic quality testing methods."""
 
-    def calculate_reciprocal_rank(self, results: dict, ground_truth: dict) -> float:
-        """Calculate reciprocal rank for a query.
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _multi_pattern(terms: tuple[str, ...]) -> re.Pattern | None:
+        """Case-insensitive matcher for any of the terms as a substring (None if no terms)."""
+        if not terms:
+            return None
+        return re.compile("|".join(map(re.escape, terms)), re.IGNORECASE)
+
+    def _prep_gt(self, ground_truth: GroundTruth) -> tuple[re.Pattern | None, re.Pattern | None]:
+        """Matchers for a ground-truth entry's expected symbols and files (compiled once)."""
+        return (
+            self._multi_pattern(ground_truth.expected_symbols),
+            self._multi_pattern(ground_truth.expected_files),
+        )
+
+    def _first_hit_rank(self, results: SearchResults, ground_truth: GroundTruth) -> int | None:
+        """Rank (1-based) of the first result matching the ground truth, or None."""
+        symbol_pattern, file_pattern = self._prep_gt(ground_truth)
+
+        for rank, result in enumerate(results.results, start=1):
+            chunk = result["chunk"]
 
-        Args:
-            results: Search results from CLI
-            ground_truth: Dict with expected_symbols and expected_files
+            # Check if this result matches expected symbols or files
+            if (symbol_pattern and symbol_pattern.search(chunk.get("symbol", ""))) or (
+                file_pattern and file_pattern.search(chunk.get("file_path", ""))
+            ):
+                return rank
 
-        Returns:
-            Reciprocal rank (1/rank of first relevant result, 0 if none found)
-        """
-        result_list = results.get("results", [])
+        return None
 
-        expected_symbols = ground_truth.get("expected_symbols", [])
-        expected_files = ground_truth.get("expected_files", [])
+    def calculate_ranks(
+        self, results: SearchResults, ground_truth: GroundTruth
+    ) -> dict[str, float | bool]:
+        """Compute reciprocal rank, Hit@1 and Hit@5 from a single pass over results.
 
-        for rank, result in enumerate(result_list, start=1):
-            chunk = result["chunk"]
-            symbol = chunk.get("symbol", "").lower()
-            file_path = chunk.get("file_path", "").lower()
+        Args:
+            results: Search results from search_json
+            ground_truth: Expected symbols and files for the query
 
-            # Check if this result matches expected symbols or files
-            symbol_match = any(exp.lower() in symbol for exp in expected_symbols)
-            file_match = any(exp.lower() in file_path for exp in expected_files)
+        Returns:
+            Dict with "rr", "hit@1" and "hit@5"
+        """
+        rank = self._first_hit_rank(results, ground_truth)
+        return {
+            "rr": 1.0 / rank if rank else 0.0,
+            "hit@1": rank is not None and rank <= 1,
+            "hit@5": rank is not None and rank <= 5,
+        }
+
+    def calculate_reciprocal_rank(self, results: SearchResults, ground_truth: GroundTruth) -> float:
+        """Calculate reciprocal rank for a query.
 
-            if symbol_match or file_match:
-                return 1.0 / rank
+        Args:
+            results: Search results from search_json
+            ground_truth: Expected symbols and files for the query
 
-        return 0.0  # No relevant result found
+        Returns:
+            Reciprocal rank (1/rank of first relevant result, 0 if none found)
+        """
+        rank = self._first_hit_rank(results, ground_truth)
+        return 1.0 / rank if rank else 0.0
 
-    def calculate_hit_at_k(self, results: dict, ground_truth: dict, k: int = 1) -> bool:
+    def calculate_hit_at_k(
+        self, results: SearchResults, ground_truth: GroundTruth, k: int = 1
+    ) -> bool:
         """Check if any relevant result appears in top-k.
 
         Args:
-            results: Search results from CLI
-            ground_truth: Dict with expected_symbols and expected_files
+            results: Search results from search_json
+            ground_truth: Expected symbols and files for the query
             k: Number of top results to check
 
         Returns:
             True if relevant result found in top-k, False otherwise
         """
-        result_list = results.get("results", [])[:k]
-
-        expected_symbols = ground_truth.get("expected_symbols", [])
-        expected_files = ground_truth.get("expected_files", [])
-
-        for result in result_list:
-            chunk = result["chunk"]
-            symbol = chunk.get("symbol", "").lower()
-            file_path = chunk.get("file_path", "").lower()
-
-            symbol_match = any(exp.lower() in symbol for exp in expected_symbols)
-            file_match = any(exp.lower() in file_path for exp in expected_files)
-
-            if symbol_match or file_match:
-                return True
-
-        return False
+        rank = self._first_hit_rank(results, ground_truth)
+        return rank is not None and rank <= k
 
 
 class TestSemanticQualityClick(BaseE2ETest, SemanticQualityMixin):
     """Ground-truth semantic search tests for Click repository."""
 
-    GROUND_TRUTH_QUERIES = [
-        {
-            "query": "how to create a command line interface",
-            "expected_symbols": ["command", "Command", "decorator"],
-            "expected_files": ["decorators.py", "core.py"],
-            "min_mrr": 0.3,
-        },
-        {
-            "query": "how to add options to a command",
-            "expected_symbols": ["option", "Option"],
-            "expected_files": ["decorators.py", "core.py"],
-            "min_mrr": 0.3,
-        },
-        {
-            "query": "how to prompt for user input",
-            "expected_symbols": ["prompt", "Prompt"],
-            "expected_files": ["termui.py", "decorators.py"],
-            "min_mrr": 0.2,
-        },
-        {
-            "query": "handle command line arguments",
-            "expected_symbols": ["argument", "Argument", "parameter"],
-            "expected_files": ["core.py", "decorators.py"],
-            "min_mrr": 0.2,
-        },
-        {
-            "query": "automatic help generation",
-            "expected_symbols": ["help", "format_help"],
-            "expected_files": ["core.py", "formatting.py"],
-            "min_mrr": 0.2,
-        },
-    ]
+    GROUND_TRUTH_QUERIES = GROUND_TRUTH_CLICK
 
     def test_semantic_search_mrr(self, indexed_repo):
         """Measure Mean Reciprocal Rank for ground-truth queries."""
@@ -116,14 +180,16 @@ class TestSemanticQualityClick(BaseE2ETest, SemanticQualityMixin):
 
         print("\n=== Semantic Search Quality Results ===\n")
 
-        for gt in self.GROUND_TRUTH_QUERIES:
-            # Run semantic search (no --regex flag)
-            results = self.search_json(gt["query"], indexed_repo, regex=False, limit=10)
+        # Run all semantic searches (no --regex flag) in one CLI call
+        all_results = self.search_json_many(
+            [gt.query for gt in self.GROUND_TRUTH_QUERIES], indexed_repo, regex=False, limit=10
+        )
+
+        for gt, results in zip(self.GROUND_TRUTH_QUERIES, all_results):
 
             # Calculate metrics
-            rr = self.calculate_reciprocal_rank(results, gt)
-            hit1 = self.calculate_hit_at_k(results, gt, k=1)
-            hit5 = self.calculate_hit_at_k(results, gt, k=5)
+            ranks = self.calculate_ranks(results, gt)
+            rr, hit1, hit5 = ranks["rr"], ranks["hit@1"], ranks["hit@5"]
 
             total_rr += rr
             if hit1:
@@ -131,13 +197,13 @@ class TestSemanticQualityClick(BaseE2ETest, SemanticQualityMixin):
             if hit5:
                 hit_at_5 += 1
 
-            print(f"Query: {gt['query'][:50]}...")
+            print(f"Query: {gt.query[:50]}...")
             print(f"  RR: {rr:.3f}  Hit@1: {hit1}  Hit@5: {hit5}")
 
             # Show top result for debugging
-            if results.get("results"):
-                top = results["results"][0]
-                print(f"  Top: {top['chunk']['symbol']} in {Path(top['chunk']['file_path']).name}")
+            if results.results:
+                top = results.results[0]["chunk"]
+                print(f"  Top: {top['symbol']} in {os.path.basename(top['file_path'])}")
             print()
 
         # Calculate aggregate metrics
@@ -170,8 +236,8 @@ class TestSemanticQualityClick(BaseE2ETest, SemanticQualityMixin):
             semantic = self.search_json(query, indexed_repo, regex=False, limit=5)
             lexical = self.search_json(query, indexed_repo, regex=True, limit=5)
 
-            sem_count = len(semantic.get("results", []))
-            lex_count = len(lexical.get("results", []))
+            sem_count = len(semantic.results)
+            lex_count = len(lexical.results)
 
             print(f"Query: {query[:40]}...")
             print(f"  Semantic: {sem_count} results")
@@ -201,13 +267,13 @@ class TestSemanticQualityClick(BaseE2ETest, SemanticQualityMixin):
         for case in test_cases:
             results = self.search_json(case["query"], indexed_repo, regex=False, limit=3)
 
-            if not results.get("results"):
+            if not results.results:
                 print(f"Query: {case['query']}")
                 print("  No results found")
                 print()
                 continue
 
-            top_result = results["results"][0]
+            top_result = results.results[0]
             code = top_result["chunk"]["code"].lower()
             symbol = top_result["chunk"]["symbol"].lower()
 
@@ -230,32 +296,7 @@ class TestSemanticQualityClick(BaseE2ETest, SemanticQualityMixin):
 class TestSemanticQualityPQueue(BaseE2ETest, SemanticQualityMixin):
     """Ground-truth semantic search tests for p-queue repository."""
 
-    GROUND_TRUTH_QUERIES = [
-        {
-            "query": "how to limit concurrency in async operations",
-            "expected_symbols": ["PQueue", "concurrency"],
-            "expected_files": ["queue.ts", "index.ts"],
-            "min_mrr": 0.3,
-        },
-        {
-            "query": "how to pause and resume a queue",
-            "expected_symbols": ["pause", "start"],
-            "expected_files": ["queue.ts"],
-            "min_mrr": 0.3,
-        },
-        {
-            "query": "wait for queue to become empty",
-            "expected_symbols": ["onEmpty", "empty"],
-            "expected_files": ["queue.ts"],
-            "min_mrr": 0.3,
-        },
-        {
-            "query": "rate limiting async operations",
-            "expected_symbols": ["intervalCap", "interval", "rate"],
-            "expected_files": ["queue.ts"],
-            "min_mrr": 0.2,
-        },
-    ]
+    GROUND_TRUTH_QUERIES = GROUND_TRUTH_PQUEUE
 
     def test_semantic_search_mrr(self, indexed_repo):
         """Measure Mean Reciprocal Rank for p-queue ground-truth queries."""
@@ -265,12 +306,13 @@ class TestSemanticQualityPQueue(BaseE2ETest, SemanticQualityMixin):
 
         print("\n=== Semantic Search Quality Results (p-queue) ===\n")
 
-        for gt in self.GROUND_TRUTH_QUERIES:
-            results = self.search_json(gt["query"], indexed_repo, regex=False, limit=10)
+        all_results = self.search_json_many(
+            [gt.query for gt in self.GROUND_TRUTH_QUERIES], indexed_repo, regex=False, limit=10
+        )
 
-            rr = self.calculate_reciprocal_rank(results, gt)
-            hit1 = self.calculate_hit_at_k(results, gt, k=1)
-            hit5 = self.calculate_hit_at_k(results, gt, k=5)
+        for gt, results in zip(self.GROUND_TRUTH_QUERIES, all_results):
+            ranks = self.calculate_ranks(results, gt)
+            rr, hit1, hit5 = ranks["rr"], ranks["hit@1"], ranks["hit@5"]
 
             total_rr += rr
             if hit1:
@@ -278,12 +320,12 @@ class TestSemanticQualityPQueue(BaseE2ETest, SemanticQualityMixin):
             if hit5:
                 hit_at_5 += 1
 
-            print(f"Query: {gt['query'][:50]}...")
+            print(f"Query: {gt.query[:50]}...")
             print(f"  RR: {rr:.3f}  Hit@1: {hit1}  Hit@5: {hit5}")
 
-            if results.get("results"):
-                top = results["results"][0]
-                print(f"  Top: {top['chunk']['symbol']} in {Path(top['chunk']['file_path']).name}")
+            if results.results:
+                top = results.results[0]["chunk"]
+                print(f"  Top: {top['symbol']} in {os.path.basename(top['file_path'])}")
             print()
 
         num_queries = len(self.GROUND_TRUTH_QUERIES)
@@ -0,0 +1,24 @@
+"""Shared fixtures for integration tests."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def rewrite_file():
+    """Return a function that rewrites a file and moves its mtime forward.
+
+    The mtime is set 2s past the previous one, so the change is visible to
+    mtime-based change detection without sleeping, even on filesystems with
+    1s timestamp resolution.
+    """
+
+    def rewrite(path: Path, content: str) -> None:
+        previous_ns = path.stat().st_mtime_ns
+        path.write_text(content)
+        os.utime(path, ns=(time.time_ns(), previous_ns + 2_000_000_000))
+
+    return rewrite
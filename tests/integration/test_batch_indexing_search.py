@@ -28,13 +28,7 @@ def test_batched_indexing_enables_search(tmp_path):
     config.indexing.chunk_batch_size = 2
     config.embedding.enabled = False
 
-    backend = UsearchSqliteBackend(
-        path=tmp_path / ".sia-code",
-        embedding_enabled=False,
-        ndim=4,
-        dtype="f32",
-    )
-    backend.create_index()
+    backend = UsearchSqliteBackend.in_memory(embedding_enabled=False, ndim=4, dtype="f32")
 
     coordinator = IndexingCoordinator(config, backend)
     stats = coordinator.index_directory(repo)
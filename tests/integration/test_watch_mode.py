@@ -1,7 +1,8 @@
 """Integration tests for watch mode functionality."""
 
+import shutil
+
 import pytest
-import time
 from sia_code.indexer.coordinator import IndexingCoordinator
 from sia_code.indexer.hash_cache import HashCache
 from sia_code.indexer.chunk_index import ChunkIndex
@@ -9,10 +10,10 @@ from sia_code.storage.usearch_backend import UsearchSqliteBackend
 from sia_code.config import Config, ChunkingConfig
 
 
-@pytest.fixture
-def temp_workspace(tmp_path):
-    """Create a temporary workspace with test files."""
-    workspace = tmp_path / "workspace"
+@pytest.fixture(scope="session")
+def _workspace_template(tmp_path_factory):
+    """Create the initial test files once; test_setup resets workspaces from it."""
+    workspace = tmp_path_factory.mktemp("watch-template") / "workspace"
     workspace.mkdir()
 
     # Create initial test file
@@ -25,20 +26,25 @@ def hello():
     return workspace
 
 
-@pytest.fixture
-def test_setup(tmp_path, temp_workspace):
-    """Set up test infrastructure (backend, cache, index)."""
+@pytest.fixture(scope="class")
+def test_setup(tmp_path_factory, _workspace_template):
+    """Set up test infrastructure (backend, cache, index) shared by a test class.
+
+    Tests call the "reset" entry before they start (the workspace, cache and
+    chunk index only exist after the first call); it empties the chunk table,
+    clears the hash cache, replaces the chunk index and rewrites the workspace.
+    """
+    tmp_path = tmp_path_factory.mktemp("watch")
+    workspace = tmp_path / "workspace"
+
     # Create backend
     backend_path = tmp_path / "test.sia-code"
     backend = UsearchSqliteBackend(backend_path, embedding_enabled=False)
     backend.create_index()
 
     # Create cache and chunk index
-    cache_path = tmp_path / "cache.json"
-    cache = HashCache(cache_path)
-
-    chunk_index_path = tmp_path / "chunk_index.json"
-    chunk_index = ChunkIndex(chunk_index_path)
+    cache_path = tmp_path / "cache.db"
+    chunk_index_path = tmp_path / "chunk_index.db"
 
     # Create config
     config = Config(
@@ -53,21 +59,39 @@ def test_setup(tmp_path, temp_workspace):
 
     coordinator = IndexingCoordinator(backend=backend, config=config)
 
-    yield {
+    setup = {
         "backend": backend,
-        "cache": cache,
-        "chunk_index": chunk_index,
+        "cache": HashCache(cache_path),
         "config": config,
         "coordinator": coordinator,
-        "workspace": temp_workspace,
+        "workspace": workspace,
     }
 
+    def reset():
+        # Deleting through the chunks table keeps chunks_fts in sync via its trigger
+        backend.conn.execute("DELETE FROM chunks")
+        backend.conn.commit()
+        setup["cache"].clear()
+        chunk_index_path.unlink(missing_ok=True)
+        setup["chunk_index"] = ChunkIndex(chunk_index_path)
+        shutil.rmtree(workspace, ignore_errors=True)
+        shutil.copytree(_workspace_template, workspace)
+
+    setup["reset"] = reset
+
+    yield setup
+
     backend.close()
 
 
 class TestWatchModeIndexing:
     """Test watch mode uses v2 incremental indexing correctly."""
 
+    @pytest.fixture(autouse=True)
+    def _fresh_setup(self, test_setup):
+        """Start every test from an empty index and the initial workspace."""
+        test_setup["reset"]()
+
     def test_watch_uses_v2_method(self, test_setup):
         """Test that watch mode reindex uses index_directory_incremental_v2."""
         setup = test_setup
@@ -123,7 +147,7 @@ class TestWatchModeIndexing:
         valid_chunks = setup["chunk_index"].get_valid_chunks()
         assert len(valid_chunks) == initial_chunks
 
-    def test_watch_detects_file_changes(self, test_setup):
+    def test_watch_detects_file_changes(self, test_setup, rewrite_file):
         """Test that watch mode detects and re-indexes changed files."""
         setup = test_setup
 
@@ -138,18 +162,18 @@ class TestWatchModeIndexing:
         setup["cache"].save()
         setup["chunk_index"].save()
 
-        # Wait a moment to ensure mtime changes
-        time.sleep(0.01)
-
         # Modify the file
         test_file = setup["workspace"] / "test.py"
-        test_file.write_text("""
+        rewrite_file(
+            test_file,
+            """
 def hello():
     return "Hello, World!"
 
 def goodbye():
     return "Goodbye, World!"
-""")
+""",
+        )
 
         # Re-index (should detect change)
         stats2 = setup["coordinator"].index_directory_incremental_v2(
@@ -163,7 +187,7 @@ def goodbye():
         assert stats2["changed_files"] >= 1
         assert stats2["total_chunks"] >= 2  # Now has 2 functions
 
-    def test_watch_does_not_reindex_whole_repo(self, test_setup):
+    def test_watch_does_not_reindex_whole_repo(self, test_setup, rewrite_file):
         """Test that watch mode doesn't re-index unchanged files."""
         setup = test_setup
 
@@ -189,13 +213,15 @@ def function_{i}():
         # Should index 6 files (test.py + 5 new modules)
         assert stats1["changed_files"] >= 6
 
-        # Wait and modify only one file
-        time.sleep(0.01)
+        # Modify only one file
         changed_file = setup["workspace"] / "module2.py"
-        changed_file.write_text("""
+        rewrite_file(
+            changed_file,
+            """
 def function_2():
     return "modified"
-""")
+""",
+        )
 
         # Re-index
         stats2 = setup["coordinator"].index_directory_incremental_v2(
@@ -209,7 +235,7 @@ def function_2():
         assert stats2["changed_files"] == 1
         assert stats2["skipped_files"] == 5  # Other 5 files skipped
 
-    def test_chunk_index_tracks_stale_chunks(self, test_setup):
+    def test_chunk_index_tracks_stale_chunks(self, test_setup, rewrite_file):
         """Test that chunk index properly tracks stale chunks when files change."""
         setup = test_setup
 
@@ -228,12 +254,14 @@ def function_2():
         assert len(initial_valid_chunks) >= 1
 
         # Modify file
-        time.sleep(0.01)
         test_file = setup["workspace"] / "test.py"
-        test_file.write_text("""
+        rewrite_file(
+            test_file,
+            """
 def modified_function():
     return "Modified"
-""")
+""",
+        )
 
         # Re-index
         setup["coordinator"].index_directory_incremental_v2(
@@ -140,6 +140,11 @@ class TestCLIIndex:
         assert result.returncode == 0
         assert "indexing complete" in result.stdout.lower()
 
+        status = json.loads((test_project / ".sia-code" / "index_status.json").read_text())
+        assert status["status"] == "complete"
+        assert status["mode"] == "full"
+        assert status["indexed_files"] == 2
+
     def test_index_clean(self, test_project):
         """Test clean indexing."""
         run_cli(["init"], cwd=test_project)
@@ -209,6 +214,124 @@ class TestCLISearch:
         # Should contain JSON structure
         assert "{" in result.stdout or "No results" in result.stdout
 
+    def test_search_ndjson_format(self, test_project):
+        """Test --format ndjson writes one JSON result per line."""
+        run_cli(["init"], cwd=test_project)
+        disable_embeddings(test_project)
+        run_cli(["index", "."], cwd=test_project)
+
+        result = run_cli(
+            ["search", "def", "--regex", "--no-filter", "--format", "ndjson", "-k", "3"],
+            cwd=test_project,
+        )
+
+        assert result.returncode == 0
+        lines = result.stdout.splitlines()
+        assert 0 < len(lines) <= 3
+        assert all("chunk" in json.loads(line) for line in lines)
+
+    def test_search_ndjson_matches_json_format(self, test_project):
+        """Test --format ndjson returns the same results, in order, as --format json."""
+        run_cli(["init"], cwd=test_project)
+        disable_embeddings(test_project)
+        run_cli(["index", "."], cwd=test_project)
+
+        args = ["search", "def", "--regex", "--no-filter", "-k", "5"]
+        as_json = run_cli([*args, "--format", "json"], cwd=test_project)
+        as_ndjson = run_cli([*args, "--format", "ndjson"], cwd=test_project)
+
+        assert as_json.returncode == 0
+        assert as_ndjson.returncode == 0
+        expected = json.loads(as_json.stdout)["results"]
+        assert [json.loads(line) for line in as_ndjson.stdout.splitlines()] == expected
+
+    def test_search_batch_mode(self, test_project):
+        """Test batch search answers one JSON line per stdin request."""
+        run_cli(["init"], cwd=test_project)
+        disable_embeddings(test_project)
+        run_cli(["index", "."], cwd=test_project)
+
+        env = os.environ.copy()
+        repo_root = Path(__file__).resolve().parents[1]
+        env["PYTHONPATH"] = f"{repo_root}:{env.get('PYTHONPATH', '')}"
+        requests = [{"query": "multiply", "limit": 1}, {"query": "format_string"}]
+        result = subprocess.run(
+            [sys.executable, "-m", "sia_code.cli", "search", "--batch", "--regex", "--no-filter"],
+            cwd=test_project,
+            input="\n".join(json.dumps(r) for r in requests) + "\n",
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+
+        assert result.returncode == 0
+        responses = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+        assert [r["query"] for r in responses] == ["multiply", "format_string"]
+        assert len(responses[0]["results"]) <= 1
+        assert all("error" not in r for r in responses)
+
+    def test_search_queries_file(self, test_project):
+        """Test --queries-file answers every request in one JSON list."""
+        run_cli(["init"], cwd=test_project)
+        disable_embeddings(test_project)
+        run_cli(["index", "."], cwd=test_project)
+
+        queries_path = test_project / "queries.json"
+        queries_path.write_text(json.dumps([{"query": "multiply", "limit": 1}, {"query": "add"}]))
+        result = run_cli(
+            ["search", "--queries-file", str(queries_path), "--regex", "--no-filter"],
+            cwd=test_project,
+        )
+
+        assert result.returncode == 0
+        responses = json.loads(result.stdout)
+        assert [r["query"] for r in responses] == ["multiply", "add"]
+        assert len(responses[0]["results"]) <= 1
+
+    def test_search_queries_file_reports_malformed_entries(self, test_project):
+        """Test --queries-file answers malformed entries with errors instead of failing."""
+        run_cli(["init"], cwd=test_project)
+        disable_embeddings(test_project)
+        run_cli(["index", "."], cwd=test_project)
+
+        queries_path = test_project / "queries.json"
+        queries_path.write_text(
+            json.dumps([{"limit": 1}, "multiply", {"query": 3}, {"query": "add"}])
+        )
+        result = run_cli(
+            ["search", "--queries-file", str(queries_path), "--no-filter"],
+            cwd=test_project,
+        )
+
+        assert result.returncode == 0
+        responses = json.loads(result.stdout)
+        assert len(responses) == 4
+        assert all("error" in r for r in responses[:3])
+        assert responses[3]["query"] == "add"
+        assert "results" in responses[3]
+
+    @pytest.mark.parametrize("content", ["not json", "5", '{"query": "add"}'])
+    def test_search_queries_file_rejects_non_list(self, test_project, content):
+        """Test --queries-file reports a usage error unless the file is a JSON list."""
+        run_cli(["init"], cwd=test_project)
+        disable_embeddings(test_project)
+        run_cli(["index", "."], cwd=test_project)
+
+        queries_path = test_project / "queries.json"
+        queries_path.write_text(content)
+        result = run_cli(["search", "--queries-file", str(queries_path)], cwd=test_project)
+
+        assert result.returncode == 2
+        assert "--queries-file" in result.stderr
+        assert "Traceback" not in result.stderr
+
+    def test_search_requires_query_without_batch(self, test_project):
+        """Test search without QUERY fails unless --batch is given."""
+        run_cli(["init"], cwd=test_project)
+        result = run_cli(["search"], cwd=test_project)
+
+        assert result.returncode != 0
+
     def test_search_table_format(self, test_project):
         """Test search with table output format."""
         run_cli(["init"], cwd=test_project)
@@ -262,7 +385,7 @@ class TestCLICompact:
         disable_embeddings(test_project)
         run_cli(["index", "."], cwd=test_project)
 
-        # Need to run incremental index first to create chunk_index.json
+        # Need to run incremental index first to create chunk_index.db
         run_cli(["index", "--update", "."], cwd=test_project)
 
         result = run_cli(["compact", "."], cwd=test_project)
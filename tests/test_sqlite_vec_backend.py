@@ -8,19 +8,46 @@ import sqlite3
 
 from sia_code.core.models import Chunk
 from sia_code.core.types import ChunkType, FilePath, Language, LineNumber
+from sia_code.storage.local_models import load_sentence_transformer
 from sia_code.storage.sqlite_vec_backend import SqliteVecBackend
 
 
-@pytest.fixture
-def backend(tmp_path):
-    """Create a temporary backend for testing."""
-    test_path = tmp_path / "test_index.sia-code"
+# Emptied between tests sharing a backend (chunks_fts is cleared by chunk triggers)
+_RESET_TABLES = (
+    "chunks",
+    "timeline",
+    "changelogs",
+    "decisions",
+    "approved_memory",
+    "memory_fts",
+    "sqlite_sequence",
+)
+
+
+@pytest.fixture(scope="module")
+def shared_backend(tmp_path_factory):
+    """Create one backend per module, so the schema is built once."""
+    test_path = tmp_path_factory.mktemp("sqlite_vec") / "test_index.sia-code"
     backend = SqliteVecBackend(test_path, embedding_enabled=False, ndim=3)
     backend.create_index()
     yield backend
     backend.close()
 
 
+@pytest.fixture
+def backend(shared_backend):
+    """Return the shared backend with every table emptied."""
+    conn = shared_backend.conn
+    if conn.in_transaction:
+        conn.rollback()
+    with conn:
+        for table in _RESET_TABLES:
+            conn.execute(f"DELETE FROM {table}")
+    # Deleted on the backend's own connection, so data_version does not move
+    shared_backend.clear_search_cache()
+    return shared_backend
+
+
 def _make_chunks():
     return [
         Chunk(
@@ -57,21 +84,150 @@ def test_store_and_search_lexical(backend):
     assert results[0].chunk.symbol == "alpha_func"
 
 
+def _make_tiered_chunks():
+    """One dependency chunk that outranks a project chunk for "widget", plus fillers."""
+    vendored = Chunk(
+        symbol="vendored",
+        start_line=LineNumber(1),
+        end_line=LineNumber(2),
+        code="widget widget widget widget",
+        chunk_type=ChunkType.FUNCTION,
+        language=Language.PYTHON,
+        file_path=FilePath("vendor/widgets.py"),
+        metadata={"tier": "dependency"},
+    )
+    local = Chunk(
+        symbol="local",
+        start_line=LineNumber(1),
+        end_line=LineNumber(3),
+        code="def local():\n    return make(widget)",
+        chunk_type=ChunkType.FUNCTION,
+        language=Language.PYTHON,
+        file_path=FilePath("local.py"),
+    )
+    filler = Chunk(
+        symbol="gamma_func",
+        start_line=LineNumber(1),
+        end_line=LineNumber(2),
+        code="def gamma():\n    return 3",
+        chunk_type=ChunkType.FUNCTION,
+        language=Language.PYTHON,
+        file_path=FilePath("gamma.py"),
+    )
+    return [vendored, local, filler, *_make_chunks()]
+
+
+@pytest.mark.parametrize("include_deps", [True, False])
+@pytest.mark.parametrize("k", [1, 2, 10])
+@pytest.mark.parametrize("tier_boost", [None, {"project": 1.0, "dependency": 0.1}])
+def test_iter_search_lexical_matches_search_lexical(backend, include_deps, k, tier_boost):
+    backend.store_chunks_batch(_make_tiered_chunks())
+
+    kwargs = {"k": k, "include_deps": include_deps, "tier_boost": tier_boost}
+    expected = backend.search_lexical("widget", **kwargs)
+    streamed = list(backend.iter_search_lexical("widget", **kwargs))
+
+    assert [(r.chunk.symbol, r.score) for r in streamed] == [
+        (r.chunk.symbol, r.score) for r in expected
+    ]
+    scores = [r.score for r in streamed]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_iter_search_lexical_filters_within_top_k(backend):
+    backend.store_chunks_batch(_make_tiered_chunks())
+
+    # The dependency chunk is the only top-1 candidate, so nothing survives
+    assert list(backend.iter_search_lexical("widget", k=1, include_deps=False)) == []
+    assert backend.search_lexical("widget", k=1, include_deps=False) == []
+
+    # A small dependency boost re-sorts the project chunk first
+    boost = {"project": 1.0, "dependency": 0.1}
+    results = list(backend.iter_search_lexical("widget", k=2, tier_boost=boost))
+    assert [r.chunk.symbol for r in results] == ["local", "vendored"]
+
+
+def test_search_lexical_cache_invalidated_by_writes(backend, monkeypatch):
+    """Test that repeated lexical searches are cached until chunks are stored."""
+    monkeypatch.delenv("SIA_CODE_SEARCH_CACHE", raising=False)
+    alpha, beta = _make_chunks()
+    backend.store_chunks_batch([alpha])
+    calls = []
+    uncached = backend._search_lexical_uncached
+    monkeypatch.setattr(
+        backend,
+        "_search_lexical_uncached",
+        lambda *args: calls.append(args) or uncached(*args),
+    )
+
+    assert len(backend.search_lexical("return", k=5)) == 1
+    assert len(backend.search_lexical("return", k=5)) == 1
+    assert len(calls) == 1
+
+    backend.store_chunks_batch([beta])
+    assert len(backend.search_lexical("return", k=5)) == 2
+    assert len(calls) == 2
+
+    backend.clear_search_cache()
+    backend.search_lexical("return", k=5)
+    assert len(calls) == 3
+
+
+def test_store_chunks_batch_spans_multiple_insert_statements(backend):
+    chunks = [
+        Chunk(
+            symbol=f"func_{i}",
+            start_line=LineNumber(i + 1),
+            end_line=LineNumber(i + 1),
+            code=f"def func_{i}():\n    return {i}",
+            chunk_type=ChunkType.FUNCTION,
+            language=Language.PYTHON,
+            file_path=FilePath("many.py"),
+        )
+        for i in range(250)
+    ]
+
+    chunk_ids = backend.store_chunks_batch(chunks)
+
+    assert len(set(chunk_ids)) == 250
+    assert [backend.get_chunk(chunk_ids[i]).symbol for i in (0, 99, 249)] == [
+        "func_0",
+        "func_99",
+        "func_249",
+    ]
+
+
+def test_store_chunks_batch_rolls_back_whole_batch(backend, monkeypatch):
+    monkeypatch.setattr(backend, "embedding_enabled", True)
+    monkeypatch.setattr(backend, "_embed_batch", lambda texts: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        backend.store_chunks_batch(_make_chunks())
+
+    assert not backend.conn.in_transaction
+    assert backend.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 0
+
+
+def test_store_chunks_batch_joins_open_transaction(backend):
+    backend.conn.execute("BEGIN")
+    backend.store_chunks_batch(_make_chunks())
+    assert backend.conn.in_transaction
+
+    backend.conn.rollback()
+    assert backend.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 0
+
+
 def test_semantic_search_fallback(tmp_path, monkeypatch):
     """Validate fallback vector search works without sqlite-vec."""
 
     class DummyEmbedder:
         def encode(self, texts, **kwargs):
-            def _vec(text):
-                return (
-                    np.array([1.0, 0.0, 0.0], dtype=np.float32)
-                    if "alpha" in text
-                    else np.array([0.0, 1.0, 0.0], dtype=np.float32)
-                )
-
-            if isinstance(texts, list):
-                return np.vstack([_vec(text) for text in texts])
-            return _vec(texts)
+            batch = texts if isinstance(texts, list) else [texts]
+            is_alpha = np.fromiter(("alpha" in t for t in batch), dtype=bool, count=len(batch))
+            vectors = np.zeros((len(batch), 3), dtype=np.float32)
+            vectors[is_alpha, 0] = 1.0
+            vectors[~is_alpha, 1] = 1.0
+            return vectors if isinstance(texts, list) else vectors[0]
 
     backend = SqliteVecBackend(tmp_path / "vec_index.sia-code", embedding_enabled=True, ndim=3)
     monkeypatch.setattr(backend, "_load_vec_extension", lambda *_: False)
@@ -84,6 +240,23 @@ def test_semantic_search_fallback(tmp_path, monkeypatch):
 
     assert results
     assert results[0].chunk.symbol == "alpha_func"
+
+    # Vectors stored after a search are picked up by the next one
+    backend.store_chunks_batch(
+        [
+            Chunk(
+                symbol="alpha_again",
+                start_line=LineNumber(1),
+                end_line=LineNumber(2),
+                code="def alpha_again():\n    return 3",
+                chunk_type=ChunkType.FUNCTION,
+                language=Language.PYTHON,
+                file_path=FilePath("gamma.py"),
+            )
+        ]
+    )
+    results = backend.search_semantic("alpha", k=2)
+    assert {r.chunk.symbol for r in results} == {"alpha_func", "alpha_again"}
     backend.close()
 
 
@@ -191,6 +364,28 @@ def test_add_timeline_event_stores_commit_context(backend):
     assert events[0].commit_time == commit_time
 
 
+def test_has_changelog(backend):
+    assert not backend.has_changelog("v1.0.0")
+
+    backend.add_changelog(tag="v1.0.0", version="1.0.0", summary="Release 1.0")
+
+    assert backend.has_changelog("v1.0.0")
+    assert not backend.has_changelog("v1.0.1")
+
+
+def test_has_timeline_event(backend):
+    assert not backend.has_timeline_event("merge", "feature", "main")
+
+    backend.add_timeline_event(
+        event_type="merge", from_ref="feature", to_ref="main", summary="Merge feature"
+    )
+
+    assert backend.has_timeline_event("merge", "feature", "main")
+    assert not backend.has_timeline_event("merge", "feature", "develop")
+    assert not backend.has_timeline_event("merge", "other", "main")
+    assert not backend.has_timeline_event("tag", "feature", "main")
+
+
 def test_add_decision_stores_commit_context(backend):
     commit_time = datetime(2024, 1, 3, 12, 0, 0)
     decision_id = backend.add_decision(
@@ -282,3 +477,131 @@ def test_export_import_memory_preserves_commit_context(tmp_path):
     assert imported_decision.commit_time == commit_time
 
     backend2.close()
+
+
+def test_embed_batch_size_env_override(tmp_path, monkeypatch):
+    monkeypatch.setenv("SIA_CODE_EMBED_BATCH_SIZE", "4")
+    backend = SqliteVecBackend(tmp_path / "batch.sia-code", embedding_enabled=False, ndim=3)
+
+    assert backend._get_embed_batch_size() == 4
+
+
+def test_embed_batch_size_ignores_invalid_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("SIA_CODE_EMBED_BATCH_SIZE", "zero")
+    backend = SqliteVecBackend(tmp_path / "batch.sia-code", embedding_enabled=False, ndim=3)
+
+    assert 8 <= backend._get_embed_batch_size() <= 64
+
+
+def test_embed_batch_sorts_by_length_and_keeps_input_order(tmp_path):
+    seen_batches = []
+
+    class LengthEmbedder:
+        def encode(self, texts, **kwargs):
+            seen_batches.append(list(texts))
+            return np.array([[float(len(text)), 0.0, 0.0] for text in texts], dtype=np.float32)
+
+    backend = SqliteVecBackend(tmp_path / "sorted.sia-code", embedding_enabled=True, ndim=3)
+    backend._get_embedder = lambda: LengthEmbedder()
+    backend._get_embed_batch_size = lambda: 2
+
+    texts = ["ccc", "a", "dddd", "bb", "e" * 5]
+    vectors = backend._embed_batch(texts)
+
+    assert seen_batches == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+    assert vectors[:, 0].tolist() == [3.0, 1.0, 4.0, 2.0, 5.0]
+
+
+def test_onnx_backend_loads_model_file_locally(tmp_path, monkeypatch):
+    import sentence_transformers
+
+    loaded = {}
+
+    def fake_model(model_name, **kwargs):
+        loaded.update(kwargs, model=model_name)
+        return object()
+
+    monkeypatch.setattr(sentence_transformers, "SentenceTransformer", fake_model)
+    load_sentence_transformer.cache_clear()
+    backend = SqliteVecBackend(
+        tmp_path / "onnx.sia-code",
+        embedding_model="Xenova/bge-small-en-v1.5",
+        embedding_backend="onnx",
+        embedding_model_file="onnx/model_quantized.onnx",
+        ndim=384,
+    )
+    backend._get_embedder()
+    load_sentence_transformer.cache_clear()
+
+    assert loaded["model"] == "Xenova/bge-small-en-v1.5"
+    assert loaded["backend"] == "onnx"
+    assert loaded["model_kwargs"] == {"file_name": "onnx/model_quantized.onnx"}
+
+
+def test_local_model_is_loaded_once_per_process(tmp_path, monkeypatch):
+    import sentence_transformers
+
+    loads = []
+    def fake_model(model_name, **kwargs):
+        loads.append(model_name)
+        return object()
+
+    monkeypatch.setattr(sentence_transformers, "SentenceTransformer", fake_model)
+    load_sentence_transformer.cache_clear()
+    embedders = []
+    for name in ("first", "second"):
+        backend = SqliteVecBackend(tmp_path / name, embedding_model="local-model", ndim=3)
+        embedders.append(backend._get_embedder())
+    load_sentence_transformer.cache_clear()
+
+    assert loads == ["local-model"]
+    assert embedders[0] is embedders[1]
+
+
+class WideEmbedder:
+    def encode(self, texts, **kwargs):
+        vector = np.array([3.0, 4.0, 12.0, 0.0], dtype=np.float32)
+        return np.vstack([vector for _ in texts]) if isinstance(texts, list) else vector
+
+
+def test_embed_batch_truncates_to_configured_dimensions(tmp_path, caplog):
+    backend = SqliteVecBackend(
+        tmp_path / "mrl.sia-code", embedding_enabled=True, ndim=2, embedding_truncate=True
+    )
+    backend._get_embedder = lambda: WideEmbedder()
+
+    with caplog.at_level("WARNING", logger="sia_code.storage.sqlite_vec_backend"):
+        vectors = backend._embed_batch(["alpha", "beta"])
+        query_vector = backend._embed("alpha")
+
+    assert vectors.shape == (2, 2)
+    np.testing.assert_allclose(vectors[0], [0.6, 0.8], rtol=1e-6)
+    np.testing.assert_allclose(query_vector, [0.6, 0.8], rtol=1e-6)
+    assert len([r for r in caplog.records if "Truncating" in r.getMessage()]) == 1
+
+
+def test_embed_batch_does_not_truncate_by_default(tmp_path):
+    backend = SqliteVecBackend(tmp_path / "wide.sia-code", embedding_enabled=True, ndim=2)
+    backend._get_embedder = lambda: WideEmbedder()
+
+    assert backend._embed_batch(["alpha"]).shape == (1, 4)
+
+
+def test_prefetch_query_embeddings_encodes_once(tmp_path):
+    calls = []
+
+    class CountingEmbedder:
+        def encode(self, texts, **kwargs):
+            calls.append(texts)
+            if isinstance(texts, list):
+                return np.vstack([[float(len(t)), 1.0, 0.0] for t in texts]).astype(np.float32)
+            return np.array([float(len(texts)), 1.0, 0.0], dtype=np.float32)
+
+    backend = SqliteVecBackend(tmp_path / "prefetch.sia-code", embedding_enabled=True, ndim=3)
+    backend._get_embedder = lambda: CountingEmbedder()
+
+    backend.prefetch_query_embeddings(["alpha", "be", "alpha"])
+    vectors = [backend._embed("alpha"), backend._embed("be")]
+
+    assert calls == [["be", "alpha"]]
+    assert [v[0] for v in vectors] == [5.0, 2.0]
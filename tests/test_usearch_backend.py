@@ -1,6 +1,5 @@
 """Tests for UsearchSqliteBackend."""
 
-import tempfile
 from datetime import datetime
 from pathlib import Path
 import sqlite3
@@ -10,14 +9,14 @@ import pytest
 
 from sia_code.core.models import Chunk
 from sia_code.core.types import ChunkType, Language
+from sia_code.storage.local_models import load_sentence_transformer
 from sia_code.storage.usearch_backend import UsearchSqliteBackend
 
 
 @pytest.fixture
-def temp_index_dir():
-    """Create a temporary directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir) / ".sia-code"
+def temp_index_dir(tmp_path):
+    """Return an index path inside pytest's per-test temporary directory."""
+    return tmp_path / ".sia-code"
 
 
 @pytest.fixture
@@ -67,6 +66,158 @@ def test_create_index(temp_index_dir):
     backend.close()
 
 
+def test_in_memory_index_writes_nothing(tmp_path, monkeypatch):
+    """Test that an in-memory index never touches the filesystem."""
+    monkeypatch.chdir(tmp_path)
+    backend = UsearchSqliteBackend.in_memory(embedding_enabled=False)
+
+    assert backend.conn is not None
+    assert backend.vector_index is not None
+
+    backend.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_onnx_backend_loads_model_file_locally(temp_index_dir, monkeypatch):
+    """Test that embedding_backend and embedding_model_file reach the model loader."""
+    import sentence_transformers
+
+    loaded = {}
+
+    def fake_model(model_name, **kwargs):
+        loaded.update(kwargs, model=model_name)
+        return object()
+
+    monkeypatch.setattr(sentence_transformers, "SentenceTransformer", fake_model)
+    load_sentence_transformer.cache_clear()
+    backend = UsearchSqliteBackend(
+        path=temp_index_dir,
+        embedding_model="Xenova/bge-small-en-v1.5",
+        embedding_backend="onnx",
+        embedding_model_file="onnx/model_quantized.onnx",
+        ndim=384,
+    )
+    backend._get_embedder()
+    load_sentence_transformer.cache_clear()
+
+    assert loaded["model"] == "Xenova/bge-small-en-v1.5"
+    assert loaded["backend"] == "onnx"
+    assert loaded["model_kwargs"] == {"file_name": "onnx/model_quantized.onnx"}
+
+
+def test_search_lexical_cache_invalidated_by_writes(monkeypatch):
+    """Test that repeated lexical searches are cached until chunks are stored."""
+    monkeypatch.delenv("SIA_CODE_SEARCH_CACHE", raising=False)
+    backend = UsearchSqliteBackend.in_memory(embedding_enabled=False)
+
+    def make_chunk(symbol, line):
+        return Chunk(
+            symbol=symbol,
+            start_line=line,
+            end_line=line + 1,
+            code=f"def {symbol}():\n    return 'lookup'",
+            chunk_type=ChunkType.FUNCTION,
+            language=Language.PYTHON,
+            file_path=Path("cache.py"),
+        )
+
+    backend.store_chunks_batch([make_chunk("first_lookup", 1)])
+    calls = []
+    uncached = backend._search_lexical_uncached
+    monkeypatch.setattr(
+        backend,
+        "_search_lexical_uncached",
+        lambda *args: calls.append(args) or uncached(*args),
+    )
+
+    assert len(backend.search_lexical("lookup", k=5)) == 1
+    assert len(backend.search_lexical("lookup", k=5)) == 1
+    assert len(calls) == 1
+
+    backend.store_chunks_batch([make_chunk("second_lookup", 5)])
+    assert len(backend.search_lexical("lookup", k=5)) == 2
+    assert len(calls) == 2
+
+    backend.clear_search_cache()
+    backend.search_lexical("lookup", k=5)
+    assert len(calls) == 3
+    backend.close()
+
+
+def _tiered_lexical_backend():
+    """In-memory backend where a dependency chunk outranks a project chunk for "widget"."""
+    backend = UsearchSqliteBackend.in_memory(embedding_enabled=False)
+    chunks = [
+        Chunk(
+            symbol="vendored",
+            start_line=1,
+            end_line=2,
+            code="widget widget widget widget",
+            chunk_type=ChunkType.FUNCTION,
+            language=Language.PYTHON,
+            file_path=Path("vendor/widgets.py"),
+            metadata={"tier": "dependency"},
+        ),
+        Chunk(
+            symbol="local",
+            start_line=1,
+            end_line=3,
+            code="def local():\n    return make(widget)",
+            chunk_type=ChunkType.FUNCTION,
+            language=Language.PYTHON,
+            file_path=Path("local.py"),
+        ),
+    ]
+    for i, name in enumerate(["alpha", "beta", "gamma"]):
+        chunks.append(
+            Chunk(
+                symbol=name,
+                start_line=1,
+                end_line=2,
+                code=f"def {name}():\n    return {i}",
+                chunk_type=ChunkType.FUNCTION,
+                language=Language.PYTHON,
+                file_path=Path(f"{name}.py"),
+            )
+        )
+    backend.store_chunks_batch(chunks)
+    return backend
+
+
+@pytest.mark.parametrize("include_deps", [True, False])
+@pytest.mark.parametrize("k", [1, 2, 10])
+@pytest.mark.parametrize("tier_boost", [None, {"project": 1.0, "dependency": 0.1}])
+def test_iter_search_lexical_matches_search_lexical(include_deps, k, tier_boost):
+    """Test that streamed lexical results equal search_lexical() results."""
+    backend = _tiered_lexical_backend()
+
+    kwargs = {"k": k, "include_deps": include_deps, "tier_boost": tier_boost}
+    expected = backend.search_lexical("widget", **kwargs)
+    streamed = list(backend.iter_search_lexical("widget", **kwargs))
+
+    assert [(r.chunk.symbol, r.score) for r in streamed] == [
+        (r.chunk.symbol, r.score) for r in expected
+    ]
+    scores = [r.score for r in streamed]
+    assert scores == sorted(scores, reverse=True)
+    backend.close()
+
+
+def test_iter_search_lexical_filters_within_top_k():
+    """Test that deps filtering and boost re-sorting match search_lexical()."""
+    backend = _tiered_lexical_backend()
+
+    # The dependency chunk is the only top-1 candidate, so nothing survives
+    assert list(backend.iter_search_lexical("widget", k=1, include_deps=False)) == []
+    assert backend.search_lexical("widget", k=1, include_deps=False) == []
+
+    # A small dependency boost re-sorts the project chunk first
+    boost = {"project": 1.0, "dependency": 0.1}
+    results = list(backend.iter_search_lexical("widget", k=2, tier_boost=boost))
+    assert [r.chunk.symbol for r in results] == ["local", "vendored"]
+    backend.close()
+
+
 def test_store_and_retrieve_chunks(backend):
     """Test storing and retrieving code chunks."""
     # Create test chunks
@@ -208,6 +359,30 @@ def test_timeline_events(backend):
     assert events[0].to_ref == "v1.1.0"
 
 
+def test_has_changelog(backend):
+    """Test changelog lookup by tag, before and after adding one."""
+    assert not backend.has_changelog("v1.0.0")
+
+    backend.add_changelog(tag="v1.0.0", version="1.0.0", summary="Release 1.0")
+
+    assert backend.has_changelog("v1.0.0")
+    assert not backend.has_changelog("v1.0.1")
+
+
+def test_has_timeline_event(backend):
+    """Test timeline event lookup, before and after adding one."""
+    assert not backend.has_timeline_event("merge", "feature", "main")
+
+    backend.add_timeline_event(
+        event_type="merge", from_ref="feature", to_ref="main", summary="Merge feature"
+    )
+
+    assert backend.has_timeline_event("merge", "feature", "main")
+    assert not backend.has_timeline_event("merge", "feature", "develop")
+    assert not backend.has_timeline_event("merge", "other", "main")
+    assert not backend.has_timeline_event("tag", "feature", "main")
+
+
 def test_export_import_memory(backend, temp_index_dir):
     """Test memory export and import."""
     # Add some test data
@@ -43,8 +43,8 @@ class TestGitSyncService:
         backend = MagicMock()
         backend.add_timeline_event.return_value = 1
         backend.add_changelog.return_value = 1
-        backend.get_timeline_events.return_value = []
-        backend.get_changelogs.return_value = []
+        backend.has_timeline_event.return_value = False
+        backend.has_changelog.return_value = False
         return backend
 
     @pytest.fixture
@@ -113,12 +113,8 @@ class TestGitSyncService:
         # Create tag
         subprocess.run(["git", "tag", "-a", "v1.0.0", "-m", "Test"], cwd=git_repo, check=True)
 
-        # Mock backend to return existing changelog
-        from sia_code.core.models import ChangelogEntry
-
-        mock_backend.get_changelogs.return_value = [
-            ChangelogEntry(id=1, tag="v1.0.0", version="1.0.0")
-        ]
+        # Mock backend to report an existing changelog
+        mock_backend.has_changelog.return_value = True
 
         stats = sync_service.sync()
 
@@ -0,0 +1,158 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from sia_code.indexer.chunk_index import ChunkIndex
+from sia_code.indexer.hash_cache import HASH_ALGORITHM, HashCache
+
+
+def _stored_keys(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[0] for row in conn.execute("SELECT key FROM records")}
+    finally:
+        conn.close()
+
+
+def test_hash_cache_round_trips_through_sqlite(tmp_path):
+    source = tmp_path / "a.py"
+    source.write_text("x = 1\n")
+    cache = HashCache(tmp_path / "file_hashes.db")
+    cache.update(source, ["1", "2"])
+    cache.save()
+
+    reloaded = HashCache(tmp_path / "file_hashes.db")
+    assert reloaded.get_chunks(source) == ["1", "2"]
+    assert not reloaded.has_changed(source)
+
+
+def test_hash_cache_save_writes_only_changed_entries(tmp_path):
+    files = [tmp_path / f"m{i}.py" for i in range(3)]
+    cache = HashCache(tmp_path / "file_hashes.db")
+    for path in files:
+        path.write_text("pass\n")
+        cache.update(path, [path.stem])
+    cache.save()
+
+    # Entries edited behind the cache's back survive a save that does not touch them
+    conn = sqlite3.connect(cache.cache_path)
+    with conn:
+        conn.execute("UPDATE records SET data = json_set(data, '$.chunks', json('[]'))")
+    conn.close()
+
+    cache.remove(files[0])
+    cache.update(files[1], ["new"])
+    cache.save()
+
+    reloaded = HashCache(tmp_path / "file_hashes.db")
+    assert _stored_keys(cache.cache_path) == {str(files[1]), str(files[2])}
+    assert reloaded.get_chunks(files[1]) == ["new"]
+    assert reloaded.get_chunks(files[2]) == []
+
+
+def test_hash_cache_imports_legacy_json(tmp_path):
+    source = tmp_path / "a.py"
+    source.write_text("x = 1\n")
+    legacy = HashCache(tmp_path / "unused.db")
+    legacy.update(source, ["7"])
+    (tmp_path / "file_hashes.json").write_text(
+        json.dumps({k: v.to_dict() for k, v in legacy.hashes.items()})
+    )
+
+    cache = HashCache(tmp_path / "file_hashes.db")
+    assert HashCache.exists(tmp_path / "file_hashes.db")
+    assert cache.get_chunks(source) == ["7"]
+
+    cache.save()
+    assert _stored_keys(tmp_path / "file_hashes.db") == {str(source)}
+
+
+def test_chunk_index_imports_legacy_json_and_tracks_removals(tmp_path):
+    kept, deleted = tmp_path / "kept.py", tmp_path / "deleted.py"
+    (tmp_path / "chunk_index.json").write_text(
+        json.dumps(
+            {
+                "version": ChunkIndex.VERSION,
+                "files": {
+                    str(path): {
+                        "file_path": str(path),
+                        "hash": "h",
+                        "mtime": 0.0,
+                        "size": 1,
+                        "valid_chunks": [path.stem],
+                        "stale_chunks": [],
+                    }
+                    for path in (kept, deleted)
+                },
+            }
+        )
+    )
+
+    index = ChunkIndex(tmp_path / "chunk_index.db")
+    assert index.get_valid_chunks() == {"kept", "deleted"}
+    index.save()
+
+    index.cleanup_deleted_files({str(kept)})
+    index.save()
+
+    reloaded = ChunkIndex(tmp_path / "chunk_index.db")
+    assert reloaded.get_valid_chunks() == {"kept"}
+    assert _stored_keys(tmp_path / "chunk_index.db") == {str(kept)}
+
+
+def test_new_chunk_index_is_created_on_save(tmp_path):
+    index = ChunkIndex(tmp_path / "chunk_index.db")
+    assert not ChunkIndex.exists(tmp_path / "chunk_index.db")
+
+    index.save()
+    assert ChunkIndex.exists(tmp_path / "chunk_index.db")
+    assert ChunkIndex(tmp_path / "chunk_index.db").files == {}
+
+
+def test_compute_hash_is_tagged_and_content_sensitive(tmp_path):
+    source = tmp_path / "a.py"
+    source.write_text("x = 1\n")
+    cache = HashCache(tmp_path / "file_hashes.db")
+
+    first = cache.compute_hash(source)
+    source.write_text("x = 2\n")
+
+    assert first.startswith(f"{HASH_ALGORITHM}:")
+    assert cache.compute_hash(source) != first
+    assert cache.compute_hash(tmp_path / "missing.py") == ""
+
+
+def test_has_changed_refreshes_stat_when_content_is_unchanged(tmp_path, monkeypatch):
+    source = tmp_path / "a.py"
+    source.write_text("x = 1\n")
+    cache = HashCache(tmp_path / "file_hashes.db")
+    cache.update(source, ["1"])
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+    assert not cache.has_changed(source)
+
+    # The new mtime was recorded, so the next check is stat-only
+    monkeypatch.setattr(cache, "compute_hash", lambda path: pytest.fail("hashed again"))
+    assert not cache.has_changed(source)
+
+
+def test_update_reuses_digest_from_has_changed(tmp_path, monkeypatch):
+    source = tmp_path / "a.py"
+    source.write_text("x = 1\n")
+    cache = HashCache(tmp_path / "file_hashes.db")
+    cache.update(source, ["1"])
+    source.write_text("x = 22\n")
+
+    calls = []
+    compute_hash = cache.compute_hash
+    monkeypatch.setattr(
+        cache, "compute_hash", lambda path: calls.append(path) or compute_hash(path)
+    )
+
+    assert cache.has_changed(source)
+    entry = cache.update(source, ["2"])
+    assert len(calls) == 1
+    assert entry.hash == compute_hash(source)
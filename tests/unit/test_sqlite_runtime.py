@@ -0,0 +1,19 @@
+from sia_code.storage.sqlite_runtime import connect_sqlite
+
+
+def test_connect_sqlite_keeps_default_durability(tmp_path, monkeypatch):
+    monkeypatch.delenv("SIA_CODE_SQLITE_FAST", raising=False)
+    conn = connect_sqlite(tmp_path / "index.db")
+
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] != 0
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    conn.close()
+
+
+def test_connect_sqlite_fast_mode_skips_fsync(tmp_path, monkeypatch):
+    monkeypatch.setenv("SIA_CODE_SQLITE_FAST", "1")
+    conn = connect_sqlite(tmp_path / "index.db")
+
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+    conn.close()